@@ -1,5 +1,16 @@
 import networkx as nx
+import numpy as np
 import math
+import threading
+import weakref
+from collections import OrderedDict
+from algorithms.caminocorto.dijkstra import dijkstra_search, dijkstra_csr_punto
+from models.grafo_csr import GrafoCSR, csr_de
+
+# Radio de curvatura mínimo del elipsoide WGS84 (meridiano en el ecuador), en km.
+# Con este radio la distancia haversine nunca supera la distancia real por la superficie,
+# así que la heurística es admisible en cualquier latitud.
+RADIO_TIERRA_MIN_KM = 6335.439
 
 def distancia_euclidea(coord1, coord2):
     """Distancia aproximada en km entre dos coordenadas geográficas (lat, lon)"""
@@ -7,25 +18,138 @@ def distancia_euclidea(coord1, coord2):
     lat2, lon2 = coord2
     return math.sqrt((lat1 - lat2)**2 + (lon1 - lon2)**2) * 111  # Aprox. km
 
+def distancia_haversine(coord1, coord2):
+    """Cota inferior en km de la distancia sobre la superficie entre dos coordenadas (lat, lon)"""
+    lat1, lon1 = map(math.radians, coord1)
+    lat2, lon2 = map(math.radians, coord2)
+    a = math.sin((lat2 - lat1) / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2)**2
+    return 2 * RADIO_TIERRA_MIN_KM * math.asin(min(1.0, math.sqrt(a)))
+
 def heuristica(u, v, G):
-    """Heurística para A* basada en distancia euclídea entre nodos"""
-    try:
-        coord_u = G.nodes[u]['pos']
-        coord_v = G.nodes[v]['pos']
-        return distancia_euclidea(coord_u, coord_v)
-    except:
+    """Heurística para A* basada en distancia haversine entre nodos (0 si falta alguna coordenada)"""
+    coord_u = G.nodes[u].get('pos', (0, 0))
+    coord_v = G.nodes[v].get('pos', (0, 0))
+    if coord_u == (0, 0) or coord_v == (0, 0):
         return 0
+    return distancia_haversine(coord_u, coord_v)
+
+
+def _haversine_arreglos(lat1, lon1, lat2, lon2):
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    return 2 * RADIO_TIERRA_MIN_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+class _CoordenadasGrafo:
+    """
+    Coordenadas de un grafo en arreglos (radianes) y heurísticas ya calculadas por destino.
+
+    Las distancias del CSV no siempre respetan la geografía (hay tramos más cortos que
+    la línea recta entre sus coordenadas), así que la cota haversine se multiplica por
+    `factor` = min(1, distancia / haversine) sobre las aristas con ambas coordenadas.
+
+    Un nodo sin coordenadas (p. ej. un municipio que no está en el nomenclátor) rompe
+    esa calibración: un camino que pase por él puede ser más corto que la cota escalada
+    sin que ninguna arista medible lo muestre. Si algún nodo conectado no tiene
+    coordenadas el factor es 0 y la búsqueda queda como Dijkstra.
+
+    Las cotas por destino se guardan en un LRU con su propio lock: el servidor consulta
+    el mismo grafo desde varios hilos.
+    """
+
+    MAX_DESTINOS = 256
+
+    def __init__(self, csr):
+        self.indice = csr.indice
+        coords = csr.pos
+        self.valido = np.any(coords != 0, axis=1)
+        self.lat = np.radians(coords[:, 0])
+        self.lon = np.radians(coords[:, 1])
+        self.factor = self._factor_admisible(csr)
+        self.por_destino = OrderedDict()
+        self.bloqueo = threading.Lock()
+
+    def _factor_admisible(self, csr):
+        if not csr.number_of_edges():
+            return 1.0
+        i, j, peso = csr.arista_origen, csr.arista_destino, csr.valores_arista('distancia', 1)
+        if not (self.valido[i] & self.valido[j]).all():
+            return 0.0
+        geo = _haversine_arreglos(self.lat[i], self.lon[i], self.lat[j], self.lon[j])
+        medibles = self.valido[i] & self.valido[j] & (geo > 0)
+        if not medibles.any():
+            return 1.0
+        return float(min(1.0, np.min(peso[medibles] / geo[medibles])))
+
+    def heuristica_hacia(self, destino):
+        """Lista h[i] = cota inferior de la distancia del nodo i al destino"""
+        with self.bloqueo:
+            h = self.por_destino.get(destino)
+            if h is not None:
+                self.por_destino.move_to_end(destino)
+                return h
+        # Se calcula fuera del lock: dos hilos con el mismo destino nuevo calculan lo mismo
+        j = self.indice[destino]
+        if not self.valido[j] or self.factor == 0:
+            h = np.zeros(len(self.lat))
+        else:
+            h = self.factor * _haversine_arreglos(self.lat, self.lon, self.lat[j], self.lon[j])
+            h[~self.valido] = 0.0
+        h = h.tolist()
+        with self.bloqueo:
+            self.por_destino[destino] = h
+            self.por_destino.move_to_end(destino)
+            if len(self.por_destino) > self.MAX_DESTINOS:
+                self.por_destino.popitem(last=False)
+        return h
+
+_coordenadas = weakref.WeakKeyDictionary()
+_bloqueo_coordenadas = threading.Lock()
+
+def _coordenadas_de(G):
+    # Se guarda por GrafoCSR: si G cambia, csr_de entrega otro y las cotas se recalculan
+    csr = csr_de(G)
+    with _bloqueo_coordenadas:
+        datos = _coordenadas.get(csr)
+        if datos is None:
+            datos = _CoordenadasGrafo(csr)
+            _coordenadas[csr] = datos
+    return datos
+
+def astar_search(G, origen, destino):
+    """
+    A* en una sola búsqueda con la cota haversine (calibrada con las aristas del grafo)
+    precalculada para el destino.
+    Devuelve (path, distancia, tiempo, expansiones); lanza nx.NetworkXNoPath si no hay camino.
+    """
+    if destino not in G:
+        raise nx.NodeNotFound(f"El nodo {destino} no está en el grafo")
+    datos = _coordenadas_de(G)
+    h = datos.heuristica_hacia(destino)
+    indice = datos.indice
+    if isinstance(G, GrafoCSR):
+        if origen not in G:
+            raise nx.NodeNotFound(f"El nodo {origen} no está en el grafo")
+        resultado = dijkstra_csr_punto(G, indice[origen], indice[destino], h)
+        if resultado is None:
+            raise nx.NetworkXNoPath(f"No hay camino entre {origen} y {destino}")
+        path, distancia, tiempo, expansiones = resultado
+        return [G.nodos[i] for i in path], distancia, tiempo, expansiones
+    return dijkstra_search(G, origen, destino, heuristica=lambda n: h[indice[n]])
 
-def shortest_path_astar(G, origen, destino):
-    """Camino más corto usando A* entre origen y destino"""
+def shortest_path_astar(G, origen, destino, con_expansiones=False):
+    """
+    Camino más corto usando A* entre origen y destino.
+    Con con_expansiones=True agrega al final los nodos expandidos por esa misma búsqueda.
+    """
     try:
-        path = nx.astar_path(G, origen, destino, heuristic=lambda u, v: heuristica(u, v, G), weight='distancia')
-        distancia = nx.astar_path_length(G, origen, destino, heuristic=lambda u, v: heuristica(u, v, G), weight='distancia')
-        tiempo = sum(G[path[i]][path[i+1]]['eta'] for i in range(len(path)-1))
-        return path, distancia, tiempo, "A* (A-Star)"
+        path, distancia, tiempo, expansiones = astar_search(G, origen, destino)
+        resultado = (path, distancia, tiempo, "A* (A-Star)")
     except nx.NetworkXNoPath:
         print("No hay camino entre los nodos.")
-        return None, float('inf'), float('inf'), "A* (A-Star)"
+        expansiones = None
+        resultado = (None, float('inf'), float('inf'), "A* (A-Star)")
     except Exception as e:
         print(e)
-        return None, float('inf'), float('inf'), "A* (A-Star)"
+        expansiones = None
+        resultado = (None, float('inf'), float('inf'), "A* (A-Star)")
+    return (*resultado, expansiones) if con_expansiones else resultado
@@ -1,9 +1,49 @@
+import sys
 import networkx as nx
-from tkinter import messagebox
+from algorithms.caminocorto.dijkstra import caminos_desde_csr
+from algorithms.caminocorto.matriz_caminos import SIN_PREDECESOR
+from models.grafo_csr import GrafoCSR
+
+def bellman_ford_csr(csr, s):
+    """
+    Bellman-Ford desde el id s sobre el CSR; se detiene en la primera pasada sin cambios.
+    Devuelve las filas (dist, eta, pred) y lanza nx.NetworkXUnbounded si hay un ciclo negativo.
+    """
+    inicio, destinos, pesos, etas = csr.listas()
+    n = len(inicio) - 1
+    dist = [float('inf')] * n
+    eta = [float('inf')] * n
+    pred = [SIN_PREDECESOR] * n
+    dist[s] = 0.0
+    eta[s] = 0.0
+    for _ in range(n):
+        cambio = False
+        for i in range(n):
+            di = dist[i]
+            if di == float('inf'):
+                continue
+            for a in range(inicio[i], inicio[i + 1]):
+                j = destinos[a]
+                if di + pesos[a] < dist[j]:
+                    dist[j] = di + pesos[a]
+                    eta[j] = eta[i] + etas[a]
+                    pred[j] = i
+                    cambio = True
+        if not cambio:
+            return dist, eta, pred
+    raise nx.NetworkXUnbounded("El grafo contiene un ciclo con peso negativo")
+
+def _mostrar_error(titulo, mensaje):
+    # Solo si la interfaz ya cargó tkinter: el módulo también se usa sin pantalla (cli.py)
+    if 'tkinter' in sys.modules:
+        from tkinter import messagebox
+        messagebox.showerror(titulo, mensaje)
 
 def shortest_paths_from_source_bellman(G, origen):
     """Caminos más cortos desde un nodo origen usando Bellman-Ford"""
     try:
+        if isinstance(G, GrafoCSR):
+            return (*caminos_desde_csr(G, bellman_ford_csr(G, G.indice[origen])), "Bellman-Ford")
         length, paths = nx.single_source_bellman_ford(G, origen, weight='distancia')
         tiempos = {}
         for destino in paths:
@@ -16,7 +56,7 @@ def shortest_paths_from_source_bellman(G, origen):
     
     except nx.NetworkXUnbounded:
         print("⚠️ Error: El grafo contiene un ciclo negativo. Bellman-Ford no puede continuar.")
-        messagebox.showerror(
+        _mostrar_error(
             "Ciclo negativo detectado",
             "El grafo contiene un ciclo con peso negativo. El algoritmo Bellman-Ford no puede continuar."
         )
@@ -24,7 +64,7 @@ def shortest_paths_from_source_bellman(G, origen):
     
     except Exception as e:
         print(f"❌ Ocurrió un error inesperado: {e}")
-        messagebox.showerror(
+        _mostrar_error(
             "Error inesperado",
             f"Ocurrió un error al ejecutar Bellman-Ford:\n\n{e}"
         )
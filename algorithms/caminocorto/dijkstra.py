@@ -1,11 +1,134 @@
+import heapq
+from itertools import count
 import networkx as nx
+from algorithms.caminocorto.matriz_caminos import SIN_PREDECESOR
+from models.grafo_csr import GrafoCSR
+
+def dijkstra_csr(inicio, vecinos, pesos, etas, s):
+    """
+    Dijkstra desde s sobre el CSR (como listas de Python, más rápidas de indexar que
+    los arreglos de NumPy elemento a elemento). Devuelve las filas (dist, eta, pred).
+    """
+    n = len(inicio) - 1
+    d_fila = [float('inf')] * n
+    t_fila = [float('inf')] * n
+    p_fila = [SIN_PREDECESOR] * n
+    d_fila[s] = 0.0
+    t_fila[s] = 0.0
+    cerrados = [False] * n
+    cola = [(0.0, s)]
+    while cola:
+        d, i = heapq.heappop(cola)
+        if cerrados[i]:
+            continue
+        cerrados[i] = True
+        for a in range(inicio[i], inicio[i + 1]):
+            j = vecinos[a]
+            nd = d + pesos[a]
+            if nd < d_fila[j]:
+                d_fila[j] = nd
+                t_fila[j] = t_fila[i] + etas[a]
+                p_fila[j] = i
+                heapq.heappush(cola, (nd, j))
+    return d_fila, t_fila, p_fila
+
+def dijkstra_csr_punto(csr, origen, destino, h=None):
+    """
+    dijkstra_search sobre un GrafoCSR: los nodos son ids enteros y h (opcional) es una
+    lista con la cota inferior de cada nodo al destino.
+    Devuelve (path en ids, distancia, tiempo, expansiones) o None si no hay camino.
+    """
+    inicio, vecinos, pesos, etas = csr.listas()
+    n = len(inicio) - 1
+    dist = [float('inf')] * n
+    eta = [0.0] * n
+    pred = [SIN_PREDECESOR] * n
+    cerrados = [False] * n
+    dist[origen] = 0.0
+    cola = [(h[origen] if h else 0.0, origen)]
+    expansiones = 0
+    while cola:
+        _, i = heapq.heappop(cola)
+        if cerrados[i]:
+            continue
+        cerrados[i] = True
+        expansiones += 1
+        if i == destino:
+            path = []
+            while i != SIN_PREDECESOR:
+                path.append(i)
+                i = pred[i]
+            path.reverse()
+            return path, dist[destino], eta[destino], expansiones
+        di, ti = dist[i], eta[i]
+        for a in range(inicio[i], inicio[i + 1]):
+            j = vecinos[a]
+            nd = di + pesos[a]
+            if nd < dist[j]:
+                dist[j] = nd
+                eta[j] = ti + etas[a]
+                pred[j] = i
+                cerrados[j] = False
+                heapq.heappush(cola, (nd + h[j] if h else nd, j))
+    return None
+
+def dijkstra_search(G, origen, destino, heuristica=None):
+    """
+    Búsqueda punto a punto en una sola pasada: acumula distancia y ETA al relajar
+    cada arista y se detiene en cuanto el destino queda fijado.
+    Si se pasa heuristica(n) (cota inferior de la distancia de n al destino) la
+    búsqueda se comporta como A*.
+    Devuelve (path, distancia, tiempo, expansiones); lanza nx.NetworkXNoPath si no hay camino.
+    """
+    for n in (origen, destino):
+        if n not in G:
+            raise nx.NodeNotFound(f"El nodo {n} no está en el grafo")
+    if isinstance(G, GrafoCSR) and heuristica is None:
+        resultado = dijkstra_csr_punto(G, G.indice[origen], G.indice[destino])
+        if resultado is None:
+            raise nx.NetworkXNoPath(f"No hay camino entre {origen} y {destino}")
+        path, distancia, tiempo, expansiones = resultado
+        return [G.nodos[i] for i in path], distancia, tiempo, expansiones
+    if isinstance(G, GrafoCSR):
+        G = G.a_networkx()
+    adj = G.adj
+    dist = {origen: 0.0}
+    eta = {origen: 0.0}
+    pred = {origen: None}
+    cerrados = set()
+    desempate = count()
+    cola = [(heuristica(origen) if heuristica else 0.0, next(desempate), origen)]
+    expansiones = 0
+    while cola:
+        _, _, u = heapq.heappop(cola)
+        if u in cerrados:
+            continue
+        cerrados.add(u)
+        expansiones += 1
+        if u == destino:
+            path = []
+            while u is not None:
+                path.append(u)
+                u = pred[u]
+            path.reverse()
+            return path, dist[destino], eta[destino], expansiones
+        du, tu = dist[u], eta[u]
+        for v, datos in adj[u].items():
+            nd = du + datos.get('distancia', 1)
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                eta[v] = tu + datos.get('eta', 0)
+                pred[v] = u
+                # Solo ocurre con heurísticas admisibles pero no consistentes: se reabre el nodo
+                cerrados.discard(v)
+                prioridad = nd + heuristica(v) if heuristica else nd
+                heapq.heappush(cola, (prioridad, next(desempate), v))
+    raise nx.NetworkXNoPath(f"No hay camino entre {origen} y {destino}")
 
 def shortest_path_dijkstra(G, origen, destino):
     """Camino más corto de origen a destino usando Dijkstra"""
     try:
-        path = nx.dijkstra_path(G, origen, destino, weight='distancia')
-        distancia = nx.dijkstra_path_length(G, origen, destino, weight='distancia')
-        tiempo = sum(G[path[i]][path[i+1]]['eta'] for i in range(len(path)-1))
+        path, distancia, tiempo, _ = dijkstra_search(G, origen, destino)
         return path, distancia, tiempo, "Dijkstra"
     except nx.NetworkXNoPath:
         return None, float('inf'), float('inf'), "Dijkstra"
@@ -13,6 +136,8 @@ def shortest_path_dijkstra(G, origen, destino):
 def shortest_paths_from_source_dijkstra(G, origen):
     """Caminos más cortos desde origen a todos los nodos usando Dijkstra"""
     try:
+        if isinstance(G, GrafoCSR):
+            return (*caminos_desde_csr(G, dijkstra_csr(*G.listas(), G.indice[origen])), "Dijkstra")
         length, paths = nx.single_source_dijkstra(G, origen, weight='distancia')
         tiempos = {}
         for destino in paths:
@@ -26,4 +151,20 @@ def shortest_paths_from_source_dijkstra(G, origen):
         print(e)
         return {}, {}, {}, "Dijkstra"
 
-    
+def caminos_desde_csr(csr, filas):
+    """Convierte las filas (dist, eta, pred) de un origen en los diccionarios length, paths, tiempos"""
+    d_fila, t_fila, p_fila = filas
+    nodos = csr.nodos
+    length, paths, tiempos = {}, {}, {}
+    # Orden por distancia, como devuelve networkx
+    for j in sorted((j for j, d in enumerate(d_fila) if d != float('inf')), key=d_fila.__getitem__):
+        camino = []
+        i = j
+        while i != SIN_PREDECESOR:
+            camino.append(nodos[i])
+            i = p_fila[i]
+        camino.reverse()
+        length[nodos[j]] = d_fila[j]
+        paths[nodos[j]] = camino
+        tiempos[nodos[j]] = t_fila[j]
+    return length, paths, tiempos
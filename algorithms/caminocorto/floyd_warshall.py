@@ -1,37 +1,112 @@
 import networkx as nx
+import numpy as np
+from algorithms.caminocorto.matriz_caminos import MatrizCaminos, SIN_PREDECESOR
+from models.grafo_csr import GrafoCSR, csr_de
 
-def shortest_paths_floyd_warshall(G):
-    """Calcula todos los caminos más cortos usando Floyd-Warshall"""
+def matriz_floyd_warshall(G):
+    """Floyd-Warshall una sola vez: matrices densas de distancias y predecesores"""
+    if isinstance(G, GrafoCSR):
+        G = G.a_networkx()
+    predecesores, distancias = nx.floyd_warshall_predecessor_and_distance(G, weight='distancia')
+    return MatrizCaminos.desde_predecesores(G, predecesores, distancias, nombre="Floyd-Warshall")
+
+def matrices_iniciales(G):
+    """
+    Matrices de adyacencia (float64 distancia y ETA, int32 predecesor) indexadas por la
+    posición de cada nodo en G.nodes. Entre aristas repetidas se queda la más corta.
+    """
+    csr = csr_de(G)
+    nodos = csr.nodos
+    n = len(nodos)
+    dist = np.full((n, n), np.inf)
+    eta = np.full((n, n), np.inf)
+    pred = np.full((n, n), SIN_PREDECESOR, dtype=np.int32)
+    if len(csr.destinos):
+        # Arcos del CSR (en no dirigidos ya vienen los dos sentidos)
+        i = np.repeat(np.arange(n, dtype=np.int32), np.diff(csr.offsets))
+        j, w, t = csr.destinos, csr.distancia, csr.eta
+        # Orden descendente: al asignar, la última (la más corta) es la que queda
+        orden = np.argsort(-w, kind='stable')
+        i, j, w, t = i[orden], j[orden], w[orden], t[orden]
+        dist[i, j] = w
+        eta[i, j] = t
+        pred[i, j] = i
+    np.fill_diagonal(dist, 0.0)
+    np.fill_diagonal(eta, 0.0)
+    np.fill_diagonal(pred, SIN_PREDECESOR)
+    return nodos, dist, eta, pred
+
+def eta_por_predecesores(pred, eta_arco):
+    """
+    ETA de cada par sumada a lo largo del camino que codifica pred: eta[i, j] =
+    eta[i, pred[i, j]] + eta_arco[pred[i, j], j]. Se resuelve por capas, una por
+    cantidad de tramos del camino, así tiempo() y camino() siempre hablan de la misma ruta.
+    """
+    n = len(pred)
+    eta = np.full((n, n), np.inf)
+    np.fill_diagonal(eta, 0.0)
+    resuelto = np.eye(n, dtype=bool)
+    i, j = np.nonzero(pred != SIN_PREDECESOR)
+    while len(i):
+        p = pred[i, j]
+        listos = resuelto[i, p]
+        if not listos.any():
+            break  # Solo con un ciclo en pred, que Floyd-Warshall no produce
+        il, jl, pl = i[listos], j[listos], p[listos]
+        eta[il, jl] = eta[il, pl] + eta_arco[pl, jl]
+        resuelto[il, jl] = True
+        i, j = i[~listos], j[~listos]
+    return eta
+
+def matriz_floyd_warshall_numpy(G):
+    """
+    Floyd-Warshall vectorizado: para cada k la relajación de toda la matriz es una
+    operación de NumPy (suma con broadcast y mínimo) sobre distancia y predecesores.
+    La ETA se suma al final sobre los caminos de pred: relajarla junto con la distancia
+    la desacopla del camino cuando dos rutas empatan salvo por redondeo.
+    """
+    nodos, dist, eta_arco, pred = matrices_iniciales(G)
+    n = len(nodos)
+    candidato = np.empty_like(dist)
+    mejora = np.empty(dist.shape, dtype=bool)
+    for k in range(n):
+        # La fila y la columna k no cambian en esta iteración (dist[k, k] = 0),
+        # así que se pueden leer como vistas mientras se escribe la matriz
+        np.add(dist[:, k, None], dist[None, k, :], out=candidato)
+        np.less(candidato, dist, out=mejora)
+        if not mejora.any():
+            continue
+        np.copyto(dist, candidato, where=mejora)
+        np.copyto(pred, pred[None, k, :], where=mejora)
+    eta = eta_por_predecesores(pred, eta_arco)
+    return MatrizCaminos(nodos, dist, pred, eta=eta, nombre="Floyd-Warshall", G=G)
+
+def shortest_paths_floyd_warshall(G, motor='networkx'):
+    """
+    Calcula todos los caminos más cortos usando Floyd-Warshall.
+    motor='numpy' usa la versión vectorizada y devuelve vistas perezosas sobre sus matrices.
+    """
     try:
+        if motor == 'numpy':
+            return (*matriz_floyd_warshall_numpy(G).vistas(), "Floyd-Warshall")
+        matriz = matriz_floyd_warshall(G)
+        nodos = matriz.nodos
+
         # Diccionario de diccionarios con distancias mínimas
-        distancias = dict(nx.floyd_warshall(G, weight='distancia'))
-        # Diccionario con caminos más cortos
-        caminos = dict(nx.floyd_warshall_predecessor_and_distance(G, weight='distancia')[0])
+        distancias = {u: {v: matriz.distancia(u, v) for v in nodos} for u in nodos}
 
-        # Reconstruir caminos
+        # Reconstruir caminos y calcular tiempos
         rutas = {}
-        for u in distancias:
-            rutas[u] = {}
-            for v in distancias[u]:
-                if u == v:
-                    rutas[u][v] = [u]
-                elif v in caminos[u]:
-                    path = []
-                    actual = v
-                    while actual != u:
-                        path.insert(0, actual)
-                        actual = caminos[u][actual]
-                    path.insert(0, u)
-                    rutas[u][v] = path
-
-        # Calcular tiempos
         tiempos = {}
-        for u in rutas:
+        for u in nodos:
+            rutas[u] = {}
             tiempos[u] = {}
-            for v in rutas[u]:
-                path = rutas[u][v]
-                tiempo = sum(G[path[i]][path[i+1]]['eta'] for i in range(len(path)-1)) if len(path) > 1 else 0
-                tiempos[u][v] = tiempo
+            for v in nodos:
+                path = matriz.camino(u, v)
+                if path is not None:
+                    rutas[u][v] = path
+                    # Desde la matriz: G puede ser un GrafoCSR, que no se indexa como G[u][v]
+                    tiempos[u][v] = matriz.tiempo(u, v) if len(path) > 1 else 0
 
         return distancias, rutas, tiempos, "Floyd-Warshall"
     except Exception as e:
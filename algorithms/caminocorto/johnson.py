@@ -0,0 +1,89 @@
+import heapq
+import networkx as nx
+import numpy as np
+from algorithms.caminocorto.matriz_caminos import MatrizCaminos, SIN_PREDECESOR
+from models.grafo_csr import csr_de
+
+def _arcos(csr):
+    """Lista de arcos (i, j, distancia, eta) del CSR; en grafos no dirigidos cada arista aporta los dos sentidos"""
+    inicio, destinos, pesos, etas = csr.listas()
+    return [
+        (i, destinos[a], pesos[a], etas[a])
+        for i in range(len(inicio) - 1)
+        for a in range(inicio[i], inicio[i + 1])
+    ]
+
+def potenciales_johnson(n, arcos):
+    """
+    Bellman-Ford desde un nodo virtual unido con peso 0 a todos los demás.
+    Devuelve h tal que w(u, v) + h[u] - h[v] >= 0 en todo arco; lanza
+    nx.NetworkXUnbounded si hay un ciclo negativo.
+    """
+    h = [0.0] * n
+    for _ in range(n):
+        cambio = False
+        for i, j, w, _t in arcos:
+            if h[i] + w < h[j]:
+                h[j] = h[i] + w
+                cambio = True
+        if not cambio:
+            return h
+    raise nx.NetworkXUnbounded("El grafo contiene un ciclo con peso negativo")
+
+def _dijkstra_fila(vecinos, s, dist, eta, pred):
+    """Dijkstra desde s sobre pesos ya reajustados; escribe la fila s de las matrices"""
+    dist[s] = 0.0
+    eta[s] = 0.0
+    cola = [(0.0, s)]
+    cerrados = set()
+    while cola:
+        d, i = heapq.heappop(cola)
+        if i in cerrados:
+            continue
+        cerrados.add(i)
+        for j, w, t in vecinos[i]:
+            nd = d + w
+            if nd < dist[j]:
+                dist[j] = nd
+                eta[j] = eta[i] + t
+                pred[j] = i
+                heapq.heappush(cola, (nd, j))
+
+def matriz_johnson(G):
+    """
+    Todos los caminos más cortos con el algoritmo de Johnson: un Bellman-Ford para
+    reajustar los pesos (admite aristas negativas sin ciclos negativos, p. ej. peajes
+    con subsidio) y luego un Dijkstra por cada origen. En grafos dispersos es
+    O(V·E·log V) frente al O(V³) de Floyd-Warshall.
+    """
+    csr = csr_de(G)
+    nodos = csr.nodos
+    n = len(nodos)
+    arcos = _arcos(csr)
+    h = potenciales_johnson(n, arcos)
+    vecinos = [[] for _ in range(n)]
+    for i, j, w, t in arcos:
+        vecinos[i].append((j, w + h[i] - h[j], t))
+
+    dist = np.full((n, n), np.inf)
+    eta = np.full((n, n), np.inf)
+    pred = np.full((n, n), SIN_PREDECESOR, dtype=np.int32)
+    h = np.array(h)
+    for s in range(n):
+        fila_dist = [float('inf')] * n
+        fila_eta = [float('inf')] * n
+        fila_pred = [SIN_PREDECESOR] * n
+        _dijkstra_fila(vecinos, s, fila_dist, fila_eta, fila_pred)
+        # Deshacer el reajuste: d(s, v) = d'(s, v) - h[s] + h[v]
+        dist[s] = np.array(fila_dist) - h[s] + h
+        eta[s] = fila_eta
+        pred[s] = fila_pred
+    return MatrizCaminos(nodos, dist, pred, eta=eta, nombre="Johnson", G=G)
+
+def shortest_paths_johnson(G):
+    """Calcula todos los caminos más cortos usando Johnson (misma forma que shortest_paths_floyd_warshall)"""
+    try:
+        return (*matriz_johnson(G).vistas(), "Johnson")
+    except Exception as e:
+        print("Error en Johnson:", e)
+        return {}, {}, {}, "Johnson"
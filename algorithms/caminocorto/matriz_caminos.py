@@ -0,0 +1,127 @@
+from collections.abc import Mapping
+import numpy as np
+
+SIN_PREDECESOR = -1
+
+
+class MatrizCaminos:
+    """
+    Resultado de un algoritmo de todos los pares guardado como matrices densas:
+    dist[i, j] (km), pred[i, j] (índice del nodo anterior a j en el camino desde i)
+    y, si el algoritmo la calculó, eta[i, j] (min).
+    Los caminos se reconstruyen solo cuando se piden.
+    """
+
+    def __init__(self, nodos, dist, pred, eta=None, nombre="", G=None):
+        self.nodos = list(nodos)
+        self.indice = {n: i for i, n in enumerate(self.nodos)}
+        self.dist = dist
+        self.pred = pred
+        self.eta = eta
+        self.nombre = nombre
+        self._G = G
+
+    def __contains__(self, nodo):
+        return nodo in self.indice
+
+    def distancia(self, u, v):
+        return float(self.dist[self.indice[u], self.indice[v]])
+
+    def camino(self, u, v):
+        """Lista de nodos de u a v, o None si v no es alcanzable desde u"""
+        i, j = self.indice[u], self.indice[v]
+        if i == j:
+            return [u]
+        if self.pred[i, j] == SIN_PREDECESOR:
+            return None
+        fila = self.pred[i]
+        indices = [j]
+        while j != i:
+            j = int(fila[j])
+            indices.append(j)
+        indices.reverse()
+        return [self.nodos[k] for k in indices]
+
+    def tiempo(self, u, v):
+        """ETA total del camino de u a v (inf si no hay camino)"""
+        i, j = self.indice[u], self.indice[v]
+        if self.eta is not None:
+            return float(self.eta[i, j])
+        path = self.camino(u, v)
+        if path is None:
+            return float('inf')
+        G = self._G
+        return sum(G[path[k]][path[k + 1]]['eta'] for k in range(len(path) - 1))
+
+    def alcanzable(self, i, j):
+        return i == j or self.pred[i, j] != SIN_PREDECESOR
+
+    def vistas(self):
+        """
+        (distancias, rutas, tiempos) con la misma forma de diccionario de diccionarios que
+        devuelve shortest_paths_floyd_warshall, pero perezosos: cada valor se obtiene de
+        las matrices al consultarlo. rutas y tiempos solo contienen destinos alcanzables.
+        """
+        distancias = _VistaMatriz(self, lambda i, j: float(self.dist[i, j]), solo_alcanzables=False)
+        rutas = _VistaMatriz(self, lambda i, j: self.camino(self.nodos[i], self.nodos[j]))
+        tiempos = _VistaMatriz(self, lambda i, j: self.tiempo(self.nodos[i], self.nodos[j]))
+        return distancias, rutas, tiempos
+
+    @classmethod
+    def desde_predecesores(cls, G, predecesores, distancias, nombre=""):
+        """Construye la matriz a partir de los diccionarios de nx.floyd_warshall_predecessor_and_distance"""
+        nodos = list(G.nodes)
+        indice = {n: i for i, n in enumerate(nodos)}
+        n = len(nodos)
+        dist = np.full((n, n), np.inf)
+        pred = np.full((n, n), SIN_PREDECESOR, dtype=np.int32)
+        for u, fila in distancias.items():
+            i = indice[u]
+            for v, d in fila.items():
+                dist[i, indice[v]] = d
+        for u, fila in predecesores.items():
+            i = indice[u]
+            for v, p in fila.items():
+                pred[i, indice[v]] = indice[p]
+        return cls(nodos, dist, pred, nombre=nombre, G=G)
+
+
+class _VistaFila(Mapping):
+    def __init__(self, matriz, i, valor, solo_alcanzables):
+        self._matriz = matriz
+        self._i = i
+        self._valor = valor
+        self._solo_alcanzables = solo_alcanzables
+
+    def __getitem__(self, v):
+        j = self._matriz.indice[v]
+        if self._solo_alcanzables and not self._matriz.alcanzable(self._i, j):
+            raise KeyError(v)
+        return self._valor(self._i, j)
+
+    def __iter__(self):
+        matriz = self._matriz
+        for j, v in enumerate(matriz.nodos):
+            if not self._solo_alcanzables or matriz.alcanzable(self._i, j):
+                yield v
+
+    def __len__(self):
+        if not self._solo_alcanzables:
+            return len(self._matriz.nodos)
+        return sum(1 for _ in self)
+
+
+class _VistaMatriz(Mapping):
+    def __init__(self, matriz, valor, solo_alcanzables=True):
+        self._matriz = matriz
+        self._valor = valor
+        self._solo_alcanzables = solo_alcanzables
+
+    def __getitem__(self, u):
+        return _VistaFila(self._matriz, self._matriz.indice[u], self._valor, self._solo_alcanzables)
+
+    def __iter__(self):
+        return iter(self._matriz.nodos)
+
+    def __len__(self):
+        return len(self._matriz.nodos)
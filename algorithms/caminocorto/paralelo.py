@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from algorithms.caminocorto.dijkstra import dijkstra_csr
+from algorithms.caminocorto.matriz_caminos import MatrizCaminos
+from models.grafo_csr import csr_de
+
+
+def grafo_csr(G):
+    """
+    Arreglos CSR del grafo (ver GrafoCSR): los vecinos del nodo i son
+    destinos[offsets[i]:offsets[i + 1]], con sus pesos y ETAs en las mismas posiciones.
+    """
+    csr = csr_de(G)
+    return csr.nodos, csr.offsets, csr.destinos, csr.distancia, csr.eta
+
+
+# ----------- Trabajadores -----------
+# Cada proceso se adjunta una sola vez a los bloques de memoria compartida (el grafo CSR
+# de solo lectura y las matrices de salida) y escribe directamente las filas que le tocan.
+# dijkstra_csr lee el CSR por memoryview sobre los mismos bloques: indexarlo da int y
+# float de Python casi tan rápido como una lista, sin copiar el grafo en cada proceso.
+_bloques = {}
+_arreglos = {}
+_csr = []
+
+def _adjuntar(descripcion):
+    for nombre, (bloque, forma, tipo) in descripcion.items():
+        shm = shared_memory.SharedMemory(name=bloque)
+        _bloques[nombre] = shm
+        _arreglos[nombre] = np.ndarray(forma, dtype=tipo, buffer=shm.buf)
+    _csr[:] = [_vista(_bloques[c], descripcion[c][2], _arreglos[c].nbytes)
+               for c in ('offsets', 'destinos', 'pesos', 'etas')]
+
+def _vista(shm, tipo, nbytes):
+    # El bloque puede ser más grande que el arreglo (se redondea a páginas)
+    return shm.buf[:nbytes].cast(np.dtype(tipo).char)
+
+def _soltar():
+    # Las vistas deben liberarse antes de cerrar los bloques
+    for vista in _csr:
+        vista.release()
+    _csr.clear()
+    _arreglos.clear()
+    for shm in _bloques.values():
+        shm.close()
+    _bloques.clear()
+
+def _resolver_origenes(origenes):
+    dist, eta, pred = _arreglos['dist'], _arreglos['eta'], _arreglos['pred']
+    for s in origenes:
+        dist[s], eta[s], pred[s] = dijkstra_csr(*_csr, s)
+    return len(origenes)
+
+
+def matriz_dijkstra_paralelo(G, procesos=None, lote=None):
+    """
+    Todos los pares con un Dijkstra por origen repartido entre `procesos` procesos
+    (por defecto todos los núcleos). Los trabajadores leen una copia CSR del grafo y
+    escriben sus filas en matrices de distancia, ETA y predecesores en memoria compartida.
+    """
+    nodos, offsets, destinos, pesos, etas = grafo_csr(G)
+    n = len(nodos)
+    procesos = procesos or os.cpu_count() or 1
+    entradas = {'offsets': offsets, 'destinos': destinos, 'pesos': pesos, 'etas': etas}
+    salidas = {'dist': ((n, n), np.float64), 'eta': ((n, n), np.float64), 'pred': ((n, n), np.int32)}
+
+    bloques = []
+    try:
+        descripcion = {}
+        for nombre, arreglo in entradas.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arreglo.nbytes))
+            bloques.append(shm)
+            np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=shm.buf)[:] = arreglo
+            descripcion[nombre] = (shm.name, arreglo.shape, arreglo.dtype)
+        for nombre, (forma, tipo) in salidas.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(1, n * n * np.dtype(tipo).itemsize))
+            bloques.append(shm)
+            descripcion[nombre] = (shm.name, forma, tipo)
+
+        origenes = list(range(n))
+        lote = lote or max(1, n // (procesos * 4))
+        lotes = [origenes[k:k + lote] for k in range(0, n, lote)]
+        if procesos == 1:
+            _adjuntar(descripcion)
+            for grupo in lotes:
+                _resolver_origenes(grupo)
+        else:
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_adjuntar, initargs=(descripcion,)) as pool:
+                list(pool.map(_resolver_origenes, lotes))
+
+        resultado = {}
+        for shm, (nombre, (forma, tipo)) in zip(bloques[len(entradas):], salidas.items()):
+            resultado[nombre] = np.ndarray(forma, dtype=tipo, buffer=shm.buf).copy()
+    finally:
+        _soltar()
+        for shm in bloques:
+            shm.close()
+            shm.unlink()
+    return MatrizCaminos(nodos, resultado['dist'], resultado['pred'], eta=resultado['eta'],
+                         nombre="Dijkstra (paralelo)", G=G)
+
+
+def shortest_paths_parallel(G, procesos=None):
+    """Todos los caminos más cortos en paralelo (misma forma que shortest_paths_floyd_warshall)"""
+    try:
+        return (*matriz_dijkstra_paralelo(G, procesos=procesos).vistas(), "Dijkstra (paralelo)")
+    except Exception as e:
+        print("Error en Dijkstra paralelo:", e)
+        return {}, {}, {}, "Dijkstra (paralelo)"
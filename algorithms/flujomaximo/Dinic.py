@@ -0,0 +1,87 @@
+from algorithms.flujomaximo.red_residual import usar_red
+
+def _niveles_bfs(red, s, t, nivel, cola):
+    """Grafo de niveles: distancia en arcos desde s usando solo arcos con capacidad residual"""
+    inicio, destino, capacidad = red.inicio, red.destino, red.capacidad
+    for i in range(len(nivel)):
+        nivel[i] = -1
+    nivel[s] = 0
+    cola[0] = s
+    cabeza, fin = 0, 1
+    while cabeza < fin:
+        i = cola[cabeza]
+        cabeza += 1
+        for a in range(inicio[i], inicio[i + 1]):
+            j = destino[a]
+            if capacidad[a] > 0 and nivel[j] < 0:
+                nivel[j] = nivel[i] + 1
+                cola[fin] = j
+                fin += 1
+    return nivel[t] >= 0
+
+def flujo_bloqueante_dinic(red, s, t):
+    """
+    Núcleo de Dinic sobre una RedResidual (nodos como enteros): en cada fase construye
+    el grafo de niveles con BFS y satura un flujo bloqueante con DFS iterativo. El
+    puntero de arco actual de cada nodo hace que un arco descartado no se vuelva a
+    revisar en la misma fase. Devuelve (flujo agregado, caminos de aumento).
+    """
+    n = len(red.nodos)
+    inicio, destino, reverso, capacidad = red.inicio, red.destino, red.reverso, red.capacidad
+
+    nivel = [-1] * n
+    cola = [0] * n
+    actual = [0] * n
+
+    max_flow = 0
+    flow_paths = []
+    while _niveles_bfs(red, s, t, nivel, cola):
+        for i in range(n):
+            actual[i] = inicio[i]
+        pila = []
+        i = s
+        while True:
+            if i == t:
+                bottleneck = min(capacidad[a] for a in pila)
+                for a in pila:
+                    capacidad[a] -= bottleneck
+                    capacidad[reverso[a]] += bottleneck
+                max_flow += bottleneck
+                flow_paths.append({
+                    'path': [red.nodos[s]] + [red.nodos[destino[a]] for a in pila],
+                    'flow': bottleneck,
+                    'total_flow': max_flow
+                })
+                # Retroceder hasta la cola del primer arco saturado
+                k = next(k for k, a in enumerate(pila) if capacidad[a] == 0)
+                del pila[k:]
+                i = destino[pila[-1]] if pila else s
+                continue
+
+            avanzo = False
+            while actual[i] < inicio[i + 1]:
+                a = actual[i]
+                j = destino[a]
+                if capacidad[a] > 0 and nivel[j] == nivel[i] + 1:
+                    pila.append(a)
+                    i = j
+                    avanzo = True
+                    break
+                actual[i] += 1
+            if avanzo:
+                continue
+            # Callejón sin salida: se descarta el nodo en esta fase
+            if i == s:
+                break
+            nivel[i] = -1
+            a = pila.pop()
+            i = destino[reverso[a]]
+            actual[i] += 1
+
+    return max_flow, flow_paths
+
+def dinic(G, source, sink, red=None):
+    """Algoritmo de Dinic sobre la red residual compartida de G"""
+    with usar_red(G, red) as red:
+        max_flow, flow_paths = flujo_bloqueante_dinic(red, red.indice[source], red.indice[sink])
+        return max_flow, flow_paths, red.edge_flows()
@@ -0,0 +1,70 @@
+from algorithms.flujomaximo.red_residual import usar_red
+
+def aumentos_edmonds_karp(red, s, t):
+    """
+    Núcleo de Edmonds-Karp sobre una RedResidual (nodos como enteros). Aumenta a partir
+    del flujo que ya tenga la red y devuelve (flujo agregado, caminos de aumento).
+    El BFS guarda solo el arco por el que se llegó a cada nodo y reutiliza los mismos
+    arreglos en todas las iteraciones (las marcas de visita se invalidan cambiando de
+    sello en vez de limpiarlas).
+    """
+    n = len(red.nodos)
+    inicio, destino, reverso, capacidad = red.inicio, red.destino, red.reverso, red.capacidad
+
+    arco_padre = [-1] * n
+    marca = [0] * n
+    cola = [0] * n
+    sello = 0
+
+    max_flow = 0
+    flow_paths = []
+    while True:
+        # BFS en el residual
+        sello += 1
+        marca[s] = sello
+        cola[0] = s
+        cabeza, fin = 0, 1
+        while cabeza < fin and marca[t] != sello:
+            i = cola[cabeza]
+            cabeza += 1
+            for a in range(inicio[i], inicio[i + 1]):
+                if capacidad[a] > 0:
+                    j = destino[a]
+                    if marca[j] != sello:
+                        marca[j] = sello
+                        arco_padre[j] = a
+                        cola[fin] = j
+                        fin += 1
+        if marca[t] != sello:
+            break
+
+        # Cuello de botella y aumento siguiendo los arcos padre desde el sumidero
+        bottleneck = float('inf')
+        j = t
+        while j != s:
+            a = arco_padre[j]
+            bottleneck = min(bottleneck, capacidad[a])
+            j = destino[reverso[a]]
+        path = [t]
+        j = t
+        while j != s:
+            a = arco_padre[j]
+            capacidad[a] -= bottleneck
+            capacidad[reverso[a]] += bottleneck
+            j = destino[reverso[a]]
+            path.append(j)
+        path.reverse()
+
+        max_flow += bottleneck
+        flow_paths.append({
+            'path': [red.nodos[i] for i in path],
+            'flow': bottleneck,
+            'total_flow': max_flow
+        })
+    return max_flow, flow_paths
+
+def edmonds_karp(G, source, sink, red=None):
+    """Edmonds-Karp: caminos de aumento más cortos (BFS) sobre la red residual compartida de G"""
+    with usar_red(G, red) as red:
+        max_flow, flow_paths = aumentos_edmonds_karp(red, red.indice[source], red.indice[sink])
+        return max_flow, flow_paths, red.edge_flows()
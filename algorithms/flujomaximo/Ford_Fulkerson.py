@@ -1,43 +1,77 @@
 import networkx as nx
 from collections import defaultdict, deque
+from algorithms.flujomaximo.red_residual import usar_red
+from algorithms.flujomaximo.Edmonds_Karp import aumentos_edmonds_karp
+from algorithms.flujomaximo.Dinic import flujo_bloqueante_dinic
+from algorithms.flujomaximo.Push_Relabel import preflujo_push_relabel
+from models.grafo_csr import GrafoCSR
 
-def ford_fulkerson(G, source, sink):
+def ford_fulkerson(G, source, sink, red=None):
     """
     Implementación del algoritmo Ford-Fulkerson para encontrar el flujo máximo
     entre un nodo fuente y un nodo sumidero.
+    Usa la red residual compartida de G (RedResidual) y busca los caminos de
+    aumento con DFS, a diferencia de Edmonds-Karp que usa BFS.
     """
-    # Crear grafo residual
-    residual_graph = create_residual_graph(G)
-    
+    with usar_red(G, red) as red:
+        max_flow, flow_paths = aumentos_ford_fulkerson(red, red.indice[source], red.indice[sink])
+        # Calcular el flujo por cada arista
+        return max_flow, flow_paths, red.edge_flows()
+
+def aumentos_ford_fulkerson(red, s, t):
+    """Caminos de aumento por DFS sobre una RedResidual; devuelve (flujo agregado, caminos)"""
+    n = len(red.nodos)
+    inicio, destino, reverso, capacidad = red.inicio, red.destino, red.reverso, red.capacidad
+    arco_padre = [-1] * n
+    marca = [0] * n
+    sello = 0
+
     max_flow = 0
     flow_paths = []
-    
     # Mientras exista un camino de aumento
     while True:
-        # Encontrar camino de aumento usando BFS
-        path, bottleneck = find_augmenting_path_bfs(residual_graph, source, sink)
-        
-        if not path:
+        sello += 1
+        marca[s] = sello
+        pila = [s]
+        while pila and marca[t] != sello:
+            i = pila.pop()
+            for a in range(inicio[i], inicio[i + 1]):
+                j = destino[a]
+                if capacidad[a] > 0 and marca[j] != sello:
+                    marca[j] = sello
+                    arco_padre[j] = a
+                    pila.append(j)
+        if marca[t] != sello:
             break
-            
-        # Actualizar el flujo máximo
+
+        # Cuello de botella y actualización del residual
+        path = [t]
+        bottleneck = float('inf')
+        j = t
+        while j != s:
+            a = arco_padre[j]
+            bottleneck = min(bottleneck, capacidad[a])
+            j = destino[reverso[a]]
+            path.append(j)
+        j = t
+        while j != s:
+            a = arco_padre[j]
+            capacidad[a] -= bottleneck
+            capacidad[reverso[a]] += bottleneck
+            j = destino[reverso[a]]
+        path.reverse()
+
+        # Actualizar el flujo máximo y guardar información del camino
         max_flow += bottleneck
-        
-        # Guardar información del camino
         flow_paths.append({
-            'path': path,
+            'path': [red.nodos[i] for i in path],
             'flow': bottleneck,
             'total_flow': max_flow
         })
-        
-        # Actualizar el grafo residual
-        update_residual_graph(residual_graph, path, bottleneck)
-    
-    # Calcular el flujo por cada arista
-    edge_flows = calculate_edge_flows(G, residual_graph)
-    
-    return max_flow, flow_paths, edge_flows
+    return max_flow, flow_paths
 
+# ----------- Grafo residual con diccionarios (versión original) -----------
+# Ya no los usa ningún algoritmo (todos trabajan sobre RedResidual); se mantienen por compatibilidad.
 def create_residual_graph(G):
     """Crea el grafo residual basado en el grafo original"""
     residual = defaultdict(lambda: defaultdict(int))
@@ -110,32 +144,71 @@ def calculate_edge_flows(original_graph, residual_graph):
     
     return edge_flows
 
-def find_max_flow_paths(G, source, sink):
+# Núcleos disponibles para find_max_flow_paths: reciben (red, s, t) con nodos como
+# enteros y devuelven (max_flow, flow_paths)
+ALGORITMOS_FLUJO = {
+    'Ford-Fulkerson': aumentos_ford_fulkerson,
+    'Edmonds-Karp': aumentos_edmonds_karp,
+    'Dinic': flujo_bloqueante_dinic,
+    'Push-Relabel': preflujo_push_relabel,
+}
+
+def find_max_flow_paths(G, source, sink, algoritmo='Ford-Fulkerson'):
     """
-    Función principal que encapsula el algoritmo Ford-Fulkerson
+    Función principal que encapsula los algoritmos de flujo máximo.
+    Además del flujo devuelve el corte mínimo tomado del residual final:
+    'source_side' (nodos alcanzables desde la fuente) y 'cut_edges' (aristas saturadas
+    que separan ese lado del resto, las que limitan el flujo).
     """
     try:
-        max_flow, flow_paths, edge_flows = ford_fulkerson(G, source, sink)
+        nucleo = ALGORITMOS_FLUJO[algoritmo]
+        with usar_red(G) as red:
+            s, t = red.indice[source], red.indice[sink]
+            max_flow, flow_paths = nucleo(red, s, t)
+            edge_flows = red.edge_flows()
+            source_side, cut_edges = red.corte_minimo(s)
         
         return {
             'max_flow': max_flow,
             'flow_paths': flow_paths,
             'edge_flows': edge_flows,
-            'algorithm': 'Ford-Fulkerson'
+            'source_side': source_side,
+            'cut_edges': cut_edges,
+            'algorithm': algoritmo
         }
     except Exception as e:
-        print(f"Error en Ford-Fulkerson: {e}")
+        print(f"Error en {algoritmo}: {e}")
         return {
             'max_flow': 0,
             'flow_paths': [],
             'edge_flows': {},
-            'algorithm': 'Ford-Fulkerson',
+            'source_side': set(),
+            'cut_edges': [],
+            'algorithm': algoritmo,
             'error': str(e)
         }
 
+# ----------- Proceso de trabajo con el grafo ya cargado -----------
+# La interfaz siembra el proceso una vez por versión del grafo (initializer del pool) y
+# cada consulta envía solo fuente, sumidero y algoritmo: el grafo no se vuelve a copiar y
+# la red residual construida en la primera consulta se reutiliza en las siguientes.
+_grafo_trabajador = None
+
+def sembrar_trabajador(G):
+    global _grafo_trabajador
+    _grafo_trabajador = G
+
+def flujo_en_trabajador(source, sink, algoritmo='Ford-Fulkerson'):
+    """find_max_flow_paths sobre el grafo sembrado con sembrar_trabajador"""
+    if _grafo_trabajador is None:
+        raise RuntimeError("El proceso de trabajo no tiene grafo")
+    return find_max_flow_paths(_grafo_trabajador, source, sink, algoritmo)
+
 # Función auxiliar para verificar si un grafo es válido para flujo máximo
 def validate_flow_graph(G, source, sink):
     """Valida que el grafo sea apropiado para algoritmos de flujo máximo"""
+    if isinstance(G, GrafoCSR):
+        G = G.a_networkx()
     errors = []
     
     if source not in G.nodes():
@@ -0,0 +1,183 @@
+from collections import deque
+from algorithms.flujomaximo.red_residual import usar_red
+
+
+class _NodosActivos:
+    """
+    Nodos con exceso pendientes de descargar.
+    'fifo' los atiende en orden de llegada; 'highest' siempre el de mayor altura
+    (cubetas por altura; si la altura cambió desde que se agregó, se reubica al sacarlo).
+    """
+
+    def __init__(self, n, altura, seleccion):
+        if seleccion not in ('fifo', 'highest'):
+            raise ValueError(f"Selección desconocida: {seleccion!r} (usa 'fifo' o 'highest')")
+        self.altura = altura
+        self.fifo = seleccion == 'fifo'
+        self.cola = deque()
+        self.cubetas = [[] for _ in range(2 * n + 1)]
+        self.maximo = 0
+        self.en_cola = [False] * n
+
+    def agregar(self, u):
+        if self.en_cola[u]:
+            return
+        self.en_cola[u] = True
+        if self.fifo:
+            self.cola.append(u)
+        else:
+            h = self.altura[u]
+            self.cubetas[h].append(u)
+            if h > self.maximo:
+                self.maximo = h
+
+    def sacar(self):
+        if self.fifo:
+            if not self.cola:
+                return None
+            u = self.cola.popleft()
+            self.en_cola[u] = False
+            return u
+        while self.maximo >= 0:
+            cubeta = self.cubetas[self.maximo]
+            if not cubeta:
+                self.maximo -= 1
+                continue
+            u = cubeta.pop()
+            if self.altura[u] != self.maximo:
+                self.en_cola[u] = False
+                self.agregar(u)
+                continue
+            self.en_cola[u] = False
+            return u
+        self.maximo = 0
+        return None
+
+    def vaciar(self):
+        self.cola.clear()
+        for cubeta in self.cubetas:
+            cubeta.clear()
+        self.maximo = 0
+        for u in range(len(self.en_cola)):
+            self.en_cola[u] = False
+
+
+def preflujo_push_relabel(red, s, t, seleccion='highest'):
+    """
+    Núcleo de push-relabel (Goldberg-Tarjan) sobre una RedResidual (nodos como enteros)
+    con selección FIFO o de mayor etiqueta, heurística de hueco (gap) y reetiquetado
+    global periódico por BFS desde el sumidero. Devuelve (flujo máximo, []) como los
+    demás núcleos: no hay caminos de aumento. Al terminar la red contiene un flujo
+    válido (el exceso sobrante volvió a la fuente).
+    """
+    n = len(red.nodos)
+    m = len(red.destino)
+    inicio, destino, reverso, capacidad = red.inicio, red.destino, red.reverso, red.capacidad
+
+    altura = [0] * n
+    exceso = [0] * n
+    actual = [0] * n
+    cuenta = [0] * (2 * n + 1)
+    activos = _NodosActivos(n, altura, seleccion)
+    cola = [0] * n
+
+    def reetiquetado_global():
+        # Alturas exactas: distancia residual al sumidero, o n + distancia a la fuente
+        # para los nodos que ya no llegan al sumidero (su exceso vuelve a la fuente)
+        for i in range(n):
+            altura[i] = 2 * n
+            actual[i] = inicio[i]
+        for c in range(len(cuenta)):
+            cuenta[c] = 0
+        for raiz, base in ((t, 0), (s, n)):
+            altura[raiz] = base
+            cola[0] = raiz
+            cabeza, fin = 0, 1
+            while cabeza < fin:
+                v = cola[cabeza]
+                cabeza += 1
+                for a in range(inicio[v], inicio[v + 1]):
+                    u = destino[a]
+                    if altura[u] == 2 * n and capacidad[reverso[a]] > 0:
+                        altura[u] = altura[v] + 1
+                        cola[fin] = u
+                        fin += 1
+        for i in range(n):
+            cuenta[altura[i]] += 1
+        activos.vaciar()
+        for i in range(n):
+            if exceso[i] > 0 and i != s and i != t:
+                activos.agregar(i)
+
+    # Preflujo inicial: saturar los arcos que salen de la fuente
+    for a in range(inicio[s], inicio[s + 1]):
+        c = capacidad[a]
+        if c > 0:
+            capacidad[a] = 0
+            capacidad[reverso[a]] += c
+            exceso[destino[a]] += c
+            exceso[s] -= c
+    reetiquetado_global()
+
+    trabajo = 0
+    umbral = 6 * n + m
+    while True:
+        u = activos.sacar()
+        if u is None:
+            break
+        primero, ultimo = inicio[u], inicio[u + 1]
+        while exceso[u] > 0:
+            if actual[u] == ultimo:
+                # Reetiquetar
+                vieja = altura[u]
+                nueva = 2 * n
+                for a in range(primero, ultimo):
+                    if capacidad[a] > 0 and altura[destino[a]] + 1 < nueva:
+                        nueva = altura[destino[a]] + 1
+                cuenta[vieja] -= 1
+                altura[u] = nueva
+                cuenta[nueva] += 1
+                actual[u] = primero
+                trabajo += ultimo - primero + 12
+                # Heurística de hueco: ningún nodo quedó a altura `vieja`, así que los que
+                # están por encima (y debajo de n) ya no pueden llegar al sumidero
+                if cuenta[vieja] == 0 and vieja < n:
+                    for v in range(n):
+                        if vieja < altura[v] < n:
+                            cuenta[altura[v]] -= 1
+                            altura[v] = n + 1
+                            cuenta[n + 1] += 1
+                            actual[v] = inicio[v]
+                continue
+            a = actual[u]
+            v = destino[a]
+            if capacidad[a] > 0 and altura[u] == altura[v] + 1:
+                d = min(exceso[u], capacidad[a])
+                capacidad[a] -= d
+                capacidad[reverso[a]] += d
+                exceso[u] -= d
+                exceso[v] += d
+                if v != s and v != t:
+                    activos.agregar(v)
+            else:
+                actual[u] += 1
+        if trabajo > umbral:
+            trabajo = 0
+            reetiquetado_global()
+
+    return exceso[t], []
+
+
+def push_relabel(G, source, sink, red=None, seleccion='highest'):
+    """
+    Push-relabel sobre la red residual compartida de G. No produce caminos de aumento:
+    flow_paths queda vacío y el resultado útil es el flujo por arista, en el mismo
+    formato que calculate_edge_flows.
+    """
+    with usar_red(G, red) as red:
+        max_flow, flow_paths = preflujo_push_relabel(red, red.indice[source], red.indice[sink], seleccion)
+        return max_flow, flow_paths, red.edge_flows()
+
+
+def push_relabel_fifo(G, source, sink, red=None):
+    return push_relabel(G, source, sink, red=red, seleccion='fifo')
@@ -0,0 +1,139 @@
+import math
+
+from algorithms.flujomaximo.red_residual import RedResidual
+from models.grafo_csr import GrafoCSR, marcar_modificado
+from algorithms.flujomaximo.Ford_Fulkerson import ALGORITMOS_FLUJO
+from algorithms.flujomaximo.Edmonds_Karp import aumentos_edmonds_karp
+
+
+def _empujar(red, desde, hacia, cantidad):
+    """
+    Mueve hasta `cantidad` unidades de `desde` a `hacia` por caminos del residual (BFS)
+    y devuelve cuánto se pudo mover.
+    """
+    inicio, destino, reverso, capacidad = red.inicio, red.destino, red.reverso, red.capacidad
+    n = len(red.nodos)
+    movido = 0
+    while movido < cantidad:
+        arco_padre = [-1] * n
+        visitado = [False] * n
+        visitado[desde] = True
+        cola = [desde]
+        for i in cola:
+            if visitado[hacia]:
+                break
+            for a in range(inicio[i], inicio[i + 1]):
+                j = destino[a]
+                if capacidad[a] > 0 and not visitado[j]:
+                    visitado[j] = True
+                    arco_padre[j] = a
+                    cola.append(j)
+        if not visitado[hacia]:
+            break
+        d = cantidad - movido
+        j = hacia
+        while j != desde:
+            a = arco_padre[j]
+            d = min(d, capacidad[a])
+            j = destino[reverso[a]]
+        j = hacia
+        while j != desde:
+            a = arco_padre[j]
+            capacidad[a] -= d
+            capacidad[reverso[a]] += d
+            j = destino[reverso[a]]
+        movido += d
+    return movido
+
+
+class FlujoIncremental:
+    """
+    Flujo máximo entre `source` y `sink` que se mantiene al cambiar capacidades.
+
+    Guarda su propia red residual con el último flujo. Al reducir la capacidad de un
+    arco por debajo del flujo que lleva, el sobrante se intenta desviar por otro camino;
+    lo que no se puede desviar se devuelve a la fuente y se descuenta del tramo hacia el
+    sumidero. Luego se aumenta (Edmonds-Karp) a partir del flujo actual, así que un
+    cambio pequeño solo cuesta unas pocas búsquedas en lugar de resolver todo de nuevo.
+
+    G puede ser un GrafoCSR; como es inmutable, las nuevas capacidades quedan solo en
+    la red residual y no se escriben en G.
+    """
+
+    def __init__(self, G, source, sink, algoritmo='Dinic'):
+        self.G = G
+        self.source, self.sink = source, sink
+        self.red = RedResidual(G)
+        self.s, self.t = self.red.indice[source], self.red.indice[sink]
+        self.max_flow, _ = ALGORITMOS_FLUJO[algoritmo](self.red, self.s, self.t)
+        self._arcos = None
+
+    def _arista(self, u, v):
+        """Índice de la arista u-v en la red (en el sentido en que está guardada en G)"""
+        red = self.red
+        if self._arcos is None:
+            self._arcos = {(red.cola_arista[k], red.destino[a]): k for k, a in enumerate(red.arco_de_arista)}
+        if u not in red.indice or v not in red.indice:
+            raise KeyError(f"La arista {u}-{v} no existe en el grafo")
+        i, j = red.indice[u], red.indice[v]
+        k = self._arcos.get((i, j))
+        if k is None and not self.G.is_directed():
+            k = self._arcos.get((j, i))
+        if k is None:
+            raise KeyError(f"La arista {u}-{v} no existe en el grafo")
+        return k
+
+    def actualizar_capacidades(self, cambios):
+        """
+        Aplica {(u, v): nueva capacidad} (también al atributo 'flujo' de G, salvo que sea
+        un GrafoCSR), repara el flujo y devuelve el nuevo flujo máximo. Si alguna arista
+        no existe lanza KeyError sin haber cambiado nada.
+        """
+        red = self.red
+        capacidad, original, reverso, destino = red.capacidad, red.capacidad_original, red.reverso, red.destino
+        # Todas las aristas se validan antes de tocar la red
+        aristas = [(self._arista(u, v), nueva) for (u, v), nueva in cambios.items()]
+        en_networkx = not isinstance(self.G, GrafoCSR)
+        for k, nueva in aristas:
+            a = red.arco_de_arista[k]
+            b = reverso[a]
+            flujo = original[a] - capacidad[a]
+            original[a] = nueva
+            if en_networkx:
+                self.G[red.nodos[red.cola_arista[k]]][red.nodos[destino[a]]]['flujo'] = nueva
+            if nueva >= flujo:
+                capacidad[a] = nueva - flujo
+                continue
+            # El arco lleva más de lo que ahora admite: se baja a la nueva capacidad
+            sobrante = flujo - nueva
+            capacidad[a] = 0
+            capacidad[b] -= sobrante
+            i, j = destino[b], destino[a]
+            sobrante -= _empujar(red, i, j, sobrante)
+            if sobrante > 0:
+                # Lo que no se desvió vuelve a la fuente y deja de llegar al sumidero. Por
+                # conservación ambos tramos admiten todo el sobrante; si no coinciden la red
+                # quedó con un nodo desbalanceado
+                a_fuente = _empujar(red, i, self.s, sobrante) if i != self.s else sobrante
+                del_sumidero = _empujar(red, self.t, j, sobrante) if j != self.t else sobrante
+                assert math.isclose(a_fuente, del_sumidero, rel_tol=1e-9, abs_tol=1e-9), \
+                    f"Flujo desbalanceado al reducir {red.nodos[i]}-{red.nodos[j]}: {a_fuente} != {del_sumidero}"
+                self.max_flow -= min(a_fuente, del_sumidero)
+        # La red y el CSR en caché de G (y lo que sale de él) quedaron desactualizados
+        if en_networkx:
+            marcar_modificado(self.G)
+        extra, _ = aumentos_edmonds_karp(red, self.s, self.t)
+        self.max_flow += extra
+        return self.max_flow
+
+    def resultado(self):
+        """Flujo actual con el mismo formato que find_max_flow_paths (sin caminos de aumento)"""
+        source_side, cut_edges = self.red.corte_minimo(self.s)
+        return {
+            'max_flow': self.max_flow,
+            'flow_paths': [],
+            'edge_flows': self.red.edge_flows(),
+            'source_side': source_side,
+            'cut_edges': cut_edges,
+            'algorithm': 'Incremental'
+        }
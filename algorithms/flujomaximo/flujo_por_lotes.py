@@ -0,0 +1,89 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.flujomaximo.red_residual import red_residual_de
+from algorithms.flujomaximo.Ford_Fulkerson import ALGORITMOS_FLUJO
+
+
+def _como_lista(nodos):
+    if isinstance(nodos, (list, tuple, set, frozenset)):
+        return list(nodos)
+    return [nodos]
+
+def _validar_grupo(red, fuentes, sumideros):
+    """Validación barata (sin nx.has_path ni recorrer aristas): si no hay camino el flujo es 0"""
+    errores = []
+    for n in fuentes + sumideros:
+        if n not in red.indice or red.indice[n] >= red.n_originales:
+            errores.append(f"El nodo '{n}' no existe en el grafo")
+    if not fuentes or not sumideros:
+        errores.append("Cada grupo necesita al menos una fuente y un sumidero")
+    comunes = set(fuentes) & set(sumideros)
+    if comunes:
+        errores.append(f"Nodos que son fuente y sumidero a la vez: {sorted(comunes)}")
+    return errores
+
+def _resolver_grupo(red, fuentes, sumideros, algoritmo, detalle):
+    resultado = {'sources': fuentes, 'sinks': sumideros, 'algorithm': algoritmo}
+    errores = _validar_grupo(red, fuentes, sumideros)
+    if errores:
+        resultado.update(max_flow=0, error="\n".join(errores))
+        return resultado
+    ids_fuentes = [red.indice[n] for n in fuentes]
+    ids_sumideros = [red.indice[n] for n in sumideros]
+    with red.bloqueo:
+        red.reiniciar()
+        s, t = red.abrir_terminales(ids_fuentes, ids_sumideros)
+        try:
+            max_flow, flow_paths = ALGORITMOS_FLUJO[algoritmo](red, s, t)
+            resultado['max_flow'] = max_flow
+            source_side, resultado['cut_edges'] = red.corte_minimo(s)
+            if detalle:
+                # Los caminos empiezan en la superfuente y terminan en el supersumidero
+                for info in flow_paths:
+                    info['path'] = info['path'][1:-1]
+                resultado.update(flow_paths=flow_paths, edge_flows=red.edge_flows(), source_side=source_side)
+        finally:
+            red.cerrar_terminales(ids_fuentes, ids_sumideros)
+    return resultado
+
+
+# ----------- Trabajadores del pool -----------
+# Cada proceso recibe una sola vez su copia de la red residual y la reutiliza en todas sus consultas
+_red_trabajador = None
+
+def _iniciar_trabajador(red):
+    global _red_trabajador
+    _red_trabajador = red
+
+def _resolver_en_trabajador(args):
+    return _resolver_grupo(_red_trabajador, *args)
+
+
+def batch_max_flow(G, grupos, algoritmo='Dinic', procesos=1, detalle=False):
+    """
+    Flujo máximo para varios grupos (fuentes, sumideros) reutilizando una sola red
+    residual con superfuente y supersumidero; entre consultas solo se reinician las
+    capacidades. Cada fuente o sumidero puede ser un nodo o una lista de nodos.
+
+    procesos > 1 reparte los grupos entre procesos (None = todos los núcleos).
+    Devuelve una lista de diccionarios, en el orden de `grupos`, con 'sources', 'sinks',
+    'max_flow' y 'cut_edges' (o 'error'); con detalle=True también 'flow_paths',
+    'edge_flows' y 'source_side' como find_max_flow_paths.
+    """
+    if algoritmo not in ALGORITMOS_FLUJO:
+        raise ValueError(f"Algoritmo de flujo desconocido: {algoritmo!r}")
+    red = red_residual_de(G, superterminales=True)
+    tareas = [(_como_lista(f), _como_lista(s), algoritmo, detalle) for f, s in grupos]
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(tareas) < 2:
+        return [_resolver_grupo(red, *tarea) for tarea in tareas]
+    lote = max(1, len(tareas) // (procesos * 4))
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador, initargs=(red,)) as pool:
+        return list(pool.map(_resolver_en_trabajador, tareas, chunksize=lote))
+
+def capacidad_entre(G, fuentes, sumideros, algoritmo='Dinic', procesos=1):
+    """Matriz {(fuente, sumidero): flujo máximo} para todos los pares, p. ej. depósitos contra mercados"""
+    pares = [(f, s) for f in fuentes for s in sumideros if f != s]
+    resultados = batch_max_flow(G, pares, algoritmo=algoritmo, procesos=procesos)
+    return {(f, s): r['max_flow'] for (f, s), r in zip(pares, resultados)}
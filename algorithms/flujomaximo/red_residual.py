@@ -0,0 +1,204 @@
+import threading
+import weakref
+from array import array
+from contextlib import contextmanager
+
+from models.grafo_csr import csr_de
+
+
+class RedResidual:
+    """
+    Red residual compacta en formato CSR con nodos indexados por enteros.
+
+    Los arcos que salen del nodo i ocupan las posiciones inicio[i] .. inicio[i + 1] - 1.
+    Cada arista (u, v) del grafo original es un arco u -> v con su capacidad y un arco
+    reverso v -> u (capacidad inicial 0); reverso[a] da la pareja de a, así que empujar
+    flujo por a es restar en capacidad[a] y sumar en capacidad[reverso[a]].
+    Todo se guarda en arreglos de `array` (4 u 8 bytes por arco) en lugar de diccionarios.
+    """
+
+    SUPERFUENTE = '__superfuente__'
+    SUPERSUMIDERO = '__supersumidero__'
+
+    def __init__(self, G, atributo=None, defecto=1, superterminales=False):
+        # G puede ser un nx.Graph o un GrafoCSR; las aristas se leen de sus arreglos
+        csr = self.csr = csr_de(G)
+        self.nodos = list(csr.nodos)
+        self.indice = dict(csr.indice)
+        self.n_originales = n = len(self.nodos)
+
+        # 'flujo' como capacidad (o 'capacity', la de cargar_grafo_flujo), 1 por defecto
+        colas = array('i', csr.arista_origen.tolist())
+        cabezas = array('i', csr.arista_destino.tolist())
+        if atributo is None:
+            capacidades = array('d', csr.capacidades(defecto).tolist())
+        else:
+            capacidades = array('d', csr.valores_arista(atributo, defecto).tolist())
+        m_originales = len(colas)
+        # Cota de capacidad "infinita" para los arcos de las superterminales
+        self.capacidad_infinita = sum(capacidades) + 1
+
+        if superterminales:
+            # Superfuente n y supersumidero n + 1 unidos a todos los nodos con capacidad 0;
+            # cada consulta abre solo los arcos de sus fuentes y sumideros (abrir_terminales)
+            self.superfuente, self.supersumidero = n, n + 1
+            for nombre in (self.SUPERFUENTE, self.SUPERSUMIDERO):
+                self.indice[nombre] = len(self.nodos)
+                self.nodos.append(nombre)
+            for i in range(n):
+                colas.append(self.superfuente)
+                cabezas.append(i)
+                capacidades.append(0)
+            for i in range(n):
+                colas.append(i)
+                cabezas.append(self.supersumidero)
+                capacidades.append(0)
+            n += 2
+        m = len(colas)
+
+        # Contar arcos por nodo (directos en su cola, reversos en su cabeza) y ubicar cada uno
+        grado = [0] * (n + 1)
+        for i in colas:
+            grado[i + 1] += 1
+        for j in cabezas:
+            grado[j + 1] += 1
+        for i in range(n):
+            grado[i + 1] += grado[i]
+        self.inicio = array('q', grado)
+        siguiente = grado[:n]
+
+        self.destino = array('i', bytes(4 * 2 * m))
+        self.reverso = array('i', bytes(4 * 2 * m))
+        self.capacidad = array('d', bytes(8 * 2 * m))
+        arco_directo = array('i', bytes(4 * m))
+        for k in range(m):
+            i, j = colas[k], cabezas[k]
+            a = siguiente[i]
+            siguiente[i] += 1
+            b = siguiente[j]
+            siguiente[j] += 1
+            self.destino[a] = j
+            self.destino[b] = i
+            self.reverso[a] = b
+            self.reverso[b] = a
+            self.capacidad[a] = capacidades[k]
+            arco_directo[k] = a
+        self.arco_de_arista = arco_directo[:m_originales]
+        self.cola_arista = colas[:m_originales]
+        if superterminales:
+            self.arco_superfuente = arco_directo[m_originales:m_originales + self.n_originales]
+            self.arco_supersumidero = arco_directo[m_originales + self.n_originales:]
+        self.capacidad_original = array('d', self.capacidad)
+        self.bloqueo = threading.Lock()
+
+    def abrir_terminales(self, fuentes, sumideros):
+        """
+        Conecta la superfuente a `fuentes` y `sumideros` al supersumidero (índices enteros)
+        y devuelve (s, t) para correr cualquier núcleo de flujo sobre varios orígenes y
+        destinos. La red debe estar recién reiniciada.
+        """
+        for i in fuentes:
+            a = self.arco_superfuente[i]
+            self.capacidad[a] = self.capacidad_original[a] = self.capacidad_infinita
+        for i in sumideros:
+            a = self.arco_supersumidero[i]
+            self.capacidad[a] = self.capacidad_original[a] = self.capacidad_infinita
+        return self.superfuente, self.supersumidero
+
+    def cerrar_terminales(self, fuentes, sumideros):
+        """Deshace abrir_terminales: los arcos de las superterminales vuelven a capacidad 0"""
+        for i in fuentes:
+            a = self.arco_superfuente[i]
+            self.capacidad_original[a] = 0
+        for i in sumideros:
+            a = self.arco_supersumidero[i]
+            self.capacidad_original[a] = 0
+        self.reiniciar()
+
+    def __len__(self):
+        return len(self.nodos)
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado['bloqueo']
+        # El CSR solo sirve para validar la caché del proceso que la construyó
+        estado['csr'] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.bloqueo = threading.Lock()
+
+    def arcos(self, i):
+        return range(self.inicio[i], self.inicio[i + 1])
+
+    def reiniciar(self):
+        """Deja la red sin flujo para resolver otra consulta"""
+        self.capacidad[:] = self.capacidad_original
+
+    def flujo_arco(self, a):
+        return self.capacidad_original[a] - self.capacidad[a]
+
+    def edge_flows(self):
+        """Flujo por arista con el mismo formato que calculate_edge_flows"""
+        edge_flows = {}
+        nodos, destino = self.nodos, self.destino
+        for k, a in enumerate(self.arco_de_arista):
+            capacity = self.capacidad_original[a]
+            flow = max(0, capacity - self.capacidad[a])
+            edge_flows[(nodos[self.cola_arista[k]], nodos[destino[a]])] = {
+                'flow': flow,
+                'capacity': capacity,
+                'utilization': (flow / capacity) * 100 if capacity > 0 else 0
+            }
+        return edge_flows
+
+    def corte_minimo(self, s):
+        """
+        Corte mínimo a partir del residual final: (nodos alcanzables desde s con capacidad
+        residual positiva, aristas originales que salen de ese conjunto). Es un BFS, no
+        requiere otra corrida de flujo.
+        """
+        inicio, destino, capacidad = self.inicio, self.destino, self.capacidad
+        alcanzable = [False] * len(self.nodos)
+        alcanzable[s] = True
+        cola = [s]
+        for i in cola:
+            for a in range(inicio[i], inicio[i + 1]):
+                j = destino[a]
+                if capacidad[a] > 0 and not alcanzable[j]:
+                    alcanzable[j] = True
+                    cola.append(j)
+        nodos = self.nodos
+        source_side = {nodos[i] for i in cola if i < self.n_originales}
+        cut_edges = [
+            (nodos[self.cola_arista[k]], nodos[destino[a]])
+            for k, a in enumerate(self.arco_de_arista)
+            if alcanzable[self.cola_arista[k]] and not alcanzable[destino[a]]
+        ]
+        return source_side, cut_edges
+
+
+# Redes por grafo (con y sin superterminales), construidas la primera vez que se piden
+redes_residuales = weakref.WeakKeyDictionary()
+
+def red_residual_de(G, superterminales=False):
+    redes = redes_residuales.setdefault(G, {})
+    red = redes.get(superterminales)
+    # Si el grafo cambió (csr_de entrega otro CSR) la red guardada ya no sirve
+    if red is None or red.csr is not csr_de(G):
+        red = RedResidual(G, superterminales=superterminales)
+        redes[superterminales] = red
+    return red
+
+@contextmanager
+def usar_red(G, red=None):
+    """
+    Red residual lista para una consulta: la de G (o la dada), sin flujo y bloqueada
+    mientras dura el bloque, para que dos hilos no la usen a la vez.
+    """
+    if red is None:
+        red = red_residual_de(G)
+    with red.bloqueo:
+        red.reiniciar()
+        yield red
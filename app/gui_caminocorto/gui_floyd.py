@@ -1,47 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import networkx as nx
-from models.graph_logic import calcular_todos_caminos_floyd
-
-class GrafoFloydApp(tk.Tk):
-    def __init__(self, G, nodos):
-        super().__init__()
-        self.title("Floyd-Warshall: todos los caminos más cortos")
-        ancho, alto = 1400, 750
-        self.geometry(f"{ancho}x{alto}")
-        self.minsize(900, 450)
-        self.center_window(ancho, alto)
-        self.G = G
-        self.nodos = nodos
-        self._crear_layout()
-        self._make_responsive()
-
-    def center_window(self, ancho, alto):
-        ws = self.winfo_screenwidth()
-        hs = self.winfo_screenheight()
-        x = (ws // 2) - (ancho // 2)
-        y = (hs // 2) - (alto // 2)
-        self.geometry(f'{ancho}x{alto}+{x}+{y}')
-
-    def _crear_layout(self):
-        self.container = tk.Frame(self)
-        self.container.pack(fill=tk.BOTH, expand=True)
+from app.pantalla import Pantalla
+from app.mapa import aristas_de_caminos
+from models.graph_logic import calcular_matriz_floyd
+from app.tareas import BarraTarea
 
-        self.container.grid_rowconfigure(0, weight=0)
-        self.container.grid_rowconfigure(1, weight=1)
-        self.container.grid_columnconfigure(0, weight=1)
-        self.container.grid_columnconfigure(1, weight=2)
+class GrafoFloydApp(Pantalla):
+    titulo = "Floyd-Warshall: todos los caminos más cortos"
 
-        self.boton_atras = ttk.Button(self.container, text="← Atrás", command=self.volver_a_main)
-        self.boton_atras.grid(row=0, column=0, sticky="nw", padx=10, pady=8, columnspan=2)
-
-        self.left = tk.Frame(self.container)
-        self.left.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+    def __init__(self, app):
+        super().__init__(app)
+        self._crear_layout()
 
+    def _crear_layout(self):
         ttk.Label(self.left, text="Selecciona Origen:").pack(pady=(20, 5), fill=tk.X)
         self.combo_origen = ttk.Combobox(self.left, values=self.nodos, state="readonly")
         self.combo_origen.pack(fill=tk.X)
@@ -50,31 +21,14 @@ class GrafoFloydApp(tk.Tk):
         self.combo_destino = ttk.Combobox(self.left, values=self.nodos, state="readonly")
         self.combo_destino.pack(fill=tk.X)
 
-        ttk.Button(self.left, text="Mostrar camino más corto (Floyd-Warshall)", command=self.mostrar_camino).pack(pady=20, fill=tk.X)
+        ttk.Button(self.left, text="Mostrar camino más corto (Floyd-Warshall)", command=self.mostrar_camino).pack(pady=(20, 4), fill=tk.X)
+        self.barra_tareas = BarraTarea(self.left)
+        self.barra_tareas.pack(fill=tk.X)
+        self.tareas = self.barra_tareas.tareas
 
         self.resultado = tk.Text(self.left, height=26, width=43, state="disabled")
         self.resultado.pack(pady=10, fill=tk.BOTH, expand=True)
 
-        self.right = tk.Frame(self.container)
-        self.right.grid(row=1, column=1, sticky="nsew", padx=10, pady=10)
-        self.right.grid_rowconfigure(0, weight=1)
-        self.right.grid_rowconfigure(1, weight=0)
-        self.right.grid_columnconfigure(0, weight=1)
-
-        self.fig, self.ax = plt.subplots(figsize=(13, 7))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.right)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.grid(row=0, column=0, sticky="nsew")
-
-        self.toolbar_frame = tk.Frame(self.right)
-        self.toolbar_frame.grid(row=1, column=0, sticky="ew")
-        self.toolbar = NavigationToolbar2Tk(self.canvas, self.toolbar_frame)
-        self.toolbar.update()
-
-    def _make_responsive(self):
-        self.rowconfigure(0, weight=1)
-        self.columnconfigure(0, weight=1)
-
     def mostrar_camino(self):
         origen = self.combo_origen.get()
         destino = self.combo_destino.get()
@@ -87,14 +41,23 @@ class GrafoFloydApp(tk.Tk):
             messagebox.showwarning("Advertencia", "El nodo de origen y destino deben ser diferentes.")
             return
 
-        distancias, caminos, tiempos, nombre = calcular_todos_caminos_floyd(self.G)
+        # La matriz se calcula una vez por grafo (fuera del hilo de Tk); cada clic solo reconstruye este par
+        self.tareas.lanzar(
+            'matriz', calcular_matriz_floyd, self.G,
+            al_terminar=lambda matriz: self._mostrar_camino(matriz, origen, destino),
+            al_fallar=lambda e: messagebox.showerror("Error", f"Error en Floyd-Warshall:\n\n{e}"),
+            descripcion="Floyd-Warshall"
+        )
+
+    def _mostrar_camino(self, matriz, origen, destino):
+        nombre = matriz.nombre
 
         self.resultado.configure(state="normal")
         self.resultado.delete(1.0, tk.END)
 
-        path = caminos.get(origen, {}).get(destino)
-        dist = distancias.get(origen, {}).get(destino)
-        tpo = tiempos.get(origen, {}).get(destino)
+        path = matriz.camino(origen, destino)
+        dist = matriz.distancia(origen, destino)
+        tpo = matriz.tiempo(origen, destino)
 
         if path:
             self.resultado.insert(tk.END, f"Camino encontrado usando {nombre}:\n")
@@ -108,55 +71,16 @@ class GrafoFloydApp(tk.Tk):
         self.visualizar_camino(path, origen, destino)
 
     def visualizar_camino(self, path, origen, destino):
-        self.ax.clear()
-        edges_en_camino = set()
-
-        if path:
-            for i in range(len(path)-1):
-                u, v = path[i], path[i+1]
-                edges_en_camino.add(tuple(sorted((u, v))))
-        # ==== USAR COORDENADAS REALES DE LOS NODOS SI EXISTEN ====
-        try:
-            pos = {
-                n: (self.G.nodes[n]['pos'][1], self.G.nodes[n]['pos'][0])
-                for n in self.G.nodes if self.G.nodes[n]['pos'] != (0,0)
-            }
-            for n in self.G.nodes:
-                if self.G.nodes[n]['pos'] == (0,0):
-                    pos[n] = (0,0)
-        except Exception as e:
-            print("Error en posiciones de nodos:", e)
-            pos = nx.spring_layout(self.G)
-        # =========================================================
-        nx.draw_networkx_nodes(self.G, pos, ax=self.ax, node_color=[
-            "orange" if n == origen else ("green" if n == destino else "skyblue") for n in self.G.nodes()
-        ], node_size=650)
-        nx.draw_networkx_labels(self.G, pos, ax=self.ax, font_size=10, font_family="DejaVu Sans")
-        edge_colors = [
-            "red" if tuple(sorted((u, v))) in edges_en_camino else "grey"
-            for u, v in self.G.edges()
-        ]
-        nx.draw_networkx_edges(self.G, pos, ax=self.ax, width=2, edge_color=edge_colors)
-        edge_labels = nx.get_edge_attributes(self.G, 'distancia')
-        nx.draw_networkx_edge_labels(
-            self.G, pos, ax=self.ax,
-            edge_labels={k: f"{v:.1f} km" for k, v in edge_labels.items()},
-            font_size=6,
-            font_family="DejaVu Sans"
+        # Solo cambia lo resaltado: el mapa base ya está dibujado
+        self.mapa.dibujar_base(self.G)
+        self.mapa.resaltar(
+            f"Camino más corto de {origen} a {destino} (Floyd-Warshall)",
+            colores_nodos={origen: "orange", destino: "green"},
+            colores_aristas=dict.fromkeys(aristas_de_caminos([path]), "red")
         )
-        self.ax.set_title(f"Camino más corto de {origen} a {destino} (Floyd-Warshall)", fontsize=18, fontfamily="DejaVu Sans")
-        self.ax.axis('off')
-        self.fig.tight_layout()
-        self.canvas.draw()
-
-    def volver_a_main(self):
-        self.destroy()
-        from app.gui_main import MainApp
-        MainApp().mainloop()
 
 if __name__ == "__main__":
-    import networkx as nx
-    G = nx.Graph()
-    nodos = []
-    app = GrafoFloydApp(G, nodos)
+    from app.gui_main import MainApp
+    app = MainApp()
+    app.mostrar_pantalla(GrafoFloydApp)
     app.mainloop()
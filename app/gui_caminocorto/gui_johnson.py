@@ -0,0 +1,96 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import networkx as nx
+from app.pantalla import Pantalla
+from app.mapa import aristas_de_caminos
+from models.graph_logic import calcular_matriz_johnson
+from app.tareas import BarraTarea
+
+class GrafoJohnsonApp(Pantalla):
+    titulo = "Johnson: todos los caminos más cortos"
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._crear_layout()
+
+    def _crear_layout(self):
+        ttk.Label(self.left, text="Selecciona Origen:").pack(pady=(20, 5), fill=tk.X)
+        self.combo_origen = ttk.Combobox(self.left, values=self.nodos, state="readonly")
+        self.combo_origen.pack(fill=tk.X)
+
+        ttk.Label(self.left, text="Selecciona Destino:").pack(pady=(20, 5), fill=tk.X)
+        self.combo_destino = ttk.Combobox(self.left, values=self.nodos, state="readonly")
+        self.combo_destino.pack(fill=tk.X)
+
+        ttk.Button(self.left, text="Mostrar camino más corto (Johnson)", command=self.mostrar_camino).pack(pady=(20, 4), fill=tk.X)
+        self.barra_tareas = BarraTarea(self.left)
+        self.barra_tareas.pack(fill=tk.X)
+        self.tareas = self.barra_tareas.tareas
+
+        self.resultado = tk.Text(self.left, height=26, width=43, state="disabled")
+        self.resultado.pack(pady=10, fill=tk.BOTH, expand=True)
+
+    def mostrar_camino(self):
+        origen = self.combo_origen.get()
+        destino = self.combo_destino.get()
+
+        if not origen or not destino:
+            messagebox.showwarning("Advertencia", "Debes seleccionar tanto el nodo de origen como el de destino.")
+            return
+
+        if origen == destino:
+            messagebox.showwarning("Advertencia", "El nodo de origen y destino deben ser diferentes.")
+            return
+
+        # La matriz se calcula una vez por grafo (fuera del hilo de Tk); cada clic solo reconstruye este par
+        self.tareas.lanzar(
+            'matriz', calcular_matriz_johnson, self.G,
+            al_terminar=lambda matriz: self._mostrar_camino(matriz, origen, destino),
+            al_fallar=self._error_matriz,
+            descripcion="Johnson"
+        )
+
+    def _error_matriz(self, e):
+        if isinstance(e, nx.NetworkXUnbounded):
+            messagebox.showerror(
+                "Ciclo negativo detectado",
+                "El grafo contiene un ciclo con peso negativo. El algoritmo de Johnson no puede continuar."
+            )
+        else:
+            messagebox.showerror("Error", f"Error en Johnson:\n\n{e}")
+
+    def _mostrar_camino(self, matriz, origen, destino):
+        nombre = matriz.nombre
+
+        self.resultado.configure(state="normal")
+        self.resultado.delete(1.0, tk.END)
+
+        path = matriz.camino(origen, destino)
+        dist = matriz.distancia(origen, destino)
+        tpo = matriz.tiempo(origen, destino)
+
+        if path:
+            self.resultado.insert(tk.END, f"Camino encontrado usando {nombre}:\n")
+            self.resultado.insert(tk.END, " → ".join(path) + "\n\n")
+            self.resultado.insert(tk.END, f"Distancia total: {dist:.1f} km\n")
+            self.resultado.insert(tk.END, f"Tiempo estimado: {tpo:.1f} min\n")
+        else:
+            self.resultado.insert(tk.END, f"No hay camino entre {origen} y {destino} usando {nombre}.\n")
+
+        self.resultado.configure(state="disabled")
+        self.visualizar_camino(path, origen, destino)
+
+    def visualizar_camino(self, path, origen, destino):
+        # Solo cambia lo resaltado: el mapa base ya está dibujado
+        self.mapa.dibujar_base(self.G)
+        self.mapa.resaltar(
+            f"Camino más corto de {origen} a {destino} (Johnson)",
+            colores_nodos={origen: "orange", destino: "green"},
+            colores_aristas=dict.fromkeys(aristas_de_caminos([path]), "red")
+        )
+
+if __name__ == "__main__":
+    from app.gui_main import MainApp
+    app = MainApp()
+    app.mostrar_pantalla(GrafoJohnsonApp)
+    app.mainloop()
@@ -1,24 +1,38 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from models.graph_logic import cargar_grafo
+from models.graph_logic import cargar_grafo_con_snapshot, olvidar_caches
+from app.tareas import BarraTarea
+from app.mapa import MapaRutas
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import networkx as nx
+
+TITULO_INICIO = "Visualización y Algoritmos de Rutas"
 
 class MainApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, csv_path=None):
         super().__init__()
-        self.title("Visualización y Algoritmos de Rutas")
+        self.title(TITULO_INICIO)
         ancho, alto = 1400, 750
         self.geometry(f"{ancho}x{alto}")
         self.minsize(900, 450)
         self.center_window(ancho, alto)
         self.G = None
         self.nodos = []
+        # Pantallas de algoritmos ya creadas para el grafo actual: se ocultan al volver, no se destruyen
+        self.pantallas = {}
+        self.actual = None
         self._crear_layout()
         self._make_responsive()
+        # Se puede abrir directamente con un CSV (se lee desde su snapshot si existe)
+        if csv_path:
+            self.tareas.lanzar(
+                'carga', cargar_grafo_con_snapshot, csv_path, True,
+                al_terminar=self._usar_grafo,
+                al_fallar=lambda e: print("No se pudo cargar el archivo:", e),
+                descripcion="Cargando archivo"
+            )
 
     def center_window(self, ancho, alto):
         ws = self.winfo_screenwidth()
@@ -32,13 +46,19 @@ class MainApp(tk.Tk):
         self.container.pack(fill=tk.BOTH, expand=True)
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=0)
-        self.container.grid_columnconfigure(1, weight=1)
+        self.container.grid_columnconfigure(1, weight=2)
 
-        # Lado izquierdo
-        self.left = tk.Frame(self.container)
-        self.left.grid(row=0, column=0, sticky="nsew", padx=30, pady=30)
+        # Lado izquierdo: el menú o la pantalla del algoritmo elegido, una a la vez
+        self.panel = tk.Frame(self.container)
+        self.panel.grid(row=0, column=0, sticky="nsew")
+        self.left = tk.Frame(self.panel)
+        self.left.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
+        self.actual = self.left
 
-        ttk.Button(self.left, text="Cargar archivo CSV", command=self.cargar_archivo).pack(anchor="w", pady=(0, 18))
+        ttk.Button(self.left, text="Cargar archivo CSV", command=self.cargar_archivo).pack(anchor="w", pady=(0, 4))
+        self.barra_tareas = BarraTarea(self.left)
+        self.barra_tareas.pack(anchor="w", fill=tk.X, pady=(0, 14))
+        self.tareas = self.barra_tareas.tareas
 
         ttk.Label(self.left, text="¿Qué deseas hacer?", font=("Arial", 15, "bold")).pack(anchor="w", pady=(0, 18))
 
@@ -81,7 +101,7 @@ class MainApp(tk.Tk):
         self.algoritmos_flujo.grid(row=0, column=1, padx=(0,12))
         ttk.Button(frame_flujo, text="Continuar", command=self.ir_flujo).grid(row=0, column=2)
 
-        # Lado derecho
+        # Lado derecho: una sola figura compartida por todas las pantallas
         self.right = tk.Frame(self.container)
         self.right.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
         self.right.grid_rowconfigure(0, weight=1)
@@ -96,6 +116,7 @@ class MainApp(tk.Tk):
         self.toolbar_frame.grid(row=1, column=0, sticky="ew")
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.toolbar_frame)
         self.toolbar.update()
+        self.mapa = MapaRutas(self.fig, self.ax, self.canvas)
 
     def _make_responsive(self):
         self.rowconfigure(0, weight=1)
@@ -103,34 +124,58 @@ class MainApp(tk.Tk):
 
     def visualizar_grafo_completo(self):
         if self.G is None:
-            self.ax.clear()
-            self.ax.set_title("Carga un archivo CSV para visualizar el grafo", fontsize=16)
-            self.ax.axis('off')
-            self.canvas.draw()
+            self.mapa.vaciar("Carga un archivo CSV para visualizar el grafo")
             return
-        self.ax.clear()
-        try:
-            pos = {n: (self.G.nodes[n]['pos'][1], self.G.nodes[n]['pos'][0]) for n in self.G.nodes if self.G.nodes[n]['pos'] != (0,0)}
-            for n in self.G.nodes:
-                if self.G.nodes[n]['pos'] == (0,0):
-                    pos[n] = (0,0)
-        except Exception as e:
-            print("Error en posiciones de nodos:", e)
-            pos = nx.spring_layout(self.G)
-        nx.draw_networkx_nodes(self.G, pos, ax=self.ax, node_color='skyblue', node_size=650)
-        nx.draw_networkx_labels(self.G, pos, ax=self.ax, font_size=10, font_family="DejaVu Sans")
-        nx.draw_networkx_edges(self.G, pos, ax=self.ax, width=2, edge_color='grey')
-        edge_labels = nx.get_edge_attributes(self.G, 'distancia')
-        nx.draw_networkx_edge_labels(
-            self.G, pos, ax=self.ax,
-            edge_labels={k: f"{v:.1f} km" for k, v in edge_labels.items()},
-            font_size=6,
-            font_family="DejaVu Sans"
-        )
-        self.ax.set_title("Mapa de rutas entre municipios de Bolívar", fontsize=18, fontfamily="DejaVu Sans")
-        self.ax.axis('off')
-        self.fig.tight_layout()
-        self.canvas.draw()
+        # El mapa se dibuja una vez por grafo; al volver de una pantalla solo se quita el resaltado
+        self.mapa.dibujar_base(self.G)
+        self.mapa.resaltar("Mapa de rutas entre municipios de Bolívar")
+
+    def _usar_grafo(self, G):
+        if self.G is not None:
+            olvidar_caches(self.G)
+        # La carga pudo terminar con una pantalla a la vista: se vuelve al menú antes de
+        # destruirla, si no el panel izquierdo quedaría vacío y sin botón para volver
+        self._cambiar_a(self.left, TITULO_INICIO, 0)
+        self._olvidar_pantallas()
+        self.G = G
+        self.nodos = sorted(list(self.G.nodes()))
+        self.visualizar_grafo_completo()
+
+    # ----------- Navegación entre pantallas -----------
+    def _cambiar_a(self, frame, titulo, peso):
+        if frame is self.actual:
+            return
+        if self.actual is not None:
+            if hasattr(self.actual, 'al_ocultar'):
+                self.actual.al_ocultar()
+            self.actual.pack_forget()
+        if frame is self.left:
+            frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
+        else:
+            frame.pack(fill=tk.BOTH, expand=True)
+        self.container.grid_columnconfigure(0, weight=peso)
+        self.title(titulo)
+        self.actual = frame
+
+    def mostrar_pantalla(self, clase, *args):
+        """Muestra la pantalla `clase(self, *args)`, creándola solo la primera vez para este grafo"""
+        clave = (clase, args)
+        pantalla = self.pantallas.get(clave)
+        if pantalla is None:
+            pantalla = self.pantallas[clave] = clase(self, *args)
+        self._cambiar_a(pantalla, pantalla.titulo, pantalla.peso)
+        pantalla.al_mostrar()
+        return pantalla
+
+    def mostrar_inicio(self):
+        self._cambiar_a(self.left, TITULO_INICIO, 0)
+        self.visualizar_grafo_completo()
+
+    def _olvidar_pantallas(self):
+        # Las pantallas guardan el grafo y sus nodos: con otro archivo se vuelven a crear
+        for pantalla in self.pantallas.values():
+            pantalla.destroy()
+        self.pantallas.clear()
 
     def cargar_archivo(self):
         file_path = filedialog.askopenfilename(
@@ -138,48 +183,61 @@ class MainApp(tk.Tk):
             filetypes=[("CSV files", "*.csv"), ("Todos los archivos", "*.*")]
         )
         if file_path:
-            try:
-                self.G = cargar_grafo(file_path)
-                self.nodos = sorted(list(self.G.nodes()))
-                self.visualizar_grafo_completo()
-                messagebox.showinfo("Éxito", "Archivo cargado correctamente.")
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudo cargar el archivo.\n\n{e}")
+            # Se lee fuera del hilo de Tk; si se elige otro archivo antes, esta carga se descarta.
+            # Los tramos repetidos entre un mismo par se conservan (el más corto y el flujo sumado)
+            self.tareas.lanzar(
+                'carga', cargar_grafo_con_snapshot, file_path, True,
+                al_terminar=self._archivo_cargado,
+                al_fallar=lambda e: messagebox.showerror("Error", f"No se pudo cargar el archivo.\n\n{e}"),
+                descripcion="Cargando archivo"
+            )
+
+    def _archivo_cargado(self, G):
+        self._usar_grafo(G)
+        messagebox.showinfo("Éxito", "Archivo cargado correctamente.")
+
+    def _grafo_listo(self):
+        # Mientras se carga otro archivo no se entra a las pantallas: al terminar la carga
+        # se destruyen las del grafo anterior
+        if self.tareas.ocupada('carga'):
+            messagebox.showwarning("Archivo cargándose", "Espera a que termine la carga del archivo.")
+            return False
+        if self.G is None:
+            messagebox.showwarning("Archivo no cargado", "Por favor, carga un archivo CSV primero.")
+            return False
+        return True
 
     def ir_corto(self):
         alg = self.algoritmos_corto.get()
-        if self.G is None:
-            messagebox.showwarning("Archivo no cargado", "Por favor, carga un archivo CSV primero.")
+        if not self._grafo_listo():
             return
 
         if alg == "Dijkstra":
-            self.destroy()
-            import app.gui_caminocorto.gui_dijkstra as djk
-            djk.GrafoDijkstraApp(self.G, self.nodos).mainloop()
+            from app.gui_caminocorto.gui_dijkstra import GrafoDijkstraApp
+            self.mostrar_pantalla(GrafoDijkstraApp)
         elif alg == "Bellman-Ford":
-            self.destroy()
-            import app.gui_caminocorto.gui_bellman as blm
-            blm.GrafoBellmanApp(self.G, self.nodos).mainloop()
+            from app.gui_caminocorto.gui_bellman import GrafoBellmanApp
+            self.mostrar_pantalla(GrafoBellmanApp)
         elif alg == "A* (A-Star)":
-            self.destroy()
-            import app.gui_caminocorto.gui_astar as ast
-            ast.GrafoAStarApp(self.G, self.nodos).mainloop()
+            from app.gui_caminocorto.gui_astar import GrafoAStarApp
+            self.mostrar_pantalla(GrafoAStarApp)
         elif alg == "Floyd-Warshall":
-            self.destroy()
-            import app.gui_caminocorto.gui_floyd as flw
-            flw.GrafoFloydApp(self.G, self.nodos).mainloop()
+            from app.gui_caminocorto.gui_floyd import GrafoFloydApp
+            self.mostrar_pantalla(GrafoFloydApp)
+        elif alg == "Johnson":
+            from app.gui_caminocorto.gui_johnson import GrafoJohnsonApp
+            self.mostrar_pantalla(GrafoJohnsonApp)
         else:
             messagebox.showinfo("En desarrollo", f"La funcionalidad '{alg}' estará disponible próximamente.")
 
     def ir_flujo(self):
         alg = self.algoritmos_flujo.get()
-        if alg != "Ford-Fulkerson":
+        if alg not in ("Ford-Fulkerson", "Edmonds-Karp", "Dinic", "Push-Relabel"):
             messagebox.showinfo("En desarrollo", f"La funcionalidad '{alg}' estará disponible próximamente.")
             return
-        if self.G is None:
-            messagebox.showwarning("Archivo no cargado", "Por favor, carga un archivo CSV primero.")
+        if not self._grafo_listo():
             return
-        
+
         # Verificar que el grafo tenga información de flujo
         has_flow = any('flujo' in data for _, _, data in self.G.edges(data=True))
         if not has_flow:
@@ -187,9 +245,8 @@ class MainApp(tk.Tk):
                                  "El archivo CSV debe contener una columna 'flujo (und)' para usar algoritmos de flujo máximo.")
             return
         
-        self.destroy()
-        import app.gui_flujomaximo.gui_FordF as ff
-        ff.GrafoFordFulkersonApp(self.G, self.nodos).mainloop()
+        from app.gui_flujomaximo.gui_FordF import GrafoFordFulkersonApp
+        self.mostrar_pantalla(GrafoFordFulkersonApp, alg)
 
 if __name__ == "__main__":
     app = MainApp()
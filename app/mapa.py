@@ -0,0 +1,359 @@
+import math
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Rectangle
+
+from models.graph_view import posiciones_grafo
+
+COLOR_NODO = "skyblue"
+COLOR_ARISTA = "grey"
+ANCHO_ARISTA = 2
+TAMANO_NODO = 650
+FUENTE = "DejaVu Sans"
+
+# Nivel de detalle, en píxeles de pantalla
+LARGO_ETIQUETA = 60          # una arista más corta en pantalla no muestra su distancia
+CELDA_NOMBRE = (70, 14)      # a lo sumo un nombre de nodo por celda (gana el de más grado)
+CELDA_DISTANCIA = (50, 12)   # a lo sumo una distancia por celda (gana la arista más larga)
+MAX_ETIQUETAS = 200          # tope de nombres y de distancias por dibujo
+NODOS_TAMANO_COMPLETO = 150  # con más nodos en vista los puntos se achican
+UMBRAL_AGREGADO = 400        # con más nodos en vista se agrupan por celdas
+CELDA_AGREGADA = 24
+
+
+def aristas_de_caminos(caminos):
+    """Aristas (u, v) consecutivas de una colección de caminos"""
+    return {(path[i], path[i + 1]) for path in caminos if path for i in range(len(path) - 1)}
+
+
+class MapaRutas:
+    """
+    Dibujo del grafo en modo retenido sobre la figura compartida de la ventana.
+
+    dibujar_base() crea una vez por grafo el mapa: aristas en un solo LineCollection,
+    nodos en un PathCollection y los nombres y distancias como textos. Ese mapa queda
+    en el fondo que guarda el canvas en cada dibujo completo (primera vez, zoom,
+    desplazamiento o cambio de tamaño).
+
+    resaltar() no toca el mapa base: llena una capa animada con solo lo resaltado
+    (aristas, nodos y sus etiquetas, más un velo opcional que atenúa el resto) y la
+    pinta con blitting sobre el fondo guardado. El costo de cada consulta depende de
+    lo resaltado, no del tamaño del grafo.
+
+    Nivel de detalle: cada vez que cambia la vista (zoom o desplazamiento con la barra
+    de herramientas, o el tamaño de la ventana) se recalcula qué se dibuja. Solo entra
+    lo que cae en la vista, las distancias solo en aristas largas en pantalla, un
+    nombre por zona y, con muchos nodos en vista, un punto por celda de pantalla con
+    las aristas entre celdas en lugar del detalle.
+    """
+
+    def __init__(self, fig, ax, canvas):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        self.G = None
+        self.fondo = None
+        self.animados = []
+        self.textos_realce = []
+        self.nodos = []
+        self.xy = np.empty((0, 2))
+        self._sin_detalle()
+        canvas.mpl_connect('draw_event', self._al_dibujar)
+        canvas.mpl_connect('resize_event', self._al_cambiar_vista)
+
+    # ----------- Mapa base -----------
+    def dibujar_base(self, G):
+        """Crea los artistas del mapa de G; si ya existen para G no hace nada"""
+        if G is self.G and self._vigente():
+            return
+        self.ax.clear()
+        self.G = G
+        self.nodos = list(G.nodes())
+        self.aristas = list(G.edges())
+        self.indice_nodo = {n: i for i, n in enumerate(self.nodos)}
+        self.indice_arista = {}
+        for k, (u, v) in enumerate(self.aristas):
+            self.indice_arista[(u, v)] = k
+            if not G.is_directed():
+                self.indice_arista.setdefault((v, u), k)
+
+        # Calculadas una vez por grafo y compartidas con las demás vistas
+        self.xy = posiciones_grafo(G)
+        self.origen = np.fromiter((self.indice_nodo[u] for u, _ in self.aristas), dtype=np.int64, count=len(self.aristas))
+        self.destino = np.fromiter((self.indice_nodo[v] for _, v in self.aristas), dtype=np.int64, count=len(self.aristas))
+        self.segmentos = np.stack([self.xy[self.origen], self.xy[self.destino]], axis=1).reshape(-1, 2, 2)
+        self.medios = self.segmentos.mean(axis=1)
+        self.grado = np.bincount(np.concatenate([self.origen, self.destino]), minlength=len(self.nodos))
+        self.distancias = [
+            f"{d['distancia']:.1f} km" if 'distancia' in d else ""
+            for _, _, d in G.edges(data=True)
+        ]
+
+        self.lineas = LineCollection(self.segmentos, colors=COLOR_ARISTA, linewidths=ANCHO_ARISTA, zorder=1)
+        self.ax.add_collection(self.lineas)
+        self.puntos = self.ax.scatter(self.xy[:, 0], self.xy[:, 1], s=TAMANO_NODO, c=COLOR_NODO, zorder=2)
+        # Los textos se crean al entrar en la vista por primera vez y después solo se muestran u ocultan
+        self.textos_nodo = {}
+        self.textos_arista = {}
+        if len(self.xy):
+            self.ax.update_datalim(self.xy)
+            self.ax.autoscale_view()
+        self.ax.axis('off')
+
+        # Capa animada: no entra en el fondo, se pinta encima en cada consulta
+        self.velo = Rectangle((0, 0), 1, 1, transform=self.ax.transAxes, facecolor="white", alpha=0.65,
+                              zorder=3, animated=True, visible=False)
+        self.ax.add_patch(self.velo)
+        self.lineas_realce = LineCollection([], zorder=4, animated=True)
+        self.ax.add_collection(self.lineas_realce, autolim=False)
+        self.puntos_realce = self.ax.scatter(np.empty(0), np.empty(0), s=TAMANO_NODO, zorder=5, animated=True)
+        # Un título de una línea reserva su espacio en tight_layout; el texto real llega en resaltar()
+        self.ax.set_title(" ", fontsize=18, fontfamily=FUENTE)
+        self.ax.title.set_animated(True)
+        self.textos_realce = []
+        self.realce = None
+        self.fondo = None
+        self.fig.tight_layout()
+
+        self.vista = None
+        self._sin_detalle()
+        self._actualizar_detalle()
+        # ax.clear() borra las conexiones de los ejes: se conectan con cada mapa nuevo
+        self.ax.callbacks.connect('xlim_changed', self._al_cambiar_vista)
+        self.ax.callbacks.connect('ylim_changed', self._al_cambiar_vista)
+
+    def _texto_nodo(self, i, **opciones):
+        x, y = self.xy[i]
+        return self.ax.text(x, y, str(self.nodos[i]), fontsize=10, fontfamily=FUENTE,
+                            ha="center", va="center", zorder=opciones.pop('zorder', 3),
+                            clip_on=True, **opciones)
+
+    def _texto_arista(self, k, texto, **opciones):
+        # Texto en el punto medio, girado como la arista y siempre legible de izquierda a derecha
+        (x1, y1), (x2, y2) = self.segmentos[k]
+        angulo = math.degrees(math.atan2(y2 - y1, x2 - x1))
+        if angulo > 90:
+            angulo -= 180
+        elif angulo < -90:
+            angulo += 180
+        return self.ax.text((x1 + x2) / 2, (y1 + y2) / 2, texto, fontsize=6, fontfamily=FUENTE,
+                            ha="center", va="center", rotation=angulo, rotation_mode="anchor",
+                            transform_rotates_text=True, zorder=opciones.pop('zorder', 3), clip_on=True,
+                            bbox=dict(boxstyle="round", ec="white", fc="white"), **opciones)
+
+    def _vigente(self):
+        # Otro código pudo limpiar los ejes (ax.clear()): entonces los artistas ya no están
+        return self.G is not None and self.lineas.axes is self.ax
+
+    def vaciar(self, titulo):
+        """Figura sin grafo, solo con un mensaje"""
+        self.ax.clear()
+        self.G = None
+        self.animados = []
+        self.textos_realce = []
+        self.fondo = None
+        self.ax.set_title(titulo, fontsize=16)
+        self.ax.axis('off')
+        self.canvas.draw()
+
+    # ----------- Nivel de detalle -----------
+    def _sin_detalle(self):
+        # Estado de una vista sin nada visible; _actualizar_detalle lo reemplaza si hay nodos
+        n, m = len(self.nodos), len(getattr(self, 'distancias', ()))
+        self.origen_vista = (0.0, 0.0, 1.0, 1.0)
+        self.nodos_en_vista = np.zeros(n, dtype=bool)
+        self.aristas_en_vista = np.zeros(m, dtype=bool)
+        self.medio_en_vista = np.zeros(m, dtype=bool)
+        self.largo_px = np.zeros(m)
+        self.agregado = False
+        self.tamano = TAMANO_NODO
+        self.nombres = set()
+
+    def _al_cambiar_vista(self, *_):
+        if self._vigente() and self._actualizar_detalle() and self.realce is not None:
+            self._capa_realce()
+
+    def _actualizar_detalle(self):
+        """Decide qué partes del mapa base se dibujan con la vista actual; False si no cambió"""
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        ancho, alto = max(self.ax.bbox.width, 1.0), max(self.ax.bbox.height, 1.0)
+        vista = (x0, x1, y0, y1, ancho, alto)
+        if vista == self.vista or not len(self.nodos):
+            return False
+        self.vista = vista
+        sx, sy = ancho / ((x1 - x0) or 1.0), alto / ((y1 - y0) or 1.0)
+        self.origen_vista = origen = (x0, y0, sx, sy)
+
+        # Un poco de margen: un nodo justo fuera de la vista todavía asoma por el borde
+        mx, my = 0.05 * (x1 - x0), 0.05 * (y1 - y0)
+        x, y = self.xy[:, 0], self.xy[:, 1]
+        self.nodos_en_vista = (x >= x0 - mx) & (x <= x1 + mx) & (y >= y0 - my) & (y <= y1 + my)
+        s = self.segmentos
+        self.aristas_en_vista = ((np.minimum(s[:, 0, 0], s[:, 1, 0]) <= x1) & (np.maximum(s[:, 0, 0], s[:, 1, 0]) >= x0) &
+                                 (np.minimum(s[:, 0, 1], s[:, 1, 1]) <= y1) & (np.maximum(s[:, 0, 1], s[:, 1, 1]) >= y0))
+        medio = self.medios
+        self.medio_en_vista = ((medio[:, 0] >= x0) & (medio[:, 0] <= x1) & (medio[:, 1] >= y0) & (medio[:, 1] <= y1))
+        self.largo_px = np.hypot((s[:, 1, 0] - s[:, 0, 0]) * sx, (s[:, 1, 1] - s[:, 0, 1]) * sy)
+
+        visibles = np.flatnonzero(self.nodos_en_vista)
+        self.agregado = len(visibles) > UMBRAL_AGREGADO
+        if self.agregado:
+            self._agregar(visibles, x0, y0, sx, sy)
+            nombres, etiquetas = [], []
+        else:
+            self.tamano = TAMANO_NODO if len(visibles) <= NODOS_TAMANO_COMPLETO else \
+                max(40.0, TAMANO_NODO * NODOS_TAMANO_COMPLETO / len(visibles))
+            self.puntos.set_offsets(self.xy[visibles])
+            self.puntos.set_sizes([self.tamano])
+            self.lineas.set_segments(s[self.aristas_en_vista])
+            self.lineas.set_linewidth(ANCHO_ARISTA)
+            nombres = self._sin_choque(visibles, self.xy, self.grado, CELDA_NOMBRE, origen)
+            con_texto = np.fromiter((bool(t) for t in self.distancias), dtype=bool, count=len(self.distancias))
+            candidatas = np.flatnonzero(self.medio_en_vista & con_texto & (self.largo_px >= LARGO_ETIQUETA))
+            etiquetas = self._sin_choque(candidatas, self.medios, self.largo_px, CELDA_DISTANCIA, origen)
+
+        self.nombres = set(nombres)
+        self._mostrar(self.textos_nodo, nombres, self._texto_nodo)
+        self._mostrar(self.textos_arista, etiquetas, lambda k: self._texto_arista(k, self.distancias[k]))
+        return True
+
+    def _agregar(self, visibles, x0, y0, sx, sy):
+        # Zona densa: un punto por celda de pantalla, más grande cuantos más nodos reúne,
+        # y una sola línea entre cada par de celdas conectadas
+        cx = np.floor((self.xy[:, 0] - x0) * sx / CELDA_AGREGADA).astype(np.int64)
+        cy = np.floor((self.xy[:, 1] - y0) * sy / CELDA_AGREGADA).astype(np.int64)
+        celda = cx * (1 << 32) + cy
+        centro = np.column_stack([x0 + (cx + 0.5) * CELDA_AGREGADA / sx, y0 + (cy + 0.5) * CELDA_AGREGADA / sy])
+
+        _, primero, cuantos = np.unique(celda[visibles], return_index=True, return_counts=True)
+        self.puntos.set_offsets(centro[visibles[primero]])
+        self.puntos.set_sizes(np.clip(20 + 6 * cuantos, 20, 400))
+        self.tamano = 30.0
+
+        ks = np.flatnonzero(self.aristas_en_vista)
+        a, b = celda[self.origen[ks]], celda[self.destino[ks]]
+        distintas = a != b
+        ks, a, b = ks[distintas], a[distintas], b[distintas]
+        pares = np.column_stack([np.minimum(a, b), np.maximum(a, b)])
+        _, unicas = np.unique(pares, axis=0, return_index=True)
+        ks = ks[unicas]
+        self.lineas.set_segments(np.stack([centro[self.origen[ks]], centro[self.destino[ks]]], axis=1))
+        self.lineas.set_linewidth(1)
+
+    def _sin_choque(self, candidatos, puntos, prioridad, celda, origen):
+        # Los de mayor prioridad eligen primero; a lo sumo un texto por celda de pantalla
+        x0, y0, sx, sy = origen
+        orden = candidatos[np.argsort(-prioridad[candidatos], kind='stable')]
+        cx = np.floor((puntos[orden, 0] - x0) * sx / celda[0]).astype(np.int64)
+        cy = np.floor((puntos[orden, 1] - y0) * sy / celda[1]).astype(np.int64)
+        ocupadas, elegidos = set(), []
+        for i, a, b in zip(orden.tolist(), cx.tolist(), cy.tolist()):
+            if (a, b) in ocupadas:
+                continue
+            ocupadas.add((a, b))
+            elegidos.append(i)
+            if len(elegidos) >= MAX_ETIQUETAS:
+                break
+        return elegidos
+
+    def _mostrar(self, textos, indices, crear):
+        indices = set(indices)
+        for i, texto in textos.items():
+            texto.set_visible(i in indices)
+        for i in indices - textos.keys():
+            textos[i] = crear(i)
+
+    # ----------- Resaltado -----------
+    def resaltar(self, titulo="", colores_nodos=None, colores_aristas=None, anchos=None, estilos=None,
+                 etiquetas_aristas=None, atenuar=False):
+        """
+        Resalta nodos y aristas sobre el mapa base. Los diccionarios van de nodo o de
+        arista (u, v) a color, ancho o estilo; una arista que aparece en alguno se pinta
+        encima con su color (gris), ancho (2) y estilo (continuo). Con
+        etiquetas_aristas=None las aristas resaltadas muestran su distancia; con un
+        diccionario, esos textos. atenuar=True cubre con un velo blanco lo no resaltado.
+        """
+        if not self._vigente():
+            return
+        colores_nodos = colores_nodos or {}
+
+        # Por índice de arista: (u, v) y (v, u) son la misma en un grafo no dirigido
+        color_k = self._por_arista(colores_aristas or {})
+        ancho_k = self._por_arista(anchos or {})
+        estilo_k = self._por_arista(estilos or {})
+        ks = list(dict.fromkeys([*color_k, *ancho_k, *estilo_k]))
+        self.lineas_realce.set_segments(self.segmentos[ks])
+        self.lineas_realce.set_color([to_rgba(color_k.get(k, COLOR_ARISTA)) for k in ks])
+        self.lineas_realce.set_linewidth([ancho_k.get(k, ANCHO_ARISTA) for k in ks])
+        self.lineas_realce.set_linestyle([estilo_k.get(k, 'solid') for k in ks])
+
+        # Los extremos de las aristas resaltadas se repiten encima para que la línea no los tape
+        marcados = [self.indice_nodo[n] for n in colores_nodos if n in self.indice_nodo]
+        extremos = (int(i) for k in ks for i in (self.origen[k], self.destino[k]))
+        nodos = list(dict.fromkeys([*marcados, *extremos]))
+        self.puntos_realce.set_offsets(self.xy[nodos].reshape(-1, 2))
+        self.puntos_realce.set_facecolor([to_rgba(colores_nodos.get(self.nodos[i], COLOR_NODO)) for i in nodos])
+
+        if etiquetas_aristas is None:
+            etiquetas = {k: self.distancias[k] for k in ks}
+        else:
+            etiquetas = self._por_arista(etiquetas_aristas)
+        self.realce = (nodos, set(marcados), etiquetas)
+
+        self.velo.set_visible(atenuar)
+        self.ax.set_title(titulo, fontsize=18, fontfamily=FUENTE)
+        self._capa_realce()
+        self._refrescar()
+
+    def _capa_realce(self):
+        """Tamaños y etiquetas de lo resaltado según el nivel de detalle de la vista"""
+        nodos, marcados, etiquetas = self.realce
+        self.puntos_realce.set_sizes([max(self.tamano, 120.0) if i in marcados else self.tamano for i in nodos])
+
+        # Las etiquetas de lo resaltado quedarían tapadas: se repiten encima con el mismo
+        # criterio que el mapa base, salvo los nodos marcados, que siempre llevan nombre
+        for texto in self.textos_realce:
+            texto.remove()
+        self.textos_realce = []
+        self.animados = [self.velo, self.lineas_realce, self.puntos_realce, self.ax.title]
+        if not self.nodos_en_vista.any():
+            return
+        con_nombre = [i for i in nodos if self.nodos_en_vista[i] and (i in marcados or i in self.nombres)]
+        self.textos_realce = [self._texto_nodo(i, zorder=6, animated=True) for i in con_nombre[:MAX_ETIQUETAS]]
+        if not self.agregado:
+            ks = np.fromiter((k for k, texto in etiquetas.items() if texto), dtype=np.int64)
+            ks = ks[self.medio_en_vista[ks] & (self.largo_px[ks] >= LARGO_ETIQUETA)]
+            ks = self._sin_choque(ks, self.medios, self.largo_px, CELDA_DISTANCIA, self.origen_vista)
+            self.textos_realce += [self._texto_arista(k, etiquetas[k], zorder=6, animated=True) for k in ks]
+        self.animados = [self.velo, self.lineas_realce, self.puntos_realce, *self.textos_realce, self.ax.title]
+
+    def _por_arista(self, valores):
+        por_indice = {}
+        for arista, valor in valores.items():
+            k = self.indice_arista.get(arista)
+            if k is not None:
+                por_indice[k] = valor
+        return por_indice
+
+    # ----------- Blitting -----------
+    def _al_dibujar(self, evento):
+        # Dibujo completo: el fondo queda sin la capa animada, que se pinta encima
+        if not self._vigente():
+            self.animados = []
+            return
+        self.fondo = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._pintar_animados()
+
+    def _pintar_animados(self):
+        for artista in self.animados:
+            self.fig.draw_artist(artista)
+
+    def _refrescar(self):
+        if self.fondo is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.fondo)
+        self._pintar_animados()
+        self.canvas.blit(self.fig.bbox)
@@ -0,0 +1,39 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class Pantalla(tk.Frame):
+    """
+    Pantalla de un algoritmo dentro de la ventana principal (MainApp). No crea ventana
+    ni figura propias: dibuja en la figura compartida de `app` y usa su grafo, que se
+    conservan al navegar. Se crea una vez por grafo y después solo se muestra u oculta.
+    """
+
+    titulo = "Visualización y Algoritmos de Rutas"
+    peso = 1  # Peso de la columna izquierda mientras la pantalla está visible
+
+    def __init__(self, app):
+        super().__init__(app.panel)
+        self.app = app
+        self.G = app.G
+        self.nodos = app.nodos
+        self.fig, self.ax, self.canvas = app.fig, app.ax, app.canvas
+        self.mapa = app.mapa
+
+        self.boton_atras = ttk.Button(self, text="← Atrás", command=self.volver_a_main)
+        self.boton_atras.pack(anchor="nw", padx=10, pady=8)
+
+        self.left = tk.Frame(self)
+        self.left.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def al_mostrar(self):
+        pass
+
+    def al_ocultar(self):
+        # Un resultado que llegue con la pantalla oculta dibujaría sobre la figura de otra
+        tareas = getattr(self, 'tareas', None)
+        if tareas is not None:
+            tareas.cancelar()
+
+    def volver_a_main(self):
+        self.app.mostrar_inicio()
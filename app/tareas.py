@@ -0,0 +1,258 @@
+import multiprocessing
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# Cálculos en hilos que siguen corriendo, por (funcion, args). Un hilo no se puede
+# detener: cancelar solo descarta su resultado. Volver a lanzar el mismo cálculo (desde
+# esta u otra pantalla) espera ese hilo en lugar de empezar otro igual en paralelo.
+# Cada entrada es [futuro, interesados]: el futuro solo se cancela cuando lo suelta el
+# último interesado, así cancelar en una pantalla no le quita el resultado a la otra.
+_en_marcha = {}
+_bloqueo_en_marcha = threading.Lock()
+
+def _clave(funcion, args):
+    clave = (funcion, args)
+    try:
+        hash(clave)
+    except TypeError:
+        return None  # Argumentos no hashables: no se puede reconocer el mismo cálculo
+    return clave
+
+def _hilo_en_marcha(clave):
+    """Futuro sin terminar de `clave`, sumándose como interesado; None si no hay"""
+    with _bloqueo_en_marcha:
+        entrada = _en_marcha.get(clave)
+        if entrada is None or entrada[0].done():
+            return None
+        entrada[1] += 1
+        return entrada[0]
+
+def _registrar_hilo(clave, futuro):
+    def olvidar(_):
+        with _bloqueo_en_marcha:
+            entrada = _en_marcha.get(clave)
+            if entrada is not None and entrada[0] is futuro:
+                del _en_marcha[clave]
+    with _bloqueo_en_marcha:
+        _en_marcha[clave] = [futuro, 1]
+    futuro.add_done_callback(olvidar)
+
+def _soltar_hilo(clave, futuro):
+    """Deja de esperar el futuro; True si nadie más lo espera (se puede cancelar)"""
+    with _bloqueo_en_marcha:
+        entrada = _en_marcha.get(clave)
+        if entrada is None or entrada[0] is not futuro:
+            return True
+        entrada[1] -= 1
+        return entrada[1] <= 0
+
+
+class Tarea:
+    """Un cálculo lanzado en segundo plano; sus callbacks corren en el hilo de Tk"""
+
+    def __init__(self, nombre, futuro, al_terminar, al_fallar, descripcion, clave=None):
+        self.nombre = nombre
+        self.futuro = futuro
+        self.clave = clave  # Con clave el futuro puede estar compartido (ver _en_marcha)
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.descripcion = descripcion
+        self.inicio = time.monotonic()
+        self.cancelada = False
+
+    def segundos(self):
+        return time.monotonic() - self.inicio
+
+
+class Tareas:
+    """
+    Ejecuta funciones lentas (algoritmos, carga de archivos) fuera del hilo de Tk y
+    revisa con after() si terminaron, así la ventana sigue respondiendo.
+
+    - Hay a lo sumo una tarea por nombre: lanzar otra con el mismo nombre cancela la
+      anterior y su resultado se descarta aunque llegue después (consulta obsoleta).
+    - cancelar() descarta el resultado; con procesos=True además detiene los procesos
+      de trabajo (y con ellos las demás tareas del pool). Con hilos la cancelación es
+      cooperativa: el hilo no se puede interrumpir y termina en segundo plano. Mientras
+      tanto, lanzar la misma funcion con los mismos args reutiliza ese hilo en lugar de
+      correr el cálculo dos veces a la vez.
+    - al_progreso(texto) recibe cada `intervalo` ms el estado de las tareas en curso.
+    - sembrar(funcion, *args) deja datos grandes (el grafo) en los procesos de trabajo
+      una sola vez, en lugar de enviarlos con cada lanzar.
+    """
+
+    def __init__(self, widget, procesos=False, trabajadores=2, intervalo=100, al_progreso=None):
+        self.widget = widget
+        self.procesos = procesos
+        self.trabajadores = trabajadores
+        self.intervalo = intervalo
+        self.al_progreso = al_progreso
+        self.activas = {}
+        self._executor = None
+        self._revisando = None
+        self._semilla = None
+
+    def _pool(self):
+        if self._executor is None:
+            if self.procesos:
+                # 'spawn': el proceso de trabajo no hereda Tk ni los hilos de la interfaz
+                funcion, args = self._semilla or (None, ())
+                self._executor = ProcessPoolExecutor(max_workers=self.trabajadores,
+                                                     mp_context=multiprocessing.get_context('spawn'),
+                                                     initializer=funcion, initargs=args)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.trabajadores)
+        return self._executor
+
+    def sembrar(self, funcion, *args):
+        """
+        Corre funcion(*args) al iniciar cada proceso de trabajo (con hilos, ahora mismo).
+        Los args se comparan por identidad: volver a sembrar con los mismos objetos no
+        hace nada; con otros, los procesos se reinician con la nueva semilla.
+        """
+        if self._semilla is not None and self._semilla[0] is funcion and len(self._semilla[1]) == len(args) \
+                and all(a is b for a, b in zip(self._semilla[1], args)):
+            return
+        self._semilla = (funcion, args)
+        if not self.procesos:
+            funcion(*args)
+        elif self._executor is not None:
+            # Las tareas en curso usan la semilla anterior: se descartan con sus procesos
+            self.cancelar()
+            self._detener_procesos()
+
+    def lanzar(self, nombre, funcion, *args, al_terminar=None, al_fallar=None, descripcion="Calculando"):
+        """Corre funcion(*args) en segundo plano; al_terminar(resultado) o al_fallar(error) al acabar"""
+        self.cancelar(nombre)
+        clave = None if self.procesos else _clave(funcion, args)
+        futuro = _hilo_en_marcha(clave) if clave is not None else None
+        if futuro is None:
+            futuro = self._pool().submit(funcion, *args)
+            if clave is not None:
+                _registrar_hilo(clave, futuro)
+        else:
+            descripcion = f"{descripcion} (cálculo ya en curso)"
+        tarea = Tarea(nombre, futuro, al_terminar, al_fallar, descripcion, clave)
+        self.activas[nombre] = tarea
+        self._programar()
+        return tarea
+
+    def ocupada(self, nombre=None):
+        return nombre in self.activas if nombre else bool(self.activas)
+
+    def cancelar(self, nombre=None):
+        """Cancela la tarea `nombre` (o todas); su resultado ya no llega a la interfaz"""
+        nombres = [nombre] if nombre else list(self.activas)
+        detener = False
+        for n in nombres:
+            tarea = self.activas.pop(n, None)
+            if tarea is None:
+                continue
+            tarea.cancelada = True
+            if tarea.clave is not None and not _soltar_hilo(tarea.clave, tarea.futuro):
+                continue  # Otra tarea espera el mismo cálculo
+            if not tarea.futuro.cancel() and self.procesos and not tarea.futuro.done():
+                detener = True
+        if detener:
+            # Sin procesos las demás tareas del pool tampoco pueden terminar
+            for tarea in self.activas.values():
+                tarea.cancelada = True
+            self.activas.clear()
+            self._detener_procesos()
+        self._informar()
+
+    def _detener_procesos(self):
+        # ProcessPoolExecutor no cancela un trabajo ya iniciado: se terminan sus procesos
+        # y el pool se vuelve a crear en el siguiente lanzar
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for proceso in list(getattr(executor, '_processes', {}).values()):
+            proceso.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def cerrar(self):
+        """Cancela todo y libera los trabajadores (al salir de la pantalla)"""
+        self.cancelar()
+        if self._revisando is not None:
+            try:
+                self.widget.after_cancel(self._revisando)
+            except tk.TclError:
+                pass
+            self._revisando = None
+        if self._executor is not None:
+            if self.procesos:
+                self._detener_procesos()
+            else:
+                # Sin cancel_futures: cancelar() ya canceló lo pendiente que nadie más espera
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    # ----------- Sondeo desde el hilo de Tk -----------
+    def _programar(self):
+        if self._revisando is None:
+            self._revisando = self.widget.after(self.intervalo, self._revisar)
+
+    def _revisar(self):
+        self._revisando = None
+        for nombre, tarea in list(self.activas.items()):
+            if not tarea.futuro.done():
+                continue
+            del self.activas[nombre]
+            try:
+                resultado = tarea.futuro.result()
+            except Exception as e:
+                if tarea.al_fallar:
+                    tarea.al_fallar(e)
+                else:
+                    print(f"Error en {tarea.descripcion}:", e)
+                continue
+            if tarea.al_terminar:
+                tarea.al_terminar(resultado)
+        self._informar()
+        if self.activas:
+            self._programar()
+
+    def _informar(self):
+        if self.al_progreso is None:
+            return
+        if not self.activas:
+            self.al_progreso("")
+            return
+        self.al_progreso("  ·  ".join(f"{t.descripcion}… {t.segundos():.1f} s" for t in self.activas.values()))
+
+
+class BarraTarea(tk.Frame):
+    """Estado de las tareas en curso con un botón para cancelarlas"""
+
+    def __init__(self, master, **opciones_tareas):
+        super().__init__(master)
+        self.estado = ttk.Label(self, text="", foreground="grey")
+        self.estado.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.boton = ttk.Button(self, text="Cancelar", command=self._cancelar, state="disabled")
+        self.boton.pack(side=tk.RIGHT)
+        self.tareas = Tareas(self, al_progreso=self._mostrar, **opciones_tareas)
+        self.bind("<Destroy>", self._al_destruir, add="+")
+
+    def _mostrar(self, texto):
+        try:
+            self.estado.configure(text=texto)
+            self.boton.configure(state="normal" if texto else "disabled")
+        except tk.TclError:
+            pass  # La ventana ya se cerró
+
+    def _cancelar(self):
+        self.tareas.cancelar()
+        if self.tareas.procesos:
+            self.estado.configure(text="Cancelado")
+        else:
+            # Un hilo no se puede detener: se avisa que el cálculo sigue hasta terminar
+            self.estado.configure(text="Cancelado (el cálculo termina en segundo plano y se descarta)")
+
+    def _al_destruir(self, evento):
+        if evento.widget is self:
+            self.tareas.cerrar()
@@ -0,0 +1,72 @@
+"""
+Benchmark de los cargadores de CSV: modo 'filas' (iterrows) contra modo 'columnas',
+y carga en frío (CSV) contra recarga desde el snapshot binario.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_carga --filas 20000 50000 --repeticiones 3
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from models.graph_logic import (COORDS, cargar_grafo, cargar_grafo_caminos, cargar_grafo_flujo, cargar_grafo_con_snapshot,
+                                cargar_csr_con_snapshot)
+
+
+def generar_csv(ruta, n_filas, n_nodos=2000, semilla=0):
+    """Escribe un CSV sintético con el formato de data/rutas_norte_sur_flujo.csv"""
+    rnd = random.Random(semilla)
+    nombres = [n.lower() for n in COORDS] + [f"municipio {i}" for i in range(max(0, n_nodos - len(COORDS)))]
+    with open(ruta, 'w', encoding='latin1') as f:
+        f.write("origen;destino;distancia(km);ETA(min);flujo (und)\n")
+        for _ in range(n_filas):
+            u, v = rnd.sample(nombres, 2)
+            dist = round(rnd.uniform(5, 120), 1)
+            f.write(f"{u};{v};{dist};{int(dist * 1.4)};{rnd.randint(50, 300)}\n")
+
+
+def medir(fn, ruta, modo, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn(ruta, modo=modo)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    cargadores = [cargar_grafo, cargar_grafo_caminos, cargar_grafo_flujo]
+    print(f"{'Cargador':<22} {'Filas':>8} {'filas (s)':>11} {'columnas (s)':>13} {'Aceleración':>12}")
+    print("-" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.filas:
+            ruta = os.path.join(tmp, f"rutas_{n}.csv")
+            generar_csv(ruta, n)
+            for fn in cargadores:
+                t_filas = medir(fn, ruta, 'filas', args.repeticiones)
+                t_cols = medir(fn, ruta, 'columnas', args.repeticiones)
+                print(f"{fn.__name__:<22} {n:>8} {t_filas:>11.3f} {t_cols:>13.3f} {t_filas / t_cols:>11.1f}x")
+
+        print()
+        # networkx: lo que carga la interfaz; CSR: lo que cargan cli.py y servidor.py
+        print(f"{'Recarga (paralelas)':<22} {'Filas':>8} {'CSV (s)':>11} {'snap. nx (s)':>13} {'snap. CSR (s)':>14} {'Aceleración':>12}")
+        print("-" * 85)
+        cache = os.path.join(tmp, 'snapshots')
+        for n in args.filas:
+            ruta = os.path.join(tmp, f"rutas_{n}.csv")
+            t_csv = medir(lambda r, modo: cargar_grafo(r, modo=modo, paralelas=True), ruta, 'columnas', args.repeticiones)
+            cargar_grafo_con_snapshot(ruta, paralelas=True, carpeta=cache)
+            t_nx = medir(lambda r, modo: cargar_grafo_con_snapshot(r, paralelas=True, carpeta=cache), ruta, None, args.repeticiones)
+            t_csr = medir(lambda r, modo: cargar_csr_con_snapshot(r, paralelas=True, carpeta=cache), ruta, None, args.repeticiones)
+            print(f"{'cargar_grafo':<22} {n:>8} {t_csv:>11.3f} {t_nx:>13.3f} {t_csr:>14.4f} {t_csv / t_csr:>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark de Floyd-Warshall: motor networkx contra motor NumPy vectorizado.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_floyd --nodos 100 250 500 1000 --max-networkx 500
+"""
+import argparse
+import random
+import time
+
+import networkx as nx
+
+from algorithms.caminocorto.floyd_warshall import matriz_floyd_warshall, matriz_floyd_warshall_numpy
+
+
+def grafo_vial(n_nodos, grado_medio=3, semilla=0):
+    """Grafo conexo y disperso parecido a una red de carreteras (grado medio ~3)"""
+    rnd = random.Random(semilla)
+    G = nx.Graph()
+    nodos = [f"municipio {i}" for i in range(n_nodos)]
+    G.add_nodes_from(nodos)
+    for i in range(1, n_nodos):
+        u, v = nodos[i], nodos[rnd.randrange(i)]
+        dist = round(rnd.uniform(5, 120), 1)
+        G.add_edge(u, v, distancia=dist, eta=dist * 1.4)
+    while 2 * G.number_of_edges() < grado_medio * n_nodos:
+        u, v = rnd.sample(nodos, 2)
+        dist = round(rnd.uniform(5, 120), 1)
+        G.add_edge(u, v, distancia=dist, eta=dist * 1.4)
+    return G
+
+
+def medir(fn, G):
+    t0 = time.perf_counter()
+    fn(G)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodos', type=int, nargs='+', default=[100, 250, 500, 1000, 2000])
+    parser.add_argument('--max-networkx', type=int, default=500,
+                        help="no ejecutar el motor networkx por encima de este tamaño (es O(V³) en Python puro)")
+    args = parser.parse_args()
+
+    print(f"{'Nodos':>6} {'networkx (s)':>13} {'numpy (s)':>11} {'Aceleración':>12}")
+    print("-" * 46)
+    for n in args.nodos:
+        G = grafo_vial(n)
+        t_np = medir(matriz_floyd_warshall_numpy, G)
+        if n <= args.max_networkx:
+            t_nx = medir(matriz_floyd_warshall, G)
+            print(f"{n:>6} {t_nx:>13.3f} {t_np:>11.3f} {t_nx / t_np:>11.1f}x")
+        else:
+            print(f"{n:>6} {'-':>13} {t_np:>11.3f} {'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
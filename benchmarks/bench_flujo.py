@@ -0,0 +1,106 @@
+"""
+Benchmark de flujo máximo sobre data/rutas_norte_sur_flujo.csv ampliado sintéticamente.
+
+La red se replica `copias` veces; cada copia se une a la siguiente por todos sus
+municipios (arcos "de corredor" con capacidad aleatoria) y se busca el flujo de
+Cartagena en la primera copia a Cantagallo en la última.
+
+La columna "vs original" compara contra el Ford-Fulkerson original, con el grafo
+residual en diccionarios (ford_fulkerson_original, igual al que tenía el proyecto antes
+de RedResidual), no contra la versión CSR de la tabla.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_flujo --copias 1 5 20 --repeticiones 3 --max-original 20
+"""
+import argparse
+import os
+import random
+import time
+
+import networkx as nx
+
+from models.graph_logic import cargar_grafo
+from algorithms.flujomaximo.Ford_Fulkerson import (ford_fulkerson, create_residual_graph, find_augmenting_path_bfs,
+                                                   update_residual_graph, calculate_edge_flows)
+from algorithms.flujomaximo.Edmonds_Karp import edmonds_karp
+from algorithms.flujomaximo.Dinic import dinic
+from algorithms.flujomaximo.Push_Relabel import push_relabel, push_relabel_fifo
+from algorithms.flujomaximo.red_residual import red_residual_de
+
+CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'rutas_norte_sur_flujo.csv')
+
+ALGORITMOS = [
+    ('Ford-Fulkerson (CSR)', ford_fulkerson),
+    ('Edmonds-Karp', edmonds_karp),
+    ('Dinic', dinic),
+    ('Push-Relabel (highest)', push_relabel),
+    ('Push-Relabel (fifo)', push_relabel_fifo),
+]
+
+
+def ford_fulkerson_original(G, source, sink):
+    """El Ford-Fulkerson original: grafo residual de diccionarios y BFS que copia caminos"""
+    residual_graph = create_residual_graph(G)
+    max_flow = 0
+    flow_paths = []
+    while True:
+        path, bottleneck = find_augmenting_path_bfs(residual_graph, source, sink)
+        if not path:
+            break
+        max_flow += bottleneck
+        flow_paths.append({'path': path, 'flow': bottleneck, 'total_flow': max_flow})
+        update_residual_graph(residual_graph, path, bottleneck)
+    edge_flows = calculate_edge_flows(G, residual_graph)
+    return max_flow, flow_paths, edge_flows
+
+
+def medir(algoritmo, G, fuente, sumidero, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        flujo = algoritmo(G, fuente, sumidero)[0]
+        mejor = min(mejor, time.perf_counter() - t0)
+    return flujo, mejor
+
+
+def red_ampliada(base, copias, semilla=0):
+    """Replica la red base en capas dirigidas y devuelve (G, fuente, sumidero)"""
+    rnd = random.Random(semilla)
+    G = nx.DiGraph()
+    for k in range(copias):
+        for u, v, d in base.edges(data=True):
+            G.add_edge((k, u), (k, v), flujo=d.get('flujo', 1))
+            G.add_edge((k, v), (k, u), flujo=d.get('flujo', 1))
+        if k > 0:
+            for n in base.nodes:
+                G.add_edge((k - 1, n), (k, n), flujo=rnd.randint(20, 200))
+    return G, (0, 'Cartagena'), (copias - 1, 'Cantagallo')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--copias', type=int, nargs='+', default=[1, 5, 20, 50])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--max-original', type=int, default=20,
+                        help="no ejecutar el Ford-Fulkerson original por encima de estas copias")
+    args = parser.parse_args()
+
+    base = cargar_grafo(CSV)
+    print(f"{'Copias':>6} {'Arcos':>7} {'Algoritmo':<24} {'Flujo':>10} {'Tiempo (s)':>11} {'vs original':>12}")
+    print("-" * 76)
+    for copias in args.copias:
+        G, fuente, sumidero = red_ampliada(base, copias)
+        referencia = None
+        if copias <= args.max_original:
+            flujo, referencia = medir(ford_fulkerson_original, G, fuente, sumidero, args.repeticiones)
+            print(f"{copias:>6} {G.number_of_edges():>7} {'Ford-Fulkerson original':<24} {flujo:>10.1f} {referencia:>11.4f} {'1.0x':>12}")
+        # La red residual se construye una vez por grafo y la comparten todos los algoritmos
+        red_residual_de(G)
+        for nombre, algoritmo in ALGORITMOS:
+            flujo, mejor = medir(algoritmo, G, fuente, sumidero, args.repeticiones)
+            relacion = f"{referencia / mejor:.1f}x" if referencia else "-"
+            print(f"{copias:>6} {G.number_of_edges():>7} {nombre:<24} {flujo:>10.1f} {mejor:>11.4f} {relacion:>12}")
+
+
+if __name__ == "__main__":
+    main()
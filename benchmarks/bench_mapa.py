@@ -0,0 +1,86 @@
+"""
+Benchmark del dibujo del mapa por consulta: redibujo completo con nx.draw_networkx_*
+(como hacían las pantallas) contra MapaRutas.resaltar sobre el mapa ya dibujado.
+Usa el backend Agg, sin ventana; el blitting de TkAgg solo puede ser más rápido.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_mapa --nodos 100 500 1500
+"""
+import argparse
+import random
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import networkx as nx
+
+from app.mapa import MapaRutas, aristas_de_caminos
+from benchmarks.bench_floyd import grafo_vial
+from models.graph_view import posiciones
+
+
+def grafo_con_coordenadas(n_nodos, semilla=0):
+    rnd = random.Random(semilla)
+    G = grafo_vial(n_nodos, semilla=semilla)
+    for n in G:
+        G.nodes[n]['pos'] = (rnd.uniform(7.0, 10.8), rnd.uniform(-75.7, -73.8))
+    return G
+
+
+def redibujo_completo(fig, ax, G, origen, caminos):
+    edges_en_camino = {tuple(sorted(e)) for e in aristas_de_caminos(caminos.values())}
+    ax.clear()
+    pos = posiciones(G)
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_color=["orange" if n == origen else "skyblue" for n in G], node_size=650)
+    nx.draw_networkx_labels(G, pos, ax=ax, font_size=10, font_family="DejaVu Sans")
+    nx.draw_networkx_edges(G, pos, ax=ax, width=2,
+                           edge_color=["red" if tuple(sorted(e)) in edges_en_camino else "grey" for e in G.edges()])
+    nx.draw_networkx_edge_labels(G, pos, ax=ax, font_size=6, font_family="DejaVu Sans",
+                                 edge_labels={k: f"{v:.1f} km" for k, v in nx.get_edge_attributes(G, 'distancia').items()})
+    ax.set_title(f"Caminos más cortos desde {origen}", fontsize=18)
+    ax.axis('off')
+    fig.tight_layout()
+    fig.canvas.draw()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodos', type=int, nargs='+', default=[100, 500, 1500])
+    parser.add_argument('--consultas', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Nodos':>6} {'Aristas':>8} {'completo (s)':>13} {'base (s)':>10} {'resaltar (ms)':>14}")
+    print("-" * 56)
+    for n in args.nodos:
+        G = grafo_con_coordenadas(n)
+        nodos = list(G)
+        rnd = random.Random(1)
+        fig, ax = plt.subplots(figsize=(13, 7))
+
+        origen = rnd.choice(nodos)
+        caminos = nx.single_source_dijkstra_path(G, origen, weight='distancia')
+        t0 = time.perf_counter()
+        redibujo_completo(fig, ax, G, origen, caminos)
+        t_completo = time.perf_counter() - t0
+
+        mapa = MapaRutas(fig, ax, fig.canvas)
+        t0 = time.perf_counter()
+        mapa.dibujar_base(G)
+        mapa.resaltar("Mapa")
+        t_base = time.perf_counter() - t0
+
+        mejor = float('inf')
+        for _ in range(args.consultas):
+            o, d = rnd.sample(nodos, 2)
+            camino = nx.shortest_path(G, o, d, weight='distancia')
+            t0 = time.perf_counter()
+            mapa.resaltar(f"{o} → {d}", colores_nodos={o: "orange", d: "green"},
+                          colores_aristas=dict.fromkeys(aristas_de_caminos([camino]), "red"))
+            mejor = min(mejor, time.perf_counter() - t0)
+        plt.close(fig)
+        print(f"{n:>6} {G.number_of_edges():>8} {t_completo:>13.3f} {t_base:>10.3f} {mejor * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
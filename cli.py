@@ -0,0 +1,246 @@
+# cli.py
+"""
+Modo sin interfaz: carga un CSV de rutas, lee pares origen/destino (un par por
+línea separado por coma, punto y coma o tabulador) y escribe un resultado por par
+en CSV o JSONL a medida que se calculan. No importa tkinter ni matplotlib.
+
+Uso (desde la raíz del proyecto):
+    python cli.py data/Rutas.csv --pares pares.csv --algoritmo astar
+    printf 'Cartagena;Mompós\\n' | python cli.py data/Rutas.csv --formato jsonl
+    python cli.py data/rutas_norte_sur_flujo.csv --pares pares.csv --algoritmo dinic --procesos 4
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import networkx as nx
+
+from models.graph_logic import (cargar_grafo_csr, cargar_csr_con_snapshot, calcular_matriz_floyd,
+                                calcular_matriz_johnson, indice_nombres)
+from models.nomenclator import normaliza
+from algorithms.caminocorto.dijkstra import dijkstra_search
+from algorithms.caminocorto.astar import astar_search
+from algorithms.caminocorto.bellman_ford import bellman_ford_csr
+from algorithms.caminocorto.matriz_caminos import SIN_PREDECESOR
+from algorithms.flujomaximo.red_residual import usar_red
+from algorithms.flujomaximo.Ford_Fulkerson import ALGORITMOS_FLUJO
+
+CAMPOS_CAMINO = ['origen', 'destino', 'algoritmo', 'distancia_km', 'eta_min', 'camino', 'error']
+CAMPOS_FLUJO = ['origen', 'destino', 'algoritmo', 'flujo_maximo', 'corte', 'error']
+
+
+# ----------- Algoritmos por par -----------
+# Cada uno recibe (csr, origen, destino) con nombres ya resueltos y devuelve
+# (camino, distancia, eta); lanza nx.NetworkXNoPath si no hay camino.
+def _por_dijkstra(csr, origen, destino):
+    return dijkstra_search(csr, origen, destino)[:3]
+
+def _por_astar(csr, origen, destino):
+    return astar_search(csr, origen, destino)[:3]
+
+_bellman_por_origen = {}
+
+def _por_bellman(csr, origen, destino):
+    # Un Bellman-Ford resuelve todos los destinos de un origen: se guarda el último
+    filas = _bellman_por_origen.get(origen)
+    if filas is None:
+        _bellman_por_origen.clear()
+        filas = _bellman_por_origen[origen] = bellman_ford_csr(csr, csr.indice[origen])
+    dist, eta, pred = filas
+    j = csr.indice[destino]
+    if dist[j] == float('inf'):
+        raise nx.NetworkXNoPath(f"No hay camino entre {origen} y {destino}")
+    camino = []
+    while j != SIN_PREDECESOR:
+        camino.append(csr.nodos[j])
+        j = pred[j]
+    camino.reverse()
+    return camino, dist[csr.indice[destino]], eta[csr.indice[destino]]
+
+def _por_matriz(calcular):
+    def resolver(csr, origen, destino):
+        matriz = calcular(csr)
+        camino = matriz.camino(origen, destino)
+        if camino is None:
+            raise nx.NetworkXNoPath(f"No hay camino entre {origen} y {destino}")
+        return camino, matriz.distancia(origen, destino), matriz.tiempo(origen, destino)
+    return resolver
+
+ALGORITMOS_CAMINO = {
+    'dijkstra': _por_dijkstra,
+    'astar': _por_astar,
+    'bellman-ford': _por_bellman,
+    'floyd-warshall': _por_matriz(calcular_matriz_floyd),
+    'johnson': _por_matriz(calcular_matriz_johnson),
+}
+NOMBRES_FLUJO = {nombre.lower(): nombre for nombre in ALGORITMOS_FLUJO}
+
+
+def _flujo_maximo(csr, origen, destino, algoritmo):
+    if origen == destino:
+        raise ValueError("El nodo fuente y sumidero no pueden ser el mismo")
+    nucleo = ALGORITMOS_FLUJO[NOMBRES_FLUJO[algoritmo]]
+    with usar_red(csr) as red:
+        s, t = red.indice[origen], red.indice[destino]
+        max_flow, _ = nucleo(red, s, t)
+        _, cut_edges = red.corte_minimo(s)
+    return max_flow, cut_edges
+
+
+# ----------- Estado de cada proceso -----------
+_estado = {}
+
+def _iniciar(csv_path, usar_snapshot, algoritmo):
+    """Carga el grafo una vez por proceso (desde el snapshot si existe)"""
+    # Los algoritmos corren sobre el CSR: no hace falta el grafo de networkx
+    if usar_snapshot:
+        csr = cargar_csr_con_snapshot(csv_path, paralelas=True)
+    else:
+        csr = cargar_grafo_csr(csv_path, paralelas=True)
+    _estado['csr'] = csr
+    _estado['algoritmo'] = algoritmo
+    # Los pares pueden venir sin tildes o en minúsculas: se comparan normalizados
+    _estado['nombres'] = indice_nombres(csr)
+
+def _nodo(nombre):
+    csr = _estado['csr']
+    if nombre in csr:
+        return nombre
+    encontrado = _estado['nombres'].get(normaliza(nombre))
+    if encontrado is None:
+        raise nx.NodeNotFound(f"El nodo {nombre} no está en el grafo")
+    return encontrado
+
+def resolver_par(par):
+    """Resultado de un par (origen, destino) como diccionario listo para escribir"""
+    origen, destino = par
+    csr, algoritmo = _estado['csr'], _estado['algoritmo']
+    fila = {'origen': origen, 'destino': destino, 'algoritmo': algoritmo}
+    try:
+        o, d = _nodo(origen), _nodo(destino)
+        if algoritmo in NOMBRES_FLUJO:
+            fila['flujo_maximo'], corte = _flujo_maximo(csr, o, d, algoritmo)
+            fila['corte'] = [list(arista) for arista in corte]
+        else:
+            camino, distancia, eta = ALGORITMOS_CAMINO[algoritmo](csr, o, d)
+            fila.update(distancia_km=distancia, eta_min=eta, camino=camino)
+    except nx.NetworkXNoPath:
+        fila['error'] = "sin camino"
+    except Exception as e:
+        fila['error'] = str(e)
+    return fila
+
+def resolver_lote(pares):
+    return [resolver_par(par) for par in pares]
+
+
+# ----------- Entrada y salida -----------
+def leer_pares(archivo):
+    """Pares (origen, destino) de un archivo de texto; salta líneas vacías y el encabezado"""
+    primera = True
+    for linea in archivo:
+        linea = linea.strip()
+        if not linea or linea.startswith('#'):
+            continue
+        sep = '\t' if '\t' in linea else (';' if ';' in linea else ',')
+        campos = [c.strip() for c in next(csv.reader([linea], delimiter=sep))]
+        if primera and [c.lower() for c in campos[:2]] == ['origen', 'destino']:
+            primera = False
+            continue
+        primera = False
+        if len(campos) < 2:
+            print(f"Línea ignorada (se esperaba origen y destino): {linea}", file=sys.stderr)
+            continue
+        yield campos[0], campos[1]
+
+class EscritorCSV:
+    def __init__(self, salida, campos):
+        self.escritor = csv.DictWriter(salida, fieldnames=campos, extrasaction='ignore')
+        self.escritor.writeheader()
+
+    def escribir(self, fila):
+        fila = dict(fila)
+        if 'camino' in fila:
+            fila['camino'] = ' > '.join(fila['camino'])
+        if 'corte' in fila:
+            fila['corte'] = ' | '.join(f"{u}-{v}" for u, v in fila['corte'])
+        self.escritor.writerow(fila)
+
+class EscritorJSONL:
+    def __init__(self, salida, campos):
+        self.salida = salida
+
+    def escribir(self, fila):
+        self.salida.write(json.dumps(fila, ensure_ascii=False) + '\n')
+
+ESCRITORES = {'csv': EscritorCSV, 'jsonl': EscritorJSONL}
+
+
+def resultados(pares, csv_path, algoritmo, procesos=1, usar_snapshot=True, lote=64):
+    """
+    Resultados de los pares en el mismo orden de entrada, a medida que se calculan.
+    Con procesos > 1 cada proceso carga su propia copia del grafo y resuelve lotes de pares.
+    Solo hay 2 * procesos lotes en vuelo: la entrada se lee a medida que salen resultados
+    (pool.map la leería completa antes de entregar el primero).
+    """
+    if procesos <= 1:
+        _iniciar(csv_path, usar_snapshot, algoritmo)
+        for par in pares:
+            yield resolver_par(par)
+        return
+    pares = iter(pares)
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar,
+                             initargs=(csv_path, usar_snapshot, algoritmo)) as pool:
+        en_vuelo = deque()
+        while True:
+            bloque = list(islice(pares, lote))
+            if bloque:
+                en_vuelo.append(pool.submit(resolver_lote, bloque))
+            if not en_vuelo:
+                break
+            # Con la ventana llena (o la entrada agotada) se espera al lote más antiguo
+            if len(en_vuelo) >= 2 * procesos or not bloque:
+                yield from en_vuelo.popleft().result()
+
+
+def main(argv=None):
+    algoritmos = list(ALGORITMOS_CAMINO) + list(NOMBRES_FLUJO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv', help="CSV de rutas (mismo formato que en la interfaz)")
+    parser.add_argument('--pares', default='-', help="Archivo con pares origen/destino ('-' = entrada estándar)")
+    parser.add_argument('--algoritmo', choices=algoritmos, default='dijkstra')
+    parser.add_argument('--procesos', type=int, default=1,
+                        help="Procesos de trabajo; Floyd-Warshall y Johnson conviene correrlos con 1")
+    parser.add_argument('--formato', choices=list(ESCRITORES), default='csv')
+    parser.add_argument('--salida', default='-', help="Archivo de salida ('-' = salida estándar)")
+    parser.add_argument('--sin-snapshot', action='store_true', help="Leer siempre el CSV sin usar el snapshot binario")
+    args = parser.parse_args(argv)
+
+    entrada = sys.stdin if args.pares == '-' else open(args.pares, encoding='utf-8')
+    salida = sys.stdout if args.salida == '-' else open(args.salida, 'w', encoding='utf-8', newline='')
+    campos = CAMPOS_FLUJO if args.algoritmo in NOMBRES_FLUJO else CAMPOS_CAMINO
+    try:
+        escritor = ESCRITORES[args.formato](salida, campos)
+        errores = 0
+        for fila in resultados(leer_pares(entrada), args.csv, args.algoritmo, args.procesos, not args.sin_snapshot):
+            errores += 'error' in fila
+            escritor.escribir(fila)
+        if errores:
+            print(f"{errores} pares con error", file=sys.stderr)
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (p. ej. `| head`): no es un error del cálculo
+        sys.stdout = None
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import weakref
+
+import networkx as nx
+import numpy as np
+
+# Atributos de arista que se leen como capacidad, en orden de preferencia
+ATRIBUTOS_CAPACIDAD = ('flujo', 'capacity')
+
+
+class GrafoCSR:
+    """
+    Representación congelada de un grafo de rutas con nodos indexados por enteros.
+
+    - nodos / indice: tabla de nombres <-> ids (en el orden de G.nodes).
+    - arista_origen, arista_destino y atributos[nombre]: una entrada por arista del grafo
+      original (float64; NaN donde la arista no tenía ese atributo).
+    - offsets, destinos, arco_arista: adyacencia CSR; los arcos que salen del nodo i son
+      offsets[i] .. offsets[i + 1] - 1 y arco_arista[a] es la arista de la que viene el arco
+      (en grafos no dirigidos cada arista aporta un arco por sentido).
+    - distancia, eta, capacidad: valores por arco listos para los algoritmos, con los
+      mismos valores por defecto que usan hoy (1 km, 0 min, capacidad 1). La capacidad
+      es 'flujo' o, donde falta, 'capacity' (la que escribe cargar_grafo_flujo).
+    - pos: coordenadas (lat, lon) por nodo, (0, 0) si no se conocen.
+
+    Se construye una vez con desde_networkx y se puede volver a convertir con a_networkx.
+    Los arreglos son de solo lectura: cualquier cambio al grafo implica construir otro.
+    """
+
+    def __init__(self, nodos, arista_origen, arista_destino, atributos, pos, dirigido, atributos_enteros=(), grafo=None,
+                 adyacencia=None):
+        n = len(nodos)
+        self.nodos = list(nodos)
+        self.indice = {v: i for i, v in enumerate(self.nodos)}
+        self.dirigido = dirigido
+        self.arista_origen = np.asarray(arista_origen, dtype=np.int32)
+        self.arista_destino = np.asarray(arista_destino, dtype=np.int32)
+        self.atributos = {k: np.asarray(v, dtype=np.float64) for k, v in atributos.items()}
+        self.atributos_enteros = frozenset(atributos_enteros)
+        self.pos = np.asarray(pos, dtype=np.float64).reshape(n, 2)
+        self.grafo = dict(grafo or {})
+
+        if adyacencia is not None:
+            # (offsets, destinos, arco_arista) ya calculados, p. ej. leídos de un snapshot
+            self.offsets, self.destinos, self.arco_arista = adyacencia
+        else:
+            self.offsets, self.destinos, self.arco_arista = self._adyacencia(n)
+        self.distancia = self._por_arco('distancia', 1.0)
+        self.eta = self._por_arco('eta', 0.0)
+        self.capacidad = self.capacidades()[self.arco_arista]
+        self._listas = None
+
+        for arreglo in (self.arista_origen, self.arista_destino, self.pos, self.offsets, self.destinos,
+                        self.arco_arista, self.distancia, self.eta, self.capacidad, *self.atributos.values()):
+            arreglo.flags.writeable = False
+
+    def _adyacencia(self, n):
+        m = len(self.arista_origen)
+        if self.dirigido:
+            colas, cabezas, aristas = self.arista_origen, self.arista_destino, np.arange(m)
+        else:
+            colas = np.concatenate([self.arista_origen, self.arista_destino])
+            cabezas = np.concatenate([self.arista_destino, self.arista_origen])
+            aristas = np.concatenate([np.arange(m), np.arange(m)])
+        orden = np.argsort(colas, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(colas, minlength=n), out=offsets[1:])
+        return offsets, cabezas[orden].astype(np.int32), aristas[orden].astype(np.int32)
+
+    def valores_arista(self, nombre, defecto):
+        """Atributo `nombre` por arista original, con `defecto` donde falta"""
+        valores = self.atributos.get(nombre)
+        if valores is None:
+            return np.full(len(self.arista_origen), float(defecto))
+        return np.where(np.isnan(valores), float(defecto), valores)
+
+    def capacidades(self, defecto=1.0):
+        """Capacidad por arista original: 'flujo', si no 'capacity', si no `defecto`"""
+        valores = np.full(len(self.arista_origen), np.nan)
+        for nombre in ATRIBUTOS_CAPACIDAD:
+            columna = self.atributos.get(nombre)
+            if columna is not None:
+                valores = np.where(np.isnan(valores), columna, valores)
+        return np.where(np.isnan(valores), float(defecto), valores)
+
+    def _por_arco(self, nombre, defecto):
+        return self.valores_arista(nombre, defecto)[self.arco_arista]
+
+    # ----------- Consultas tipo networkx -----------
+    def __contains__(self, nodo):
+        return nodo in self.indice
+
+    def __iter__(self):
+        return iter(self.nodos)
+
+    def __len__(self):
+        return len(self.nodos)
+
+    def number_of_nodes(self):
+        return len(self.nodos)
+
+    def number_of_edges(self):
+        return len(self.arista_origen)
+
+    def is_directed(self):
+        return self.dirigido
+
+    def listas(self):
+        """(offsets, destinos, distancia, eta) como listas de Python, más rápidas en bucles"""
+        if self._listas is None:
+            self._listas = (self.offsets.tolist(), self.destinos.tolist(), self.distancia.tolist(), self.eta.tolist())
+        return self._listas
+
+    # ----------- Conversión -----------
+    @classmethod
+    def desde_networkx(cls, G):
+        nodos = list(G.nodes)
+        indice = {v: i for i, v in enumerate(nodos)}
+        aristas = list(G.edges(data=True))
+        nombres = []
+        for _, _, datos in aristas:
+            for k, v in datos.items():
+                if k not in nombres and isinstance(v, (int, float, np.number)) and not isinstance(v, bool):
+                    nombres.append(k)
+        atributos = {k: np.full(len(aristas), np.nan) for k in nombres}
+        enteros = set(nombres)
+        for e, (_, _, datos) in enumerate(aristas):
+            for k in nombres:
+                v = datos.get(k)
+                if v is None:
+                    enteros.discard(k)
+                    continue
+                if not isinstance(v, (int, np.integer)):
+                    enteros.discard(k)
+                atributos[k][e] = v
+        pos = [G.nodes[v].get('pos', (0, 0)) for v in nodos]
+        return cls(
+            nodos,
+            [indice[u] for u, _, _ in aristas],
+            [indice[v] for _, v, _ in aristas],
+            atributos,
+            pos,
+            G.is_directed(),
+            atributos_enteros=enteros,
+            grafo=G.graph,
+        )
+
+    def a_networkx(self):
+        G = nx.DiGraph() if self.dirigido else nx.Graph()
+        G.graph.update(self.grafo)
+        G.add_nodes_from(
+            (v, {'pos': (lat, lon) if (lat, lon) != (0.0, 0.0) else (0, 0)})
+            for v, (lat, lon) in zip(self.nodos, self.pos.tolist())
+        )
+        # Columnas enteras convertidas de una vez; los NaN (atributo ausente) se quitan después
+        claves = list(self.atributos)
+        columnas = [
+            (v.astype(np.int64) if k in self.atributos_enteros else v).tolist()
+            for k, v in self.atributos.items()
+        ]
+        incompletas = {k for k, v in self.atributos.items() if np.isnan(v).any()}
+        nodos = self.nodos
+        origenes = [nodos[i] for i in self.arista_origen.tolist()]
+        destinos = [nodos[j] for j in self.arista_destino.tolist()]
+        datos = [dict(zip(claves, fila)) for fila in zip(*columnas)] if claves else [{} for _ in origenes]
+        for k in incompletas:
+            faltan = np.flatnonzero(np.isnan(self.atributos[k])).tolist()
+            for e in faltan:
+                del datos[e][k]
+        G.add_edges_from(zip(origenes, destinos, datos))
+        return G
+
+
+# ----------- Conversión hecha una vez por grafo de networkx -----------
+# networkx no avisa cuando cambia un atributo, así que quien edite distancia, eta o
+# flujo de un grafo ya cargado debe llamar a marcar_modificado(G) (o a
+# graph_logic.olvidar_caches(G)); si no, el CSR y lo que se construye a partir de él
+# (redes residuales, cotas de A*, matrices de todos los pares) siguen con los valores viejos.
+csr_por_grafo = weakref.WeakKeyDictionary()
+
+def version_de(G):
+    """Contador de cambios de G (0 si nunca se marcó como modificado)"""
+    return G.graph.get('version_cambios', 0)
+
+def marcar_modificado(G):
+    """Invalida el CSR en caché de G y todo lo que depende de él"""
+    G.graph['version_cambios'] = version_de(G) + 1
+
+def csr_de(G):
+    """
+    GrafoCSR de G (el mismo objeto si G ya lo es), construido una sola vez por grafo.
+    Se reconstruye si G ganó o perdió nodos o aristas, o si se marcó como modificado.
+    """
+    if isinstance(G, GrafoCSR):
+        return G
+    entrada = csr_por_grafo.get(G)
+    version = version_de(G)
+    if entrada is not None:
+        csr, version_csr = entrada
+        if (version_csr == version and len(csr) == G.number_of_nodes()
+                and csr.number_of_edges() == G.number_of_edges()):
+            return csr
+    csr = GrafoCSR.desde_networkx(G)
+    csr_por_grafo[G] = (csr, version)
+    return csr
@@ -1,9 +1,18 @@
+import weakref
+import numpy as np
 import pandas as pd
 import networkx as nx
-from algorithms.caminocorto.dijkstra import shortest_path_dijkstra, shortest_paths_from_source_dijkstra
+from models.nomenclator import Nomenclator, normaliza
+from models.segmentos import SegmentosParalelos
+from models.grafo_csr import GrafoCSR, csr_de, csr_por_grafo, version_de
+from models.snapshot import leer_snapshot, guardar_snapshot
+from algorithms.caminocorto.dijkstra import dijkstra_search, shortest_path_dijkstra, shortest_paths_from_source_dijkstra
 from algorithms.caminocorto.bellman_ford import shortest_paths_from_source_bellman
 from algorithms.caminocorto.astar import shortest_path_astar
-from algorithms.caminocorto.floyd_warshall import shortest_paths_floyd_warshall
+from algorithms.flujomaximo.red_residual import redes_residuales
+from algorithms.caminocorto.paralelo import shortest_paths_parallel
+from algorithms.caminocorto.johnson import matriz_johnson, shortest_paths_johnson
+from algorithms.caminocorto.floyd_warshall import matriz_floyd_warshall_numpy, shortest_paths_floyd_warshall
 
 COORDS = {
     "Cartagena": (10.4236, -75.5253),
@@ -54,14 +63,93 @@ COORDS = {
     "San Jacinto Del Cauca": (8.3889, -74.6418),
 }
 
-def normaliza(nombre):
-    """Convierte a formato 'Titulo' sin tildes"""
-    import unicodedata
-    n = str(nombre).strip().title()
-    n = ''.join(c for c in unicodedata.normalize('NFD', n) if unicodedata.category(c) != 'Mn')
-    return n
+# Índice normalizado de COORDS, construido una sola vez
+NOMENCLATOR = Nomenclator(COORDS)
 
-def cargar_grafo(csv_path):
+def _titulo(nombre):
+    """Formato 'Titulo' conservando tildes (el usado por cargar_grafo)"""
+    return str(nombre).strip().title()
+
+def _detectar_separador(csv_path):
+    """Separador del CSV a partir de su primera línea (tab, ';' o ',')"""
+    with open(csv_path, encoding='latin1') as f:
+        primer_linea = f.readline()
+    for sep in ('\t', ';', ','):
+        if sep in primer_linea:
+            return sep
+    return ';'
+
+def _asignar_coordenadas(G, nomenclator=None):
+    if nomenclator is None:
+        nomenclator = NOMENCLATOR
+    nomenclator.asignar_coordenadas(G)
+
+
+# ----------- Cargador por columnas -----------
+COLUMNAS = {
+    'distancia(km)': 'distancia',
+    'ETA(min)': 'eta',
+    'flujo (und)': 'flujo',
+}
+
+def leer_rutas(csv_path, nombres=normaliza, sep=None):
+    """
+    Lee el CSV de rutas como columnas: los nombres se normalizan una sola vez
+    por valor distinto y los números se convierten por columna completa.
+    Devuelve un DataFrame con columnas origen, destino, distancia, eta
+    (y flujo si el archivo la trae).
+    """
+    if sep is None:
+        sep = _detectar_separador(csv_path)
+    df = pd.read_csv(csv_path, sep=sep, encoding='latin1', engine='c')
+    df.columns = df.columns.str.strip()
+    df = df.rename(columns=COLUMNAS)
+    for col in ('origen', 'destino'):
+        codigos, unicos = pd.factorize(df[col].astype(str))
+        normalizados = np.array([nombres(u) for u in unicos], dtype=object)
+        df[col] = normalizados[codigos]
+    for col in COLUMNAS.values():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col]).astype(float)
+    return df
+
+def _grafo_desde_columnas(df, atributos, create_using, paralelas=False):
+    """
+    Agrega todas las aristas de una vez a partir del DataFrame de rutas.
+    Con paralelas=True los tramos repetidos no se pisan: se guardan en
+    G.graph['segmentos'] y cada arista queda con el tramo más corto y el flujo sumado.
+    """
+    if not paralelas:
+        return nx.from_pandas_edgelist(df, 'origen', 'destino', edge_attr=atributos, create_using=create_using)
+    segmentos = SegmentosParalelos(df[['origen', 'destino'] + atributos], dirigido=issubclass(create_using, nx.DiGraph))
+    G = nx.from_pandas_edgelist(segmentos.aristas(), 'origen', 'destino',
+                                edge_attr=atributos + ['segmento', 'n_segmentos'], create_using=create_using)
+    G.graph['segmentos'] = segmentos
+    return G
+
+def _cargar_grafo_columnas(csv_path, nomenclator=None, paralelas=False):
+    df = leer_rutas(csv_path, nombres=_titulo)
+    atributos = ['distancia', 'eta'] + (['flujo'] if 'flujo' in df.columns else [])
+    G = _grafo_desde_columnas(df, atributos, nx.Graph, paralelas)
+    _asignar_coordenadas(G, nomenclator)
+    return G
+
+def _cargar_grafo_caminos_columnas(csv_path, nomenclator=None, paralelas=False):
+    df = leer_rutas(csv_path)
+    G = _grafo_desde_columnas(df, ['distancia', 'eta'], nx.Graph, paralelas)
+    _asignar_coordenadas(G, nomenclator)
+    return G
+
+def _cargar_grafo_flujo_columnas(csv_path, nomenclator=None, paralelas=False):
+    df = leer_rutas(csv_path)
+    df['capacity'] = df['flujo'] if 'flujo' in df.columns else 0.0
+    G = _grafo_desde_columnas(df, ['distancia', 'eta', 'capacity'], nx.DiGraph, paralelas)
+    _asignar_coordenadas(G, nomenclator)
+    return G
+
+
+# ----------- Cargador fila por fila (original) -----------
+def _cargar_grafo_filas(csv_path, nomenclator=None):
     df = pd.read_csv(csv_path, sep=None, engine='python', encoding='latin1')
     G = nx.Graph()
     for _, row in df.iterrows():
@@ -74,21 +162,11 @@ def cargar_grafo(csv_path):
             G.add_edge(origen, destino, distancia=distancia, eta=eta, flujo=flujo)
         else:
             G.add_edge(origen, destino, distancia=distancia, eta=eta)
-    # --- ASIGNAR COORDENADAS ---
-    for n in G.nodes:
-        nodo = normaliza(n)
-        found = False
-        for k in COORDS:
-            if normaliza(k) == nodo:
-                G.nodes[n]['pos'] = COORDS[k]
-                found = True
-                break
-        if not found:
-            G.nodes[n]['pos'] = (0, 0)
+    _asignar_coordenadas(G, nomenclator)
     return G
 
 
-def cargar_grafo_caminos(csv_path):
+def _cargar_grafo_caminos_filas(csv_path, nomenclator=None):
     with open(csv_path, encoding='latin1') as f:
         primer_linea = f.readline()
         sep = '\t' if '\t' in primer_linea else ';'
@@ -101,21 +179,11 @@ def cargar_grafo_caminos(csv_path):
         distancia = float(row['distancia(km)'])
         eta = float(row['ETA(min)'])
         G.add_edge(origen, destino, distancia=distancia, eta=eta)
-    # --- ASIGNAR COORDENADAS ---
-    for n in G.nodes:
-        nodo = normaliza(n)
-        found = False
-        for k in COORDS:
-            if normaliza(k) == nodo:
-                G.nodes[n]['pos'] = COORDS[k]
-                found = True
-                break
-        if not found:
-            G.nodes[n]['pos'] = (0, 0)
+    _asignar_coordenadas(G, nomenclator)
     return G
 
 
-def cargar_grafo_flujo(csv_path):
+def _cargar_grafo_flujo_filas(csv_path, nomenclator=None):
     with open(csv_path, encoding='latin1') as f:
         primer_linea = f.readline()
         sep = '\t' if '\t' in primer_linea else ';'
@@ -129,21 +197,80 @@ def cargar_grafo_flujo(csv_path):
         eta = float(row['ETA(min)'])
         flujo = float(row['flujo (und)']) if 'flujo (und)' in df.columns else 0
         G.add_edge(origen, destino, distancia=distancia, eta=eta, capacity=flujo)
-    # --- ASIGNAR COORDENADAS ---
-    for n in G.nodes:
-        nodo = normaliza(n)
-        found = False
-        for k in COORDS:
-            if normaliza(k) == nodo:
-                G.nodes[n]['pos'] = COORDS[k]
-                found = True
-                break
-        if not found:
-            G.nodes[n]['pos'] = (0, 0)
+    _asignar_coordenadas(G, nomenclator)
+    return G
+
+
+# ----------- Puntos de entrada -----------
+# modo='columnas' (por defecto) usa el cargador vectorizado; modo='filas' el original con iterrows.
+# nomenclator permite usar otras coordenadas, p. ej. Nomenclator.desde_archivo('municipios.csv').
+# paralelas=True (solo modo 'columnas') conserva los tramos repetidos entre un mismo par:
+# la arista usa el más corto para distancia/eta y la suma de todos para flujo/capacity.
+def _cargar(modo, columnas, filas, csv_path, nomenclator, paralelas):
+    if modo == 'columnas':
+        return columnas(csv_path, nomenclator, paralelas)
+    if modo == 'filas':
+        if paralelas:
+            raise ValueError("paralelas=True solo está disponible con modo='columnas'")
+        return filas(csv_path, nomenclator)
+    raise ValueError(f"Modo de carga desconocido: {modo!r} (usa 'columnas' o 'filas')")
+
+def cargar_grafo(csv_path, modo='columnas', nomenclator=None, paralelas=False):
+    return _cargar(modo, _cargar_grafo_columnas, _cargar_grafo_filas, csv_path, nomenclator, paralelas)
+
+def cargar_grafo_caminos(csv_path, modo='columnas', nomenclator=None, paralelas=False):
+    return _cargar(modo, _cargar_grafo_caminos_columnas, _cargar_grafo_caminos_filas, csv_path, nomenclator, paralelas)
+
+def cargar_grafo_flujo(csv_path, modo='columnas', nomenclator=None, paralelas=False):
+    return _cargar(modo, _cargar_grafo_flujo_columnas, _cargar_grafo_flujo_filas, csv_path, nomenclator, paralelas)
+
+def cargar_grafo_csr(csv_path, modo='columnas', nomenclator=None, paralelas=False, dirigido=False):
+    """
+    Grafo congelado indexado por enteros (GrafoCSR) para correr los algoritmos sin networkx;
+    dirigido=True lo carga como cargar_grafo_flujo. Con .a_networkx() se vuelve a nx.Graph.
+    """
+    cargador = cargar_grafo_flujo if dirigido else cargar_grafo
+    return GrafoCSR.desde_networkx(cargador(csv_path, modo, nomenclator, paralelas))
+
+def cargar_csr_con_snapshot(csv_path, paralelas=False, dirigido=False, carpeta=None):
+    """
+    Igual que cargar_grafo_csr pero guarda el grafo leído como snapshot binario; las
+    siguientes cargas del mismo CSV sin cambios se saltan el parseo y abren los arreglos
+    del snapshot con mmap. Para quien solo corre algoritmos (cli.py, servidor.py): no
+    construye el grafo de networkx.
+    """
+    opciones = {'paralelas': paralelas, 'dirigido': dirigido}
+    csr = leer_snapshot(csv_path, opciones, carpeta)
+    if csr is None:
+        csr = cargar_grafo_csr(csv_path, paralelas=paralelas, dirigido=dirigido)
+        try:
+            guardar_snapshot(csr, csv_path, opciones, carpeta)
+        except OSError as e:
+            print("No se pudo guardar el snapshot:", e)
+    csr.grafo['csv'] = csv_path
+    return csr
+
+def cargar_grafo_con_snapshot(csv_path, paralelas=False, dirigido=False, carpeta=None):
+    """
+    cargar_csr_con_snapshot convertido a networkx, para la interfaz (que recorre G con la
+    API de networkx). La ruta del CSV queda en G.graph['csv'] para poder recargarlo.
+    """
+    csr = cargar_csr_con_snapshot(csv_path, paralelas, dirigido, carpeta)
+    G = csr.a_networkx()
+    G.graph['csv'] = csv_path
+    # El CSR ya está hecho: los algoritmos que lo usan no lo vuelven a construir
+    csr_por_grafo[G] = (csr, version_de(G))
     return G
 
 
 # ----------- Resto de utilidades iguales -----------
+def indice_nombres(G):
+    """{nombre normalizado: nodo} para encontrar nodos aunque se escriban sin tildes o en minúsculas"""
+    nombres = {}
+    for n in G:
+        nombres.setdefault(normaliza(n), n)
+    return nombres
+
 def info_nodos(G):
     print("NODOS EN EL GRAFO:")
     for nodo in G.nodes():
@@ -161,8 +288,54 @@ def calcular_todos_caminos_bellman(G, origen):
 
     return shortest_paths_from_source_bellman(G, origen)
 
-def calcular_camino_astar(G, origen, destino):
-    return shortest_path_astar(G, origen, destino)
+def calcular_camino_astar(G, origen, destino, con_expansiones=False):
+    return shortest_path_astar(G, origen, destino, con_expansiones=con_expansiones)
+
+def expansiones_dijkstra(G, origen, destino):
+    """Nodos que expande Dijkstra para la consulta, para comparar con A* (None si no hay camino)"""
+    try:
+        return dijkstra_search(G, origen, destino)[3]
+    except nx.NetworkXException:
+        return None
+
+def calcular_todos_caminos_floyd(G, motor='networkx'):
+    return shortest_paths_floyd_warshall(G, motor=motor)
+
+def calcular_todos_caminos_johnson(G):
+    return shortest_paths_johnson(G)
+
+def calcular_todos_caminos_paralelo(G, procesos=None):
+    return shortest_paths_parallel(G, procesos=procesos)
+
+
+# ----------- Resultados de todos los pares guardados por grafo -----------
+# Las entradas desaparecen solas cuando el grafo deja de existir; olvidar_caches las
+# descarta de inmediato (p. ej. al cargar un CSV nuevo o al modificar el grafo).
+# Cada matriz recuerda el CSR del que salió: si csr_de(G) entrega otro (G cambió y se
+# marcó con marcar_modificado), se vuelve a calcular.
+_matrices_floyd = weakref.WeakKeyDictionary()
+_matrices_johnson = weakref.WeakKeyDictionary()
+_CACHES = [_matrices_floyd, _matrices_johnson, redes_residuales, csr_por_grafo]
+
+def calcular_matriz_floyd(G):
+    """MatrizCaminos de Floyd-Warshall para G, calculada una sola vez por grafo"""
+    csr = csr_de(G)
+    csr_matriz, matriz = _matrices_floyd.get(G, (None, None))
+    if csr_matriz is not csr:
+        matriz = matriz_floyd_warshall_numpy(G)
+        _matrices_floyd[G] = (csr, matriz)
+    return matriz
+
+def calcular_matriz_johnson(G):
+    """MatrizCaminos de Johnson para G, calculada una sola vez por grafo"""
+    csr = csr_de(G)
+    csr_matriz, matriz = _matrices_johnson.get(G, (None, None))
+    if csr_matriz is not csr:
+        matriz = matriz_johnson(G)
+        _matrices_johnson[G] = (csr, matriz)
+    return matriz
 
-def calcular_todos_caminos_floyd(G):
-    return shortest_paths_floyd_warshall(G)
\ No newline at end of file
+def olvidar_caches(G):
+    """Descarta todo lo calculado para G; necesario tras editar sus atributos a mano"""
+    for cache in _CACHES:
+        cache.pop(G, None)
@@ -1,8 +1,163 @@
+import hashlib
+from collections import OrderedDict
+
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+
+# ----------- Posiciones de los nodos, calculadas una vez por grafo -----------
+# Se guardan por huella del grafo (nodos, aristas y coordenadas), así cualquier vista
+# del mismo grafo, o de una copia idéntica, reutiliza el arreglo ya calculado.
+_posiciones = OrderedDict()
+MAX_POSICIONES = 8
+RONDAS_SUAVIZADO = 30
+UMBRAL_SPRING = 200  # componentes sin coordenadas más grandes usan pivot MDS
+
+def huella_grafo(G):
+    """SHA-1 de los nodos, las aristas y las coordenadas de G"""
+    h = hashlib.sha1()
+    h.update(repr(G.is_directed()).encode())
+    h.update(repr(list(G.nodes)).encode())
+    h.update(repr(list(G.edges)).encode())
+    h.update(repr([G.nodes[n].get('pos') for n in G.nodes]).encode())
+    return h.hexdigest()
+
+def posiciones_grafo(G):
+    """
+    Arreglo n×2 de solo lectura con (x, y) = (lon, lat) de cada nodo, en el orden de
+    G.nodes. Se calcula una sola vez por huella del grafo.
+    """
+    huella = huella_grafo(G)
+    xy = _posiciones.get(huella)
+    if xy is None:
+        xy = calcular_posiciones(G)
+        xy.flags.writeable = False
+        _posiciones[huella] = xy
+        if len(_posiciones) > MAX_POSICIONES:
+            _posiciones.popitem(last=False)
+    else:
+        _posiciones.move_to_end(huella)
+    return xy
+
+def posiciones(G):
+    """Diccionario nodo -> (x, y) para nx.draw_networkx_*, desde el arreglo guardado"""
+    return dict(zip(G.nodes, map(tuple, posiciones_grafo(G))))
+
+def calcular_posiciones(G):
+    """
+    (lon, lat) de los nodos con coordenadas. Los que no tienen (pos ausente o (0, 0))
+    se ubican en el promedio de sus vecinos ya ubicados, propagando desde los conocidos
+    con operaciones por arista (O(V + E) por ronda). Las componentes sin ningún nodo
+    con coordenadas se acomodan aparte (_acomodar_componentes) a un costado del mapa.
+    """
+    nodos = list(G.nodes)
+    n = len(nodos)
+    xy = np.zeros((n, 2))
+    if n == 0:
+        return xy
+    indice = {v: i for i, v in enumerate(nodos)}
+    conocido = np.zeros(n, dtype=bool)
+    for i, v in enumerate(nodos):
+        try:
+            lat, lon = G.nodes[v].get('pos', (0, 0))
+        except (TypeError, ValueError) as e:
+            print("Error en posiciones de nodos:", e)
+            continue
+        if (lat, lon) != (0, 0):
+            xy[i] = (lon, lat)
+            conocido[i] = True
+
+    m = G.number_of_edges()
+    u = np.fromiter((indice[a] for a, _ in G.edges()), dtype=np.int64, count=m)
+    v = np.fromiter((indice[b] for _, b in G.edges()), dtype=np.int64, count=m)
+    # Vecindad sin sentido: para ubicar un nodo da igual hacia dónde va la arista
+    colas = np.concatenate([u, v])
+    cabezas = np.concatenate([v, u])
+
+    ubicado = conocido.copy()
+    while True:
+        # Frente: nodos sin ubicar con algún vecino ubicado
+        arcos = ubicado[cabezas] & ~ubicado[colas]
+        if not arcos.any():
+            break
+        frente = colas[arcos]
+        cuenta = np.bincount(frente, minlength=n)
+        for eje in range(2):
+            suma = np.bincount(frente, weights=xy[cabezas[arcos], eje], minlength=n)
+            nuevos = cuenta > 0
+            xy[nuevos, eje] = suma[nuevos] / cuenta[nuevos]
+        ubicado |= cuenta > 0
+
+    libres = ubicado & ~conocido
+    if libres.any():
+        # Los ubicados por propagación se suavizan hacia el promedio de todos sus vecinos,
+        # y un desvío pequeño separa a los que quedaron en el mismo punto (hojas de un nodo)
+        cuenta = np.bincount(colas, minlength=n)
+        for _ in range(RONDAS_SUAVIZADO):
+            promedio = np.stack([np.bincount(colas, weights=xy[cabezas, eje], minlength=n) for eje in range(2)], axis=1)
+            xy[libres] = promedio[libres] / cuenta[libres, None]
+        extension = np.ptp(xy[ubicado], axis=0).max() if ubicado.sum() > 1 else 1.0
+        rnd = np.random.default_rng(0)
+        xy[libres] += rnd.normal(scale=0.01 * (extension or 1.0), size=(libres.sum(), 2))
+
+    sueltos = ~ubicado
+    if sueltos.any():
+        caja = _acomodar_componentes(G.subgraph([nodos[i] for i in np.flatnonzero(sueltos)]))
+        caja = np.array([caja[nodos[i]] for i in np.flatnonzero(sueltos)], dtype=float).reshape(-1, 2)
+        if ubicado.any():
+            # A la derecha de lo ya ubicado, en un recuadro de un cuarto de su tamaño
+            bajo, alto = xy[ubicado].min(axis=0), xy[ubicado].max(axis=0)
+            lado = ((alto - bajo).max() or 1.0) / 4
+            caja = bajo + (alto[0] - bajo[0] + lado, 0) + (caja - caja.min(axis=0)) / (np.ptp(caja, axis=0).max() or 1.0) * lado
+        xy[sueltos] = caja
+    return xy
+
+def _acomodar_componentes(G):
+    """Posiciones de un grafo sin coordenadas: cada componente por separado, en fila"""
+    pos = {}
+    desplazamiento = 0.0
+    for componente in sorted(nx.connected_components(G.to_undirected(as_view=True)), key=len, reverse=True):
+        sub = G.subgraph(componente)
+        if len(sub) <= UMBRAL_SPRING:
+            parcial = nx.spring_layout(sub, seed=0)
+        else:
+            parcial = _pivot_mds(sub)
+        xy = np.array(list(parcial.values()), dtype=float).reshape(-1, 2)
+        xy -= xy.min(axis=0)
+        xy /= np.ptp(xy, axis=0).max() or 1.0
+        ancho = max(np.sqrt(len(sub) / len(G)), 0.05)
+        for v, (x, y) in zip(parcial, xy * ancho):
+            pos[v] = (desplazamiento + x, y)
+        desplazamiento += ancho * 1.1
+    return pos
+
+def _pivot_mds(G, pivotes=50):
+    """
+    Pivot MDS (Brandes y Pich): distancias BFS desde unos pocos pivotes bien separados,
+    centradas y proyectadas en sus dos direcciones principales. O(pivotes · (V + E)),
+    sin la matriz V×V de kamada_kawai ni el O(V²) por iteración de spring_layout.
+    """
+    nodos = list(G)
+    indice = {v: i for i, v in enumerate(nodos)}
+    k = min(pivotes, len(nodos))
+    distancias = np.empty((len(nodos), k))
+    minima = np.full(len(nodos), np.inf)
+    pivote = max(nodos, key=G.degree)
+    for j in range(k):
+        for v, d in nx.single_source_shortest_path_length(G, pivote).items():
+            distancias[indice[v], j] = d
+        # El siguiente pivote es el más lejano de los ya elegidos
+        minima = np.minimum(minima, distancias[:, j])
+        pivote = nodos[int(np.argmax(minima))]
+    cuadrados = distancias ** 2
+    centrada = cuadrados - cuadrados.mean(axis=0) - cuadrados.mean(axis=1, keepdims=True) + cuadrados.mean()
+    centrada *= -0.5
+    _, vectores = np.linalg.eigh(centrada.T @ centrada)
+    xy = centrada @ vectores[:, -2:][:, ::-1]
+    return dict(zip(nodos, xy))
 
 def visualizar_grafo(G):
-    pos = nx.kamada_kawai_layout(G, scale=3)
+    pos = posiciones(G)
     plt.figure(figsize=(28, 16))
 
     nx.draw_networkx_nodes(G, pos, node_color='skyblue', node_size=350)
@@ -12,9 +167,9 @@ def visualizar_grafo(G):
     # Distancias en cada arista
     edge_labels = nx.get_edge_attributes(G, 'distancia')
     nx.draw_networkx_edge_labels(
-        G, pos, 
+        G, pos,
         edge_labels={k: f"{v:.1f} km" for k, v in edge_labels.items()},
-        font_size=6, 
+        font_size=6,
         font_family="DejaVu Sans"
     )
 
@@ -0,0 +1,65 @@
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+
+@lru_cache(maxsize=65536)
+def normaliza(nombre):
+    """Convierte a formato 'Titulo' sin tildes"""
+    n = str(nombre).strip().title()
+    n = ''.join(c for c in unicodedata.normalize('NFD', n) if unicodedata.category(c) != 'Mn')
+    return n
+
+
+class Nomenclator:
+    """
+    Índice de coordenadas (lat, lon) por nombre de municipio.
+    Las claves se normalizan una sola vez al agregarlas, así que buscar un
+    nodo es una consulta a un diccionario en lugar de recorrer todo el listado.
+    """
+
+    def __init__(self, coordenadas=None):
+        self._indice = {}
+        if coordenadas:
+            for nombre, (lat, lon) in coordenadas.items():
+                self.agregar(nombre, lat, lon)
+
+    def agregar(self, nombre, lat, lon):
+        # Si dos nombres normalizan igual se conserva el primero, como hacía el recorrido lineal
+        self._indice.setdefault(normaliza(nombre), (float(lat), float(lon)))
+
+    def buscar(self, nombre, defecto=(0, 0)):
+        return self._indice.get(normaliza(nombre), defecto)
+
+    def asignar_coordenadas(self, G, defecto=(0, 0)):
+        """Guarda en G.nodes[n]['pos'] las coordenadas de cada nodo, o `defecto` si no aparece"""
+        indice = self._indice
+        for n in G.nodes:
+            G.nodes[n]['pos'] = indice.get(normaliza(n), defecto)
+
+    def __contains__(self, nombre):
+        return normaliza(nombre) in self._indice
+
+    def __len__(self):
+        return len(self._indice)
+
+    @classmethod
+    def desde_archivo(cls, ruta, sep=None, encoding='latin1'):
+        """
+        Carga un nomenclátor desde un CSV con columnas nombre, lat, lon
+        (también se aceptan municipio/latitud/longitud, o las tres primeras columnas).
+        """
+        df = pd.read_csv(ruta, sep=sep, engine='python' if sep is None else 'c', encoding=encoding)
+        df.columns = df.columns.str.strip().str.lower()
+        columnas = []
+        for opciones in (('nombre', 'municipio'), ('lat', 'latitud'), ('lon', 'longitud')):
+            encontrada = next((c for c in opciones if c in df.columns), None)
+            columnas.append(encontrada)
+        if None in columnas:
+            columnas = list(df.columns[:3])
+        nombres, lats, lons = (df[c] for c in columnas)
+        nomenclator = cls()
+        for nombre, lat, lon in zip(nombres, pd.to_numeric(lats), pd.to_numeric(lons)):
+            nomenclator.agregar(nombre, lat, lon)
+        return nomenclator
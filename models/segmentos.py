@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+class SegmentosParalelos:
+    """
+    Todas las filas de un CSV de rutas, incluidos los tramos repetidos entre el mismo
+    par de municipios, guardadas como arreglos ordenados por par (CSR: los tramos del
+    par k ocupan inicio[k] .. inicio[k + 1] - 1, del más corto al más largo).
+
+    El grafo que se construye a partir de aquí tiene una sola arista por par con:
+    distancia y eta del tramo más corto (lo que ven los algoritmos de camino más corto)
+    y flujo/capacity sumados (lo que ven los algoritmos de flujo máximo), además del
+    índice 'segmento' para recuperar los tramos originales.
+    """
+
+    SUMAR = ('flujo', 'capacity')
+
+    def __init__(self, df, dirigido):
+        m = len(df)
+        codigos, nombres = pd.factorize(pd.concat([df['origen'], df['destino']], ignore_index=True))
+        origen, destino = codigos[:m].astype(np.int32), codigos[m:].astype(np.int32)
+        if dirigido:
+            a, b = origen, destino
+        else:
+            a, b = np.minimum(origen, destino), np.maximum(origen, destino)
+        clave = a.astype(np.int64) * max(1, len(nombres)) + b
+        self.columnas = [c for c in df.columns if c not in ('origen', 'destino')]
+        distancia = df['distancia'].to_numpy(dtype=float)
+        orden = np.lexsort((distancia, clave))
+        _, inicio = np.unique(clave[orden], return_index=True)
+
+        self.dirigido = dirigido
+        self.nombres = np.asarray(nombres, dtype=object)
+        self.origen = origen[orden]
+        self.destino = destino[orden]
+        self.valores = {c: df[c].to_numpy(dtype=float)[orden] for c in self.columnas}
+        self.inicio = np.append(inicio, m).astype(np.int64)
+
+    def __len__(self):
+        return len(self.inicio) - 1
+
+    def n_segmentos(self, k):
+        return int(self.inicio[k + 1] - self.inicio[k])
+
+    def segmentos(self, k):
+        """Tramos del par k como lista de diccionarios (origen, destino y cada columna numérica)"""
+        tramos = []
+        for p in range(self.inicio[k], self.inicio[k + 1]):
+            tramo = {'origen': self.nombres[self.origen[p]], 'destino': self.nombres[self.destino[p]]}
+            tramo.update({c: float(v[p]) for c, v in self.valores.items()})
+            tramos.append(tramo)
+        return tramos
+
+    def aristas(self):
+        """DataFrame con una fila por par: el tramo más corto, con flujo/capacity sumados"""
+        primero = self.inicio[:-1]
+        df = pd.DataFrame({
+            'origen': self.nombres[self.origen[primero]],
+            'destino': self.nombres[self.destino[primero]],
+        })
+        for c, v in self.valores.items():
+            df[c] = np.add.reduceat(v, primero) if c in self.SUMAR and len(v) else v[primero]
+        df['segmento'] = np.arange(len(self))
+        df['n_segmentos'] = np.diff(self.inicio)
+        return df
+
+    # ----------- Guardado en snapshot -----------
+    def a_arreglos(self):
+        """Arreglos planos (sin objetos de Python) para guardarlos con NumPy"""
+        arreglos = {
+            'nombres': self.nombres.astype(str),
+            'origen': self.origen,
+            'destino': self.destino,
+            'inicio': self.inicio,
+            'dirigido': np.array(self.dirigido),
+        }
+        for c, v in self.valores.items():
+            arreglos['valor:' + c] = v
+        return arreglos
+
+    @classmethod
+    def desde_arreglos(cls, arreglos):
+        segmentos = cls.__new__(cls)
+        segmentos.dirigido = bool(arreglos['dirigido'])
+        segmentos.nombres = np.asarray(arreglos['nombres'], dtype=object)
+        segmentos.origen = np.asarray(arreglos['origen'])
+        segmentos.destino = np.asarray(arreglos['destino'])
+        segmentos.inicio = np.asarray(arreglos['inicio'])
+        segmentos.valores = {k[len('valor:'):]: np.asarray(v) for k, v in arreglos.items() if k.startswith('valor:')}
+        segmentos.columnas = list(segmentos.valores)
+        return segmentos
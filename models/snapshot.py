@@ -0,0 +1,200 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from models.grafo_csr import GrafoCSR
+from models.segmentos import SegmentosParalelos
+
+# Sube cuando cambie lo que se guarda; los snapshots viejos dejan de coincidir y
+# limpiar_snapshots los borra
+FORMATO = 3
+CARPETA = os.path.join(os.path.expanduser('~'), '.cache', 'rutas_bolivar')
+# Arreglos de la huella del CSV: se leen antes que el resto para decidir si el snapshot sirve
+HUELLA = ('mtime_ns', 'tamano', 'sha1')
+# Snapshots vigentes que se conservan por carpeta (los usados más recientemente)
+MAX_SNAPSHOTS = 8
+# Escrituras interrumpidas más viejas que esto (segundos) se dan por abandonadas
+ABANDONADO = 3600
+# Nombres que crea este módulo: "<csv>-<16 hex>" (carpetas) o "<csv>-<16 hex>.npz" (FORMATO 1)
+_NOMBRE_SNAPSHOT = re.compile(r'.+-[0-9a-f]{16}(\.npz)?$')
+
+
+def _hash_archivo(ruta):
+    h = hashlib.sha1()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+def ruta_snapshot(csv_path, opciones, carpeta=None):
+    """
+    Carpeta del snapshot de csv_path cargado con `opciones` (dict de parámetros del
+    cargador). Un mismo CSV con otras opciones tiene otro snapshot.
+
+    Adentro hay un .npy por arreglo: el formato y la huella con su nombre y los demás
+    numerados, con sus claves en claves.npy (las claves llevan nombres de columnas).
+    """
+    clave = repr((FORMATO, os.path.abspath(csv_path), sorted(opciones.items())))
+    nombre = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(carpeta or CARPETA, f"{nombre}-{hashlib.sha1(clave.encode()).hexdigest()[:16]}")
+
+def _archivo(carpeta, nombre):
+    return os.path.join(carpeta, f"{nombre}.npy")
+
+def _retirar(ruta):
+    """Borra un snapshot (carpeta o .npz viejo) sin cortar a quien lo tenga abierto con mmap"""
+    if not os.path.isdir(ruta):
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+        return
+    # Se aparta con un rename atómico y se borra después: un proceso que tenga abierto
+    # el snapshot sigue leyendo sus archivos
+    viejo = tempfile.mkdtemp(prefix='.viejo-', dir=os.path.dirname(ruta))
+    try:
+        os.replace(ruta, os.path.join(viejo, 'snapshot'))
+    finally:
+        shutil.rmtree(viejo, ignore_errors=True)
+
+def _formato(ruta):
+    try:
+        return int(np.load(_archivo(ruta, 'formato'), allow_pickle=False))
+    except (OSError, ValueError):
+        return None
+
+def limpiar_snapshots(carpeta=None, conservar=None):
+    """
+    Borra de la carpeta los snapshots de otro FORMATO (también los .npz de FORMATO 1) y
+    las escrituras abandonadas; de los vigentes deja los MAX_SNAPSHOTS usados más
+    recientemente (leer_snapshot actualiza su fecha). `conservar` nunca se borra.
+    Otros archivos de la carpeta no se tocan.
+    """
+    carpeta = carpeta or CARPETA
+    try:
+        entradas = list(os.scandir(carpeta))
+    except OSError:
+        return
+    ahora = time.time()
+    vigentes = []
+    for entrada in entradas:
+        if entrada.path == conservar:
+            continue
+        try:
+            if entrada.name.startswith(('.tmp-', '.viejo-')):
+                # Puede ser la escritura en curso de otro proceso: solo las abandonadas
+                if ahora - entrada.stat().st_mtime > ABANDONADO:
+                    shutil.rmtree(entrada.path, ignore_errors=True)
+            elif not _NOMBRE_SNAPSHOT.match(entrada.name):
+                continue
+            elif not entrada.is_dir() or _formato(entrada.path) != FORMATO:
+                _retirar(entrada.path)
+            else:
+                vigentes.append((entrada.stat().st_mtime, entrada.path))
+        except OSError:
+            continue  # Otro proceso la borró o la reemplazó mientras tanto
+    vigentes.sort(reverse=True)
+    for _, ruta in vigentes[max(0, MAX_SNAPSHOTS - (conservar is not None)):]:
+        try:
+            _retirar(ruta)
+        except OSError:
+            continue
+
+
+def guardar_snapshot(csr, csv_path, opciones, carpeta=None):
+    """
+    Guarda el GrafoCSR con la huella del CSV (mtime, tamaño y SHA-1 del contenido), sin
+    comprimir y con la adyacencia ya ordenada, para abrirlo después con mmap.
+    Se escribe en una carpeta temporal y se renombra, así un snapshot nunca queda a medias.
+    Después se limpian los snapshots viejos de la misma carpeta (limpiar_snapshots).
+    """
+    destino = ruta_snapshot(csv_path, opciones, carpeta)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    info = os.stat(csv_path)
+    arreglos = {
+        'formato': np.array(FORMATO),
+        'mtime_ns': np.array(info.st_mtime_ns),
+        'tamano': np.array(info.st_size),
+        'sha1': np.array(_hash_archivo(csv_path)),
+        'nodos': np.array([str(n) for n in csr.nodos]),
+        'arista_origen': csr.arista_origen,
+        'arista_destino': csr.arista_destino,
+        'offsets': csr.offsets,
+        'destinos': csr.destinos,
+        'arco_arista': csr.arco_arista,
+        'pos': csr.pos,
+        'dirigido': np.array(csr.dirigido),
+        'enteros': np.array(sorted(csr.atributos_enteros), dtype=str),
+    }
+    for k, v in csr.atributos.items():
+        arreglos['atributo:' + k] = v
+    segmentos = csr.grafo.get('segmentos')
+    if segmentos is not None:
+        for k, v in segmentos.a_arreglos().items():
+            arreglos['segmentos:' + k] = v
+    temporal = tempfile.mkdtemp(prefix='.tmp-', dir=os.path.dirname(destino))
+    try:
+        claves = [k for k in arreglos if k not in HUELLA and k != 'formato']
+        for k in HUELLA + ('formato',):
+            np.save(_archivo(temporal, k), arreglos[k], allow_pickle=False)
+        for i, k in enumerate(claves):
+            np.save(_archivo(temporal, i), np.ascontiguousarray(arreglos[k]), allow_pickle=False)
+        np.save(_archivo(temporal, 'claves'), np.array(claves), allow_pickle=False)
+        if os.path.exists(destino):
+            _retirar(destino)
+        os.replace(temporal, destino)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    limpiar_snapshots(os.path.dirname(destino), conservar=destino)
+    return destino
+
+
+def leer_snapshot(csv_path, opciones, carpeta=None):
+    """
+    GrafoCSR guardado para csv_path, o None si no hay snapshot o el CSV cambió.
+    Si mtime y tamaño coinciden no se vuelve a leer el CSV; si no, decide el SHA-1
+    del contenido (un CSV solo "tocado" sigue usando su snapshot).
+    Los arreglos grandes se abren con mmap_mode='r': solo se leen del disco las
+    páginas que se usan, y el CSR los usa tal cual (ya vienen de solo lectura).
+    """
+    ruta = ruta_snapshot(csv_path, opciones, carpeta)
+    if not os.path.isdir(ruta):
+        return None
+    try:
+        huella = {k: np.load(_archivo(ruta, k), allow_pickle=False) for k in HUELLA}
+        info = os.stat(csv_path)
+        if (int(huella['mtime_ns']), int(huella['tamano'])) != (info.st_mtime_ns, info.st_size):
+            if str(huella['sha1']) != _hash_archivo(csv_path):
+                return None
+        claves = np.load(_archivo(ruta, 'claves'), allow_pickle=False).tolist()
+        arreglos = {k: np.load(_archivo(ruta, i), mmap_mode='r', allow_pickle=False) for i, k in enumerate(claves)}
+    except (OSError, ValueError) as e:
+        print("Snapshot ilegible, se vuelve a leer el CSV:", e)
+        return None
+    try:
+        os.utime(ruta)  # Usado recién: limpiar_snapshots lo conserva antes que a otros
+    except OSError:
+        pass
+
+    atributos = {k[len('atributo:'):]: v for k, v in arreglos.items() if k.startswith('atributo:')}
+    grafo = {}
+    segmentos = {k[len('segmentos:'):]: v for k, v in arreglos.items() if k.startswith('segmentos:')}
+    if segmentos:
+        grafo['segmentos'] = SegmentosParalelos.desde_arreglos(segmentos)
+    return GrafoCSR(
+        arreglos['nodos'].tolist(),
+        arreglos['arista_origen'],
+        arreglos['arista_destino'],
+        atributos,
+        arreglos['pos'],
+        bool(arreglos['dirigido']),
+        atributos_enteros=arreglos['enteros'].tolist(),
+        grafo=grafo,
+        adyacencia=(arreglos['offsets'], arreglos['destinos'], arreglos['arco_arista']),
+    )
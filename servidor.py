@@ -0,0 +1,305 @@
+# servidor.py
+"""
+Servicio HTTP local (solo asyncio, sin dependencias extra) que mantiene un grafo
+cargado en memoria y responde consultas de rutas en JSON. No importa tkinter ni matplotlib.
+
+Rutas:
+    GET /camino?origen=Cartagena&destino=Mompós&algoritmo=dijkstra   (o astar)
+    GET /flujo?origen=Cartagena&destino=Mompós&algoritmo=Dinic
+    GET /metricas    contadores de latencia y rendimiento
+    GET /salud
+
+Las consultas corren en un executor (hilos, o procesos con --procesos N) para no
+bloquear el bucle de eventos; consultas idénticas que llegan mientras otra igual
+está en curso esperan ese mismo resultado en lugar de recalcularlo. Los nombres se
+resuelven antes de agrupar, así 'cartagena' y 'Cartagena ' son la misma consulta.
+
+Uso (desde la raíz del proyecto):
+    python servidor.py data/rutas_norte_sur_flujo.csv --puerto 8765
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from models.graph_logic import (cargar_csr_con_snapshot, calcular_camino_mas_corto,
+                                calcular_camino_astar, indice_nombres)
+from models.nomenclator import normaliza
+from algorithms.flujomaximo.Ford_Fulkerson import ALGORITMOS_FLUJO, find_max_flow_paths
+
+ALGORITMOS_CAMINO = {
+    'dijkstra': calcular_camino_mas_corto,
+    'astar': calcular_camino_astar,
+}
+NOMBRES_FLUJO = {nombre.lower(): nombre for nombre in ALGORITMOS_FLUJO}
+
+
+class ErrorConsulta(Exception):
+    """Error del cliente (parámetros o nodos inválidos); se responde con `estado`"""
+
+    def __init__(self, mensaje, estado=400):
+        # Ambos en args para que sobreviva al pasar de un proceso de trabajo al servidor
+        super().__init__(mensaje, estado)
+
+    @property
+    def estado(self):
+        return self.args[1]
+
+    def __str__(self):
+        return self.args[0]
+
+
+# ----------- Consultas (corren en el executor) -----------
+# El grafo vive en una variable del módulo: en modo hilos la comparten todos, en modo
+# procesos cada proceso carga el suyo una vez en _iniciar.
+_grafo = {}
+
+def _iniciar(csv_path, carpeta=None):
+    # Solo se consulta: los algoritmos aceptan el GrafoCSR sin pasar por networkx
+    G = cargar_csr_con_snapshot(csv_path, paralelas=True, carpeta=carpeta)
+    _grafo['G'] = G
+    _grafo['nombres'] = indice_nombres(G)
+
+def _nodo(nombre):
+    G = _grafo['G']
+    if nombre in G:
+        return nombre
+    encontrado = _grafo['nombres'].get(normaliza(nombre))
+    if encontrado is None:
+        raise ErrorConsulta(f"El nodo {nombre} no está en el grafo", 404)
+    return encontrado
+
+def _numero(x):
+    # JSON no admite inf: sin camino se responde null
+    return None if x is None or math.isinf(x) else x
+
+def consulta(tipo, origen, destino, algoritmo):
+    """Resuelve una consulta y devuelve un diccionario serializable a JSON"""
+    G = _grafo['G']
+    o, d = _nodo(origen), _nodo(destino)
+    if tipo == 'camino':
+        path, distancia, tiempo, nombre = ALGORITMOS_CAMINO[algoritmo](G, o, d)
+        return {'origen': o, 'destino': d, 'algoritmo': nombre, 'camino': path,
+                'distancia_km': _numero(distancia), 'eta_min': _numero(tiempo)}
+    if o == d:
+        raise ErrorConsulta("El nodo fuente y sumidero no pueden ser el mismo")
+    resultado = find_max_flow_paths(G, o, d, NOMBRES_FLUJO[algoritmo])
+    if 'error' in resultado:
+        raise RuntimeError(resultado['error'])
+    return {
+        'origen': o, 'destino': d, 'algoritmo': resultado['algorithm'],
+        'flujo_maximo': resultado['max_flow'],
+        'caminos': [{'camino': p['path'], 'flujo': p['flow']} for p in resultado['flow_paths']],
+        'corte': [list(arista) for arista in resultado['cut_edges']],
+        'lado_fuente': sorted(resultado['source_side']),
+    }
+
+
+# ----------- Métricas -----------
+class Metricas:
+    """Contadores del servicio; las latencias se guardan en una ventana de las últimas N"""
+
+    def __init__(self, ventana=2048):
+        self.inicio = time.monotonic()
+        self.solicitudes = 0
+        self.completadas = 0
+        self.errores = 0
+        self.agrupadas = 0
+        self.en_curso = 0
+        self.latencias = deque(maxlen=ventana)
+        self.fin_reciente = deque()
+
+    def registrar(self, latencia, error=False):
+        ahora = time.monotonic()
+        self.completadas += 1
+        self.errores += error
+        self.latencias.append(latencia)
+        self.fin_reciente.append(ahora)
+        while self.fin_reciente and self.fin_reciente[0] < ahora - 60:
+            self.fin_reciente.popleft()
+
+    def resumen(self):
+        ahora = time.monotonic()
+        while self.fin_reciente and self.fin_reciente[0] < ahora - 60:
+            self.fin_reciente.popleft()
+        orden = sorted(self.latencias)
+
+        def percentil(p):
+            return orden[min(len(orden) - 1, int(p * len(orden)))] * 1000 if orden else None
+
+        activo = ahora - self.inicio
+        return {
+            'solicitudes': self.solicitudes,
+            'completadas': self.completadas,
+            'errores': self.errores,
+            'agrupadas': self.agrupadas,
+            'en_curso': self.en_curso,
+            'segundos_activo': round(activo, 3),
+            'por_segundo': round(self.completadas / activo, 3) if activo > 0 else 0.0,
+            'por_segundo_ultimo_minuto': round(len(self.fin_reciente) / min(60.0, activo), 3) if activo > 0 else 0.0,
+            'latencia_ms': {
+                'media': sum(orden) / len(orden) * 1000 if orden else None,
+                'p50': percentil(0.50),
+                'p95': percentil(0.95),
+                'p99': percentil(0.99),
+                'max': orden[-1] * 1000 if orden else None,
+            },
+        }
+
+
+# ----------- Servicio -----------
+class ServicioRutas:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio.start_server. Cada conexión atiende una
+    solicitud (Connection: close). Las consultas se agrupan por (tipo, origen,
+    destino, algoritmo) mientras están en curso, con origen y destino ya resueltos a
+    los nodos del grafo. `carpeta` es donde se guarda el snapshot del CSV (None = la
+    carpeta por defecto de models.snapshot).
+    """
+
+    def __init__(self, csv_path, procesos=0, hilos=4, carpeta=None):
+        self.csv_path = csv_path
+        self.carpeta = carpeta
+        self.procesos = procesos
+        self.hilos = hilos
+        self.metricas = Metricas()
+        self.en_vuelo = {}
+        self.executor = None
+        self.servidor = None
+
+    async def iniciar(self, host='127.0.0.1', puerto=8765):
+        loop = asyncio.get_running_loop()
+        # Este proceso siempre carga el grafo (desde el snapshot, con mmap) para resolver
+        # los nombres de las consultas antes de agruparlas
+        await loop.run_in_executor(None, _iniciar, self.csv_path, self.carpeta)
+        if self.procesos > 0:
+            # 'spawn': los procesos no heredan el bucle de eventos ni los hilos del servidor
+            self.executor = ProcessPoolExecutor(max_workers=self.procesos, initializer=_iniciar,
+                                                initargs=(self.csv_path, self.carpeta),
+                                                mp_context=multiprocessing.get_context('spawn'))
+        else:
+            # Con hilos todos comparten el grafo ya cargado en este proceso
+            self.executor = ThreadPoolExecutor(max_workers=self.hilos)
+        self.servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self.servidor.sockets[0].getsockname()[1]
+
+    async def cerrar(self):
+        if self.servidor is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _resolver(self, clave):
+        """Resultado de la consulta `clave`, compartido con las idénticas que estén en curso"""
+        futuro = self.en_vuelo.get(clave)
+        if futuro is not None:
+            self.metricas.agrupadas += 1
+            return await asyncio.shield(futuro)
+        loop = asyncio.get_running_loop()
+        futuro = loop.run_in_executor(self.executor, consulta, *clave)
+        self.en_vuelo[clave] = futuro
+        try:
+            return await asyncio.shield(futuro)
+        finally:
+            if futuro.done():
+                self.en_vuelo.pop(clave, None)
+            else:
+                futuro.add_done_callback(lambda _f: self.en_vuelo.pop(clave, None))
+
+    async def _despachar(self, metodo, ruta, parametros):
+        if metodo != 'GET':
+            raise ErrorConsulta(f"Método no permitido: {metodo}", 405)
+        if ruta == '/salud':
+            return {'estado': 'ok'}
+        if ruta == '/metricas':
+            return self.metricas.resumen()
+        if ruta not in ('/camino', '/flujo'):
+            raise ErrorConsulta(f"Ruta desconocida: {ruta}", 404)
+        tipo = ruta[1:]
+        faltan = [p for p in ('origen', 'destino') if not parametros.get(p)]
+        if faltan:
+            raise ErrorConsulta(f"Faltan parámetros: {', '.join(faltan)}")
+        validos = ALGORITMOS_CAMINO if tipo == 'camino' else NOMBRES_FLUJO
+        algoritmo = parametros.get('algoritmo', 'dijkstra' if tipo == 'camino' else 'dinic').lower()
+        if algoritmo not in validos:
+            raise ErrorConsulta(f"Algoritmo desconocido: {algoritmo} (usa {', '.join(validos)})")
+        # Nombres canónicos (404 si no existen): la clave de agrupación no depende de
+        # mayúsculas, tildes ni espacios de la consulta
+        origen, destino = _nodo(parametros['origen']), _nodo(parametros['destino'])
+        return await self._resolver((tipo, origen, destino, algoritmo))
+
+    async def _atender(self, reader, writer):
+        try:
+            linea = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # Encabezados: no se usan
+            partes = linea.decode('latin1').split()
+            if len(partes) < 2:
+                return
+            metodo, objetivo = partes[0], partes[1]
+            url = urlsplit(objetivo)
+            parametros = dict(parse_qsl(url.query))
+            self.metricas.solicitudes += 1
+            self.metricas.en_curso += 1
+            t0 = time.perf_counter()
+            try:
+                cuerpo, estado = await self._despachar(metodo, url.path, parametros), 200
+            except ErrorConsulta as e:
+                cuerpo, estado = {'error': str(e)}, e.estado
+            except Exception as e:
+                print("Error en consulta:", e)
+                cuerpo, estado = {'error': str(e)}, 500
+            finally:
+                self.metricas.en_curso -= 1
+            if url.path != '/metricas':
+                self.metricas.registrar(time.perf_counter() - t0, error=estado != 200)
+            datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {estado} {_RAZONES.get(estado, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(datos)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin1') + datos
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+_RAZONES = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+async def servir(csv_path, host='127.0.0.1', puerto=8765, procesos=0, hilos=4, carpeta=None):
+    servicio = ServicioRutas(csv_path, procesos=procesos, hilos=hilos, carpeta=carpeta)
+    puerto = await servicio.iniciar(host, puerto)
+    print(f"Sirviendo {csv_path} en http://{host}:{puerto}")
+    try:
+        await servicio.servidor.serve_forever()
+    finally:
+        await servicio.cerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv', help="CSV de rutas que se mantiene cargado")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--procesos', type=int, default=0,
+                        help="Procesos para las consultas (0 = hilos en este proceso)")
+    parser.add_argument('--hilos', type=int, default=4)
+    parser.add_argument('--carpeta', default=None, help="Carpeta de los snapshots (por defecto ~/.cache/rutas_bolivar)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.csv, args.host, args.puerto, args.procesos, args.hilos, args.carpeta))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import networkx as nx
+import pytest
+
+from algorithms.caminocorto.astar import astar_search, shortest_path_astar
+from algorithms.caminocorto.dijkstra import dijkstra_search
+from models.grafo_csr import GrafoCSR
+
+
+def grafo_con_nodos_sin_coordenadas():
+    # S, X y Y no están en el nomenclátor: quedan en (0, 0)
+    G = nx.Graph()
+    for n, pos in {'S': (0, 0), 'X': (0, 0), 'Y': (0, 0),
+                   'A': (10, -75), 'B': (10, -74), 'C': (10, -74.5)}.items():
+        G.add_node(n, pos=pos)
+    for u, v, d in [('S', 'A', 1), ('A', 'X', 5), ('X', 'B', 5), ('S', 'Y', 7),
+                    ('Y', 'B', 8), ('A', 'C', 60), ('C', 'B', 60)]:
+        G.add_edge(u, v, distancia=d, eta=d)
+    return G
+
+
+@pytest.mark.parametrize('como_csr', [False, True])
+def test_astar_igual_a_dijkstra_con_nodos_sin_coordenadas(como_csr):
+    G = grafo_con_nodos_sin_coordenadas()
+    esperado = dijkstra_search(G, 'S', 'B')
+    if como_csr:
+        G = GrafoCSR.desde_networkx(G)
+    path, distancia, tiempo, _ = shortest_path_astar(G, 'S', 'B')
+    assert path == esperado[0] == ['S', 'A', 'X', 'B']
+    assert distancia == pytest.approx(esperado[1]) == 11
+
+
+def test_expansiones_de_la_misma_busqueda():
+    G = grafo_con_nodos_sin_coordenadas()
+    *resultado, expansiones = shortest_path_astar(G, 'S', 'B', con_expansiones=True)
+    assert resultado == list(shortest_path_astar(G, 'S', 'B'))
+    assert expansiones == astar_search(G, 'S', 'B')[3] > 0
+    G.add_node('Z')
+    assert shortest_path_astar(G, 'S', 'Z', con_expansiones=True)[::4] == (None, None)
+
+
+def test_cotas_por_destino_desde_varios_hilos(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from algorithms.caminocorto.astar import _CoordenadasGrafo
+
+    G = nx.Graph()
+    for i in range(40):
+        G.add_node(i, pos=(10 + i / 100, -75 + i / 100))
+        if i:
+            G.add_edge(i - 1, i, distancia=2, eta=2)
+    monkeypatch.setattr(_CoordenadasGrafo, 'MAX_DESTINOS', 4)
+    datos = _CoordenadasGrafo(GrafoCSR.desde_networkx(G))
+    with ThreadPoolExecutor(8) as pool:
+        cotas = list(pool.map(datos.heuristica_hacia, [i % 40 for i in range(2000)]))
+    assert all(h[i % 40] == 0 for i, h in enumerate(cotas))
+    assert len(datos.por_destino) <= 4
@@ -0,0 +1,29 @@
+import itertools
+from pathlib import Path
+
+import cli
+
+RUTAS = Path(__file__).resolve().parent.parent / 'data' / 'Rutas.csv'
+
+
+def test_procesos_leen_la_entrada_por_ventanas():
+    leidos = []
+
+    def pares():
+        for i in itertools.count():
+            leidos.append(i)
+            yield 'Cartagena', 'Turbaco'
+
+    salida = cli.resultados(pares(), str(RUTAS), 'dijkstra', procesos=2, usar_snapshot=False, lote=4)
+    primeros = list(itertools.islice(salida, 5))
+    salida.close()
+    assert all('error' not in fila for fila in primeros)
+    # Ventana de 2 * procesos lotes de 4 pares, más el lote que se lee por delante
+    assert len(leidos) <= (2 * 2 + 2) * 4
+
+
+def test_procesos_conservan_el_orden():
+    pares = [('Cartagena', 'Turbaco'), ('Turbaco', 'Cartagena'), ('Nodo inexistente', 'Cartagena')] * 5
+    salida = list(cli.resultados(pares, str(RUTAS), 'dijkstra', procesos=2, usar_snapshot=False, lote=2))
+    assert [(f['origen'], f['destino']) for f in salida] == pares
+    assert all('error' in f for f in salida[2::3])
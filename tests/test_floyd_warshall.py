@@ -0,0 +1,45 @@
+import random
+
+import networkx as nx
+import pytest
+
+from algorithms.caminocorto.floyd_warshall import matriz_floyd_warshall_numpy, shortest_paths_floyd_warshall
+from models.grafo_csr import GrafoCSR
+
+
+def grafo_aleatorio(semilla, n=30, m=70):
+    # Distancias con un decimal: muchas rutas empatan salvo por redondeo
+    rnd = random.Random(semilla)
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    while G.number_of_edges() < m:
+        u, v = rnd.sample(range(n), 2)
+        G.add_edge(u, v, distancia=round(rnd.uniform(0.1, 3.0), 1), eta=rnd.randint(1, 60))
+    return G
+
+
+@pytest.mark.parametrize('semilla', range(60))
+def test_tiempo_coincide_con_el_camino(semilla):
+    G = grafo_aleatorio(semilla)
+    matriz = matriz_floyd_warshall_numpy(G)
+    for u in G:
+        for v in G:
+            path = matriz.camino(u, v)
+            if path is None:
+                assert matriz.tiempo(u, v) == float('inf')
+                continue
+            eta = sum(G[a][b]['eta'] for a, b in zip(path, path[1:]))
+            assert matriz.tiempo(u, v) == pytest.approx(eta)
+            assert matriz.distancia(u, v) == pytest.approx(nx.path_weight(G, path, 'distancia'))
+
+
+@pytest.mark.parametrize('motor', ['networkx', 'numpy'])
+def test_acepta_grafo_csr(motor):
+    G = grafo_aleatorio(0, n=15, m=30)
+    esperado = shortest_paths_floyd_warshall(G, motor)
+    obtenido = shortest_paths_floyd_warshall(GrafoCSR.desde_networkx(G), motor)
+    assert obtenido[1], "el cálculo sobre el CSR falló"
+    for u in G:
+        assert dict(obtenido[0][u]) == pytest.approx(dict(esperado[0][u]))
+        assert dict(obtenido[1][u]) == dict(esperado[1][u])
+        assert dict(obtenido[2][u]) == pytest.approx(dict(esperado[2][u]))
@@ -0,0 +1,119 @@
+import random
+
+import networkx as nx
+import pytest
+
+from algorithms.flujomaximo.Ford_Fulkerson import ALGORITMOS_FLUJO, find_max_flow_paths
+from algorithms.flujomaximo.Push_Relabel import push_relabel, push_relabel_fifo
+from algorithms.flujomaximo.flujo_incremental import FlujoIncremental
+from algorithms.flujomaximo.flujo_por_lotes import batch_max_flow
+from algorithms.flujomaximo.red_residual import RedResidual
+from models.grafo_csr import GrafoCSR
+
+
+def red_aleatoria(semilla, n=12, m=30):
+    # Capacidades enteras: los flujos se comparan exactos con networkx
+    rnd = random.Random(semilla)
+    G = nx.DiGraph()
+    G.add_nodes_from(range(n))
+    while G.number_of_edges() < m:
+        u, v = rnd.sample(range(n), 2)
+        G.add_edge(u, v, flujo=rnd.randint(0, 10))
+    return G
+
+
+def flujo_nx(G, fuente, sumidero):
+    return nx.maximum_flow_value(G, fuente, sumidero, capacity='flujo')
+
+
+@pytest.mark.parametrize('algoritmo', list(ALGORITMOS_FLUJO))
+@pytest.mark.parametrize('semilla', range(15))
+def test_igual_a_networkx(algoritmo, semilla):
+    G = red_aleatoria(semilla)
+    esperado = flujo_nx(G, 0, 11)
+    assert find_max_flow_paths(G, 0, 11, algoritmo)['max_flow'] == esperado
+    assert find_max_flow_paths(GrafoCSR.desde_networkx(G), 0, 11, algoritmo)['max_flow'] == esperado
+
+
+@pytest.mark.parametrize('semilla', range(15))
+def test_push_relabel_ambas_selecciones(semilla):
+    G = red_aleatoria(semilla, n=20, m=60)
+    esperado = flujo_nx(G, 0, 19)
+    for variante in (push_relabel, push_relabel_fifo):
+        max_flow, _, edge_flows = variante(G, 0, 19)
+        assert max_flow == esperado
+        # El preflujo final es un flujo: se conserva en cada nodo intermedio
+        balance = dict.fromkeys(G, 0)
+        for (u, v), datos in edge_flows.items():
+            assert 0 <= datos['flow'] <= datos['capacity']
+            balance[u] -= datos['flow']
+            balance[v] += datos['flow']
+        assert all(b == 0 for n, b in balance.items() if n not in (0, 19))
+
+
+@pytest.mark.parametrize('semilla', range(20))
+def test_incremental_sigue_a_networkx(semilla):
+    rnd = random.Random(semilla)
+    G = red_aleatoria(semilla)
+    incremental = FlujoIncremental(G, 0, 11)
+    assert incremental.max_flow == flujo_nx(G, 0, 11)
+    aristas = list(G.edges)
+    for _ in range(15):
+        u, v = rnd.choice(aristas)
+        flujo = incremental.resultado()['edge_flows'][(u, v)]['flow']
+        if flujo > 0 and rnd.random() < 0.6:
+            nueva = rnd.randint(0, int(flujo) - 1)  # Por debajo del flujo que lleva
+        else:
+            nueva = G[u][v]['flujo'] + rnd.randint(1, 5)
+        assert incremental.actualizar_capacidades({(u, v): nueva}) == flujo_nx(G, 0, 11)
+        assert G[u][v]['flujo'] == nueva
+
+
+def test_incremental_bajar_y_volver_a_subir():
+    G = nx.DiGraph()
+    for u, v, c in [('s', 'a', 4), ('s', 'b', 2), ('a', 'b', 3), ('a', 't', 2), ('b', 't', 5)]:
+        G.add_edge(u, v, flujo=c)
+    incremental = FlujoIncremental(G, 's', 't')
+    assert incremental.max_flow == 6
+    # Al bajar a-t, su flujo se desvía por a-b
+    assert incremental.actualizar_capacidades({('a', 't'): 0}) == flujo_nx(G, 's', 't') == 5
+    # Al bajar también a-b ya no hay desvío: el sobrante vuelve a la fuente
+    assert incremental.actualizar_capacidades({('a', 'b'): 1}) == flujo_nx(G, 's', 't') == 3
+    assert incremental.actualizar_capacidades({('a', 't'): 2, ('a', 'b'): 3}) == 6
+
+
+def test_incremental_arista_nueva():
+    G = red_aleatoria(3)
+    G.add_edge(0, 11, flujo=0)  # Tramo directo aún cerrado
+    incremental = FlujoIncremental(G, 0, 11)
+    assert incremental.actualizar_capacidades({(0, 11): 7}) == flujo_nx(G, 0, 11)
+
+    # Una arista que no está en la red se rechaza sin tocar nada
+    antes = incremental.resultado()
+    with pytest.raises(KeyError):
+        incremental.actualizar_capacidades({(0, 11): 1, (11, 0): 4})
+    assert incremental.resultado() == antes
+    assert G[0][11]['flujo'] == 7
+
+
+def test_incremental_sobre_csr():
+    G = red_aleatoria(5)
+    incremental = FlujoIncremental(GrafoCSR.desde_networkx(G), 0, 11)
+    aristas = list(G.edges)
+    for (u, v), nueva in [(aristas[0], 0), (aristas[1], 20), (aristas[0], 9)]:
+        # El CSR no cambia: la capacidad nueva se lleva a mano al grafo de referencia
+        G[u][v]['flujo'] = nueva
+        assert incremental.actualizar_capacidades({(u, v): nueva}) == flujo_nx(G, 0, 11)
+
+
+def test_lotes_con_superfuente_y_supersumidero():
+    G = red_aleatoria(7, n=15, m=45)
+    grupos = [([0, 1], [13, 14]), (2, [10, 11, 12]), ([3, 4, 5], 9), ([0, 1], [13, 14])]
+    for resultado, (fuentes, sumideros) in zip(batch_max_flow(G, grupos, detalle=True), grupos):
+        H = G.copy()
+        for f in fuentes if isinstance(fuentes, list) else [fuentes]:
+            H.add_edge('S', f)  # Sin 'flujo': networkx la toma como infinita
+        for s in sumideros if isinstance(sumideros, list) else [sumideros]:
+            H.add_edge(s, 'T')
+        assert resultado['max_flow'] == nx.maximum_flow_value(H, 'S', 'T', capacity='flujo')
+        assert all(RedResidual.SUPERFUENTE not in info['path'] for info in resultado['flow_paths'])
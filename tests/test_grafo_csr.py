@@ -0,0 +1,32 @@
+import networkx as nx
+
+from algorithms.flujomaximo.red_residual import red_residual_de
+from models.grafo_csr import GrafoCSR, csr_de, marcar_modificado
+from models.graph_logic import calcular_matriz_floyd
+
+
+def test_capacidad_desde_capacity():
+    # Así quedan las aristas que escribe cargar_grafo_flujo
+    G = nx.DiGraph()
+    G.add_edge('A', 'B', distancia=1, eta=1, capacity=7.0)
+    G.add_edge('B', 'C', distancia=1, eta=1, capacity=3.0, flujo=5.0)
+    G.add_edge('C', 'D', distancia=1, eta=1)
+    csr = GrafoCSR.desde_networkx(G)
+    assert csr.capacidades().tolist() == [7.0, 5.0, 1.0]
+    red = red_residual_de(G)
+    assert sorted(red.capacidad_original) == [0, 0, 0, 1, 5, 7]
+
+
+def test_marcar_modificado_invalida_caches():
+    G = nx.Graph()
+    G.add_edge('A', 'B', distancia=1, eta=1, flujo=2)
+    G.add_edge('B', 'C', distancia=1, eta=1, flujo=2)
+    csr, red, matriz = csr_de(G), red_residual_de(G), calcular_matriz_floyd(G)
+    assert csr_de(G) is csr and red_residual_de(G) is red and calcular_matriz_floyd(G) is matriz
+
+    G['A']['B']['distancia'] = 10
+    G['A']['B']['flujo'] = 9
+    marcar_modificado(G)
+    assert csr_de(G) is not csr
+    assert 9 in red_residual_de(G).capacidad_original
+    assert calcular_matriz_floyd(G).distancia('A', 'C') == 11
@@ -0,0 +1,48 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithms.caminocorto import paralelo
+from algorithms.caminocorto.floyd_warshall import matriz_floyd_warshall_numpy
+
+
+def grafo_aleatorio(semilla, n=40, m=90):
+    rnd = random.Random(semilla)
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    while G.number_of_edges() < m:
+        u, v = rnd.sample(range(n), 2)
+        G.add_edge(u, v, distancia=round(rnd.uniform(0.1, 3.0), 1), eta=rnd.randint(1, 60))
+    return G
+
+
+@pytest.mark.parametrize('procesos', [1, 2])
+def test_igual_a_floyd_warshall(procesos):
+    G = grafo_aleatorio(4)
+    esperado = matriz_floyd_warshall_numpy(G)
+    obtenido = paralelo.matriz_dijkstra_paralelo(G, procesos=procesos, lote=7)
+    assert np.allclose(obtenido.dist, esperado.dist)
+    for u in G:
+        for v in G:
+            # Con empates cada algoritmo puede elegir otro camino: la ETA es la del suyo
+            path = obtenido.camino(u, v)
+            eta = sum(G[a][b]['eta'] for a, b in zip(path, path[1:])) if path else float('inf')
+            assert obtenido.tiempo(u, v) == pytest.approx(eta)
+
+
+def test_lee_el_csr_sin_copiarlo(monkeypatch):
+    vistas = []
+    resolver = paralelo._resolver_origenes
+
+    def espiar(origenes):
+        vistas.extend(paralelo._csr)
+        return resolver(origenes)
+
+    monkeypatch.setattr(paralelo, '_resolver_origenes', espiar)
+    paralelo.matriz_dijkstra_paralelo(grafo_aleatorio(5), procesos=1)
+    # Vistas sobre la memoria compartida, ya liberadas al terminar
+    assert vistas and all(isinstance(v, memoryview) for v in vistas)
+    with pytest.raises(ValueError):
+        len(vistas[0])
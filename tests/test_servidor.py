@@ -0,0 +1,68 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import servidor
+
+RUTAS = Path(__file__).resolve().parent.parent / 'data' / 'rutas_norte_sur_flujo.csv'
+
+
+async def pedir(puerto, objetivo):
+    reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+    writer.write(f"GET {objetivo} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin1'))
+    await writer.drain()
+    respuesta = await reader.read()
+    writer.close()
+    cabecera, _, cuerpo = respuesta.partition(b'\r\n\r\n')
+    return int(cabecera.split()[1]), json.loads(cuerpo)
+
+
+def con_servicio(prueba, carpeta):
+    async def correr():
+        # El snapshot va a la carpeta temporal de la prueba, no a ~/.cache
+        servicio = servidor.ServicioRutas(str(RUTAS), hilos=4, carpeta=str(carpeta))
+        puerto = await servicio.iniciar('127.0.0.1', 0)  # Puerto libre que elija el sistema
+        try:
+            await prueba(servicio, puerto)
+        finally:
+            await servicio.cerrar()
+    asyncio.run(correr())
+
+
+def test_respuestas(tmp_path):
+    async def prueba(servicio, puerto):
+        estado, cuerpo = await pedir(puerto, '/camino?origen=cartagena&destino=Turbaco')
+        assert estado == 200 and cuerpo['origen'] == 'Cartagena' and cuerpo['camino'][-1] == 'Turbaco'
+        estado, cuerpo = await pedir(puerto, '/flujo?origen=Cartagena&destino=Turbaco&algoritmo=Dinic')
+        assert estado == 200 and cuerpo['flujo_maximo'] > 0
+        assert (await pedir(puerto, '/camino?origen=Atlantida&destino=Turbaco'))[0] == 404
+        assert (await pedir(puerto, '/ruta-desconocida'))[0] == 404
+        assert (await pedir(puerto, '/camino?origen=Cartagena'))[0] == 400
+        assert (await pedir(puerto, '/camino?origen=Cartagena&destino=Turbaco&algoritmo=bfs'))[0] == 400
+        assert (await pedir(puerto, '/salud')) == (200, {'estado': 'ok'})
+    con_servicio(prueba, tmp_path)
+    assert any(tmp_path.iterdir())
+
+
+def test_agrupa_consultas_con_el_mismo_nodo_escrito_distinto(monkeypatch, tmp_path):
+    llamadas = []
+    consulta = servidor.consulta
+
+    def lenta(*clave):
+        llamadas.append(clave)
+        time.sleep(0.3)  # Para que las tres consultas coincidan en curso
+        return consulta(*clave)
+
+    monkeypatch.setattr(servidor, 'consulta', lenta)
+
+    async def prueba(servicio, puerto):
+        respuestas = await asyncio.gather(*(
+            pedir(puerto, f'/camino?origen={origen}&destino=Turbaco')
+            for origen in ('Cartagena', 'cartagena', 'Cartagena%20')
+        ))
+        assert [estado for estado, _ in respuestas] == [200, 200, 200]
+        assert len({json.dumps(cuerpo) for _, cuerpo in respuestas}) == 1
+        assert llamadas == [('camino', 'Cartagena', 'Turbaco', 'dijkstra')]
+        assert servicio.metricas.agrupadas == 2
+    con_servicio(prueba, tmp_path)
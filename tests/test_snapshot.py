@@ -0,0 +1,57 @@
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from models import snapshot
+from models.graph_logic import cargar_csr_con_snapshot, cargar_grafo_con_snapshot, cargar_grafo_csr
+
+RUTAS = Path(__file__).resolve().parent.parent / 'data' / 'rutas_norte_sur_flujo.csv'
+
+
+def test_snapshot_devuelve_el_mismo_csr(tmp_path):
+    esperado = cargar_grafo_csr(str(RUTAS), paralelas=True, dirigido=True)
+    cargar_csr_con_snapshot(str(RUTAS), paralelas=True, dirigido=True, carpeta=tmp_path)
+    csr = cargar_csr_con_snapshot(str(RUTAS), paralelas=True, dirigido=True, carpeta=tmp_path)
+    # La segunda carga sale del snapshot: los arreglos son vistas del archivo, no copias
+    assert isinstance(csr.arista_origen.base, np.memmap)
+    assert csr.nodos == esperado.nodos
+    for nombre in ('offsets', 'destinos', 'arco_arista', 'distancia', 'eta', 'capacidad', 'pos'):
+        assert np.array_equal(getattr(csr, nombre), getattr(esperado, nombre))
+    assert csr.grafo['csv'] == str(RUTAS)
+
+
+def test_snapshot_a_networkx(tmp_path):
+    G1 = cargar_grafo_con_snapshot(str(RUTAS), carpeta=tmp_path)
+    G2 = cargar_grafo_con_snapshot(str(RUTAS), carpeta=tmp_path)
+    assert sorted(G1.edges(data='distancia')) == sorted(G2.edges(data='distancia'))
+    assert G2.graph['csv'] == str(RUTAS)
+
+
+def test_limpia_snapshots_viejos_y_limita_la_carpeta(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, 'MAX_SNAPSHOTS', 2)
+    (tmp_path / 'rutas_norte_sur_flujo-e6ad1db8b28345ff.npz').write_bytes(b'FORMATO 1')
+    (tmp_path / 'Rutas-0123456789abcdef').mkdir()  # Carpeta de un formato anterior
+    abandonada = tmp_path / '.tmp-abcd'
+    abandonada.mkdir()
+    os.utime(abandonada, (0, 0))
+    (tmp_path / 'notas.txt').write_text("no es un snapshot")
+
+    csr = cargar_grafo_csr(str(RUTAS))
+
+    def guardar(i):
+        time.sleep(0.05)  # Fechas distintas para el orden de uso
+        return os.path.basename(snapshot.guardar_snapshot(csr, str(RUTAS), {'prueba': i}, carpeta=str(tmp_path)))
+
+    def presentes():
+        return sorted(p.name for p in tmp_path.iterdir())
+
+    primero, segundo = guardar(0), guardar(1)
+    # Lo de otro formato y la escritura abandonada se borran al guardar; lo ajeno no
+    assert presentes() == sorted(['notas.txt', primero, segundo])
+    time.sleep(0.05)
+    assert snapshot.leer_snapshot(str(RUTAS), {'prueba': 0}, carpeta=str(tmp_path)) is not None
+    # Con el límite de 2 sale el usado hace más tiempo: el segundo, no el recién leído
+    tercero = guardar(2)
+    assert presentes() == sorted(['notas.txt', primero, tercero])
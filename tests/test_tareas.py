@@ -0,0 +1,125 @@
+import threading
+import time
+
+from app.tareas import Tareas
+
+
+class Reloj:
+    """Lo único que Tareas usa del widget de Tk: after y after_cancel (aquí se llaman a mano)"""
+
+    def __init__(self):
+        self.pendientes = {}
+
+    def after(self, ms, funcion):
+        clave = len(self.pendientes) + 1
+        self.pendientes[clave] = funcion
+        return clave
+
+    def after_cancel(self, clave):
+        self.pendientes.pop(clave, None)
+
+    def correr(self):
+        pendientes, self.pendientes = self.pendientes, {}
+        for funcion in pendientes.values():
+            funcion()
+
+
+def test_relanzar_reutiliza_el_hilo_en_marcha():
+    llamadas = []
+    liberar = threading.Event()
+
+    def lento(x):
+        llamadas.append(x)
+        liberar.wait(5)
+        return x * 2
+
+    reloj = Reloj()
+    tareas = Tareas(reloj)
+    recibidos = []
+    primera = tareas.lanzar('matriz', lento, 21, al_terminar=recibidos.append)
+    tareas.cancelar()
+    segunda = tareas.lanzar('matriz', lento, 21, al_terminar=recibidos.append)
+    assert segunda.futuro is primera.futuro
+    assert 'ya en curso' in segunda.descripcion
+
+    liberar.set()
+    segunda.futuro.result(5)
+    reloj.correr()
+    # Se calculó una sola vez y solo la tarea vigente recibió el resultado
+    assert llamadas == [21]
+    assert recibidos == [42]
+
+    # Terminado el hilo, el mismo cálculo vuelve a correr
+    tercera = tareas.lanzar('matriz', lento, 21)
+    assert tercera.futuro is not primera.futuro
+    tercera.futuro.result(5)
+    tareas.cerrar()
+
+
+def test_argumentos_distintos_no_se_comparten():
+    tareas = Tareas(Reloj())
+    a = tareas.lanzar('a', time.sleep, 0.05)
+    b = tareas.lanzar('b', time.sleep, 0.06)
+    assert a.futuro is not b.futuro
+    tareas.cerrar()
+
+
+def test_procesos_sembrados_reciben_el_grafo_una_vez():
+    import networkx as nx
+    from algorithms.flujomaximo.Ford_Fulkerson import find_max_flow_paths, flujo_en_trabajador, sembrar_trabajador
+    from models.grafo_csr import csr_de, marcar_modificado
+
+    G = nx.DiGraph()
+    G.add_edge('a', 'b', flujo=3)
+    G.add_edge('b', 'c', flujo=2)
+    G.add_edge('a', 'c', flujo=1)
+    reloj = Reloj()
+    tareas = Tareas(reloj, procesos=True, trabajadores=1)
+    try:
+        tareas.sembrar(sembrar_trabajador, csr_de(G))
+        primero = tareas.lanzar('flujo', flujo_en_trabajador, 'a', 'c').futuro.result(60)
+        pool = tareas._executor
+        # Misma versión del grafo: no se reinician los procesos
+        tareas.sembrar(sembrar_trabajador, csr_de(G))
+        assert tareas._executor is pool
+        segundo = tareas.lanzar('flujo', flujo_en_trabajador, 'a', 'c', 'Dinic').futuro.result(60)
+        assert primero['max_flow'] == segundo['max_flow'] == find_max_flow_paths(G, 'a', 'c')['max_flow'] == 3
+
+        # Otra versión: el proceso se vuelve a sembrar con el grafo nuevo
+        G['a']['c']['flujo'] = 5
+        marcar_modificado(G)
+        tareas.sembrar(sembrar_trabajador, csr_de(G))
+        assert tareas._executor is None
+        assert tareas.lanzar('flujo', flujo_en_trabajador, 'a', 'c').futuro.result(60)['max_flow'] == 7
+    finally:
+        tareas.cerrar()
+
+
+def test_cancelar_no_afecta_a_otra_pantalla_con_el_mismo_calculo():
+    liberar = threading.Event()
+    reloj = Reloj()
+    a, b = Tareas(reloj, trabajadores=1), Tareas(reloj, trabajadores=1)
+    # El único hilo de `a` queda ocupado: el cálculo compartido queda pendiente
+    ocupado = a.lanzar('ocupado', liberar.wait, 5)
+    primera = a.lanzar('doble', pow, 7, 2)
+    recibidos, errores = [], []
+    segunda = b.lanzar('doble', pow, 7, 2, al_terminar=recibidos.append, al_fallar=errores.append)
+    assert segunda.futuro is primera.futuro
+
+    a.cancelar('doble')
+    assert not segunda.futuro.cancelled()
+    liberar.set()
+    ocupado.futuro.result(5)
+    segunda.futuro.result(5)
+    reloj.correr()
+    assert recibidos == [49] and errores == []
+
+    # Sin nadie más esperándolo, el pendiente sí se cancela
+    liberar.clear()
+    a.lanzar('ocupado', liberar.wait, 5)
+    sola = a.lanzar('doble', pow, 3, 2)
+    a.cancelar('doble')
+    assert sola.futuro.cancelled()
+    liberar.set()
+    a.cerrar()
+    b.cerrar()